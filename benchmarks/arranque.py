@@ -0,0 +1,86 @@
+"""Tiempo de arranque en frío por sección.
+
+Cada medición corre en un proceso nuevo de Python, como un contenedor recién
+creado: se mide cuánto tarda en importarse el módulo de la sección y cuánto
+tarda la primera ejecución completa del dashboard con esa sección elegida, y
+se registra qué módulos pesados quedaron cargados.
+
+Uso::
+
+    python -m benchmarks.arranque                # todas las secciones, 3 repeticiones
+    python -m benchmarks.arranque -n 5 --json resultados.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+PESADOS = ["pandas", "altair", "geopandas", "pyproj", "shapely", "folium", "streamlit_folium"]
+
+# Se ejecuta en el proceso hijo; imprime una línea JSON
+_MEDICION = """
+import json, sys, time
+sys.path.insert(0, {raiz!r})
+from demografia_antioquia import secciones
+
+inicio = time.perf_counter()
+secciones.cargar({titulo!r})
+importacion = time.perf_counter() - inicio
+
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({script!r}, default_timeout=300)
+at.session_state["seccion"] = {titulo!r}
+inicio = time.perf_counter()
+at.run()
+ejecucion = time.perf_counter() - inicio
+
+print(json.dumps({{
+    "importacion": importacion,
+    "primera_ejecucion": ejecucion,
+    "excepciones": [e.value for e in at.exception],
+    "modulos": [m for m in {pesados!r} if m in sys.modules],
+}}))
+"""
+
+
+def medir(titulo):
+    codigo = _MEDICION.format(raiz=str(RAIZ), titulo=titulo,
+                              script=str(RAIZ / "demografia.py"), pesados=PESADOS)
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True,
+                            text=True, check=True, cwd=RAIZ)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    sys.path.insert(0, str(RAIZ))
+    from demografia_antioquia.secciones import SECCIONES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--repeticiones", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="guarda los resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    for titulo in SECCIONES:
+        corridas = [medir(titulo) for _ in range(args.repeticiones)]
+        resultados[titulo] = {
+            "importacion_mediana": statistics.median(c["importacion"] for c in corridas),
+            "primera_ejecucion_mediana": statistics.median(c["primera_ejecucion"] for c in corridas),
+            "modulos": corridas[-1]["modulos"],
+            "excepciones": corridas[-1]["excepciones"],
+        }
+        r = resultados[titulo]
+        print(f"{titulo:<24} importación {r['importacion_mediana']:6.2f} s   "
+              f"primera ejecución {r['primera_ejecucion_mediana']:6.2f} s   "
+              f"módulos: {', '.join(r['modulos']) or '-'}")
+
+    if args.json:
+        args.json.write_text(json.dumps(resultados, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""Tiempo de render de cada sección, por etapas, con datos reales y sintéticos.
+
+Cada sección se ejecuta con ``AppTest`` en un proceso nuevo de Python. Se
+mide la primera ejecución, una re-ejecución (con las cachés ya llenas) y las
+variantes que activan otros caminos de render (mapa interactivo, PNG). También
+se registran la memoria pico del proceso y el tiempo acumulado en cada etapa:
+lectura de tablas, carga del shapefile, cruces, TopoJSON, construcción y
+serialización de folium, mapas estáticos y especificación de Altair. Las
+etapas pueden solaparse; un cruce dentro de la construcción de un mapa cuenta
+en ambas.
+
+Hay dos escenarios:
+
+- ``repositorio``: las tablas de ``datos/`` y el shapefile del repositorio.
+- ``sintetico``: las mismas tablas ampliadas a los 125 municipios de la capa
+  y a 10 años, escritas en un directorio temporal.
+
+Cada corrida se agrega a ``benchmarks/resultados.jsonl`` con el commit, de
+modo que se puede comparar contra una corrida anterior.
+
+Uso::
+
+    python -m benchmarks.secciones                        # ambos escenarios, 3 repeticiones
+    python -m benchmarks.secciones --escenario sintetico -n 1
+    python -m benchmarks.secciones --comparar HEAD~1      # contra la corrida guardada de ese commit
+"""
+
+import argparse
+import functools
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+RUTA_RESULTADOS = Path(__file__).resolve().parent / "resultados.jsonl"
+ESCENARIOS = ("repositorio", "sintetico")
+ANIOS_SINTETICOS = 10
+# Cambio relativo a partir del cual una comparación se marca como regresión
+UMBRAL_REGRESION = 0.10
+
+# Etapa -> funciones que se cronometran (módulo, atributo con punto para métodos)
+ETAPAS = {
+    "lectura_tablas": [("demografia_antioquia.tablas", "_leer")],
+    "carga_shapefile": [("demografia_antioquia.geometria", "AlmacenGeometrias._cargar")],
+    "cruces": [("demografia_antioquia.municipios", "RegistroMunicipios.unir"),
+               ("pandas", "DataFrame.merge")],
+    "topojson": [("demografia_antioquia.topologia", "cargar_topojson")],
+    "folium_construccion": [("demografia_antioquia.mapas", "mapa_coropletico"),
+                            ("demografia_antioquia.mapas", "capa_teselas"),
+                            ("demografia_antioquia.mapas", "capa_etiquetas")],
+    "folium_serializacion": [("streamlit_folium", "st_folium")],
+    "mapa_estatico": [("demografia_antioquia.mapas_estaticos", "_coropleta")],
+    "altair_spec": [("altair", "TopLevelMixin.to_dict")],
+}
+
+# Sección -> variantes: (etiqueta, valores de widgets por key) tras la primera ejecución
+VARIANTES = {
+    "🚶‍♂️ Migración (2018)": [
+        ("mapa_png", {"migracion_mapa_formato": "png"}),
+        ("mapa_interactivo", {"migracion_mapa_interactivo": True}),
+    ],
+}
+
+
+# -----------------------------------------------------------
+# Instrumentación (en el proceso hijo)
+# -----------------------------------------------------------
+def instrumentar(etapas=ETAPAS):
+    """Envuelve las funciones de ``etapas`` y devuelve el acumulador por etapa.
+
+    Solo se cuenta la llamada más externa de cada etapa, para que la
+    recursión (``to_dict`` de un gráfico compuesto) no se sume dos veces.
+    """
+    acumulado = {nombre: {"llamadas": 0, "segundos": 0.0} for nombre in etapas}
+    profundidad = dict.fromkeys(etapas, 0)
+
+    def envolver(etapa, funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            profundidad[etapa] += 1
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                profundidad[etapa] -= 1
+                if profundidad[etapa] == 0:
+                    acumulado[etapa]["llamadas"] += 1
+                    acumulado[etapa]["segundos"] += time.perf_counter() - inicio
+        return envoltura
+
+    for etapa, objetivos in etapas.items():
+        for modulo, atributo in objetivos:
+            try:
+                dueno = importlib.import_module(modulo)
+            except ImportError:
+                continue
+            *ruta, nombre = atributo.split(".")
+            for parte in ruta:
+                dueno = getattr(dueno, parte)
+            setattr(dueno, nombre, envolver(etapa, getattr(dueno, nombre)))
+    return acumulado
+
+
+def _instantanea(acumulado):
+    resultado = {k: dict(v) for k, v in acumulado.items() if v["llamadas"]}
+    for v in acumulado.values():
+        v["llamadas"], v["segundos"] = 0, 0.0
+    return resultado
+
+
+def _memoria_pico_mb():
+    import resource
+
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def medicion_hija(titulo, directorio_datos=None):
+    """Mide la sección ``titulo`` en este proceso; se llama desde :func:`medir`."""
+    acumulado = instrumentar()
+    if directorio_datos:
+        from demografia_antioquia import tablas
+
+        tablas.DIRECTORIO_DATOS = Path(directorio_datos)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(RAIZ / "demografia.py"), default_timeout=600)
+    at.session_state["seccion"] = titulo
+    resultado = {"excepciones": []}
+
+    def correr(etiqueta):
+        inicio = time.perf_counter()
+        at.run()
+        resultado[etiqueta] = time.perf_counter() - inicio
+        resultado.setdefault("etapas", {})[etiqueta] = _instantanea(acumulado)
+        resultado["excepciones"].extend(e.value for e in at.exception)
+
+    correr("primera_ejecucion")
+    correr("reejecucion")
+    for etiqueta, widgets in VARIANTES.get(titulo, []):
+        for clave, valor in widgets.items():
+            at.session_state[clave] = valor
+        correr(etiqueta)
+    resultado["memoria_pico_mb"] = _memoria_pico_mb()
+    return resultado
+
+
+# -----------------------------------------------------------
+# Datos sintéticos
+# -----------------------------------------------------------
+def _ruido(datos, columnas, generador, escala=0.2):
+    # Factor aleatorio por fila, respetando los tipos enteros
+    factor = 1 + escala * (generador.random(len(datos)) - 0.5) * 2
+    for columna in columnas:
+        valores = datos[columna].to_numpy(dtype=float) * factor
+        datos[columna] = valores.round() if datos[columna].dtype.kind == "i" else valores
+    return datos
+
+
+def _tablas_municipales(capa, anio, generador):
+    import numpy as np
+    import pandas as pd
+
+    from demografia_antioquia.indicadores import COLUMNAS_MASCULINIDAD, masculinidad_migracion
+    from demografia_antioquia.origen_destino import derivar_columnas
+
+    n = len(capa)
+    nombres = capa["mpio_cnmbr"].to_numpy()
+    poblacion = generador.integers(3_000, 2_500_000, n)
+    no_migrantes = (poblacion * generador.uniform(0.85, 0.97, n)).astype(np.int64)
+    inmigrantes = poblacion - no_migrantes
+    emigrantes = (inmigrantes * generador.uniform(0.6, 1.4, n)).astype(np.int64)
+    migracion = pd.DataFrame({
+        "Municipio": nombres, "Poblacion_2020": poblacion,
+        "Poblacion_2015": no_migrantes + emigrantes, "No_migrantes": no_migrantes,
+        "Inmigrantes": inmigrantes, "Emigrantes": emigrantes,
+    })
+    total = migracion.drop(columns="Municipio").sum()
+    migracion = pd.concat([pd.DataFrame([{"Municipio": "TOTAL", **total.to_dict()}]), migracion],
+                          ignore_index=True)
+    migracion = derivar_columnas(migracion)
+
+    # Conteos por sexo alrededor de un índice de masculinidad de 85 a 100
+    partes = []
+    for conteo in (no_migrantes, inmigrantes, emigrantes):
+        hombres = (conteo * generador.uniform(0.46, 0.50, n)).astype(np.int64)
+        partes.extend([hombres, conteo - hombres])
+    indices = masculinidad_migracion(*partes)
+    masculinidad = pd.DataFrame({"Municipio": nombres,
+                                 **{COLUMNAS_MASCULINIDAD[k]: v for k, v in indices.items()}})
+    return {
+        "migracion": migracion.assign(anio=anio, territorio="AMVA"),
+        "masculinidad_migracion": masculinidad.assign(anio=anio, territorio="AMVA"),
+    }
+
+
+def datos_sinteticos(directorio, anios=ANIOS_SINTETICOS, semilla=0):
+    """Escribe en ``directorio`` las tablas del repositorio ampliadas.
+
+    Las tablas departamentales se repiten para el departamento y los 125
+    municipios de la capa, y todas para ``anios`` años hasta el del
+    repositorio, con un ruido aleatorio en los valores. Las de migración traen
+    una fila por municipio de la capa.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from demografia_antioquia import tablas
+    from demografia_antioquia.geometria import cargar_antioquia
+
+    generador = np.random.default_rng(semilla)
+    capa = cargar_antioquia()
+    territorios = ["05", *capa["mpio_cdpmp"].astype(str)]
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+    for nombre, esquema in tablas.ESQUEMAS.items():
+        if not tablas.ruta_tabla(nombre).exists():
+            continue
+        base = tablas._leer(nombre)
+        ultimo = int(base["anio"].max())
+        numericas = [c for c, tipo in esquema.items() if tipo != "str"]
+        partes = []
+        for anio in range(ultimo - anios + 1, ultimo + 1):
+            if nombre in ("migracion", "masculinidad_migracion"):
+                partes.append(_tablas_municipales(capa, anio, generador)[nombre])
+                continue
+            for territorio in territorios:
+                copia = base.assign(anio=anio, territorio=territorio)
+                partes.append(copia if (anio, territorio) == (ultimo, "05")
+                              else _ruido(copia, numericas, generador))
+        datos = tablas.aplicar_esquema(nombre, pd.concat(partes, ignore_index=True))
+        datos.to_parquet(directorio / f"{nombre}.parquet", index=False)
+    return directorio
+
+
+# -----------------------------------------------------------
+# Ejecución
+# -----------------------------------------------------------
+def medir(titulo, directorio_datos=None):
+    codigo = (f"import json, sys; sys.path.insert(0, {str(RAIZ)!r})\n"
+              "from benchmarks.secciones import medicion_hija\n"
+              f"print(json.dumps(medicion_hija({titulo!r}, {directorio_datos!r})))")
+    # Sin caché compartida: se mide el trabajo, no la lectura de resultados previos
+    entorno = {k: v for k, v in os.environ.items() if k != "DEMOGRAFIA_CACHE"}
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True,
+                            text=True, check=True, cwd=RAIZ, env=entorno)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def _resumir(corridas):
+    # Medianas de los tiempos; las etapas y excepciones son las de la última corrida
+    ultima = corridas[-1]
+    tiempos = [k for k, v in ultima.items() if isinstance(v, float)]
+    return {
+        **{k: statistics.median(c[k] for c in corridas) for k in tiempos},
+        "etapas": ultima["etapas"],
+        "excepciones": ultima["excepciones"],
+    }
+
+
+def correr_escenario(escenario, repeticiones=3, secciones=None):
+    from demografia_antioquia.secciones import SECCIONES
+
+    with tempfile.TemporaryDirectory() as temporal:
+        directorio = str(datos_sinteticos(temporal)) if escenario == "sintetico" else None
+        resultados = {}
+        for titulo in secciones or SECCIONES:
+            resultados[titulo] = _resumir([medir(titulo, directorio) for _ in range(repeticiones)])
+            _imprimir(titulo, resultados[titulo])
+    return resultados
+
+
+def _imprimir(titulo, r):
+    variantes = [k for k in r if k not in ("etapas", "excepciones", "memoria_pico_mb",
+                                             "primera_ejecucion", "reejecucion")]
+    print(f"{titulo:<24} primera {r['primera_ejecucion']:6.2f} s   re-ejecución {r['reejecucion']:6.2f} s   "
+          f"memoria pico {r['memoria_pico_mb']:7.1f} MB"
+          + "".join(f"   {v} {r[v]:6.2f} s" for v in variantes))
+    for corrida, etapas in r["etapas"].items():
+        if corrida != "reejecucion" and etapas:
+            print(f"    {corrida}: " + ", ".join(f"{etapa} {valor['segundos']:.3f} s ({valor['llamadas']})"
+                                          for etapa, valor in etapas.items()))
+    if r["excepciones"]:
+        print(f"    excepciones: {r['excepciones']}")
+
+
+# -----------------------------------------------------------
+# Historial y comparación
+# -----------------------------------------------------------
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True,
+                              cwd=RAIZ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def guardar(escenario, resultados, ruta=RUTA_RESULTADOS):
+    registro = {
+        "commit": _git("rev-parse", "HEAD"),
+        "cambios_sin_commit": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "escenario": escenario,
+        "python": platform.python_version(),
+        "maquina": platform.node(),
+        "procesadores": os.cpu_count(),
+        "secciones": resultados,
+    }
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    return registro
+
+
+def historial(ruta=RUTA_RESULTADOS):
+    if not ruta.exists():
+        return []
+    with open(ruta, encoding="utf-8") as archivo:
+        return [json.loads(linea) for linea in archivo if linea.strip()]
+
+
+def buscar(referencia, escenario, ruta=RUTA_RESULTADOS):
+    """Última corrida guardada del commit ``referencia`` (hash o nombre de git) y escenario."""
+    commit = _git("rev-parse", referencia) or referencia
+    candidatas = [r for r in historial(ruta)
+                  if r["escenario"] == escenario and r["commit"] and r["commit"].startswith(commit)]
+    return candidatas[-1] if candidatas else None
+
+
+def comparar(anterior, actual, umbral=UMBRAL_REGRESION):
+    """Cambio relativo de cada medición; marca las que empeoran más que ``umbral``."""
+    filas = []
+    for titulo, medidas in actual["secciones"].items():
+        previas = anterior["secciones"].get(titulo, {})
+        for clave, valor in medidas.items():
+            if not isinstance(valor, float) or not previas.get(clave):
+                continue
+            cambio = valor / previas[clave] - 1
+            filas.append((titulo, clave, previas[clave], valor, cambio, cambio > umbral))
+    return filas
+
+
+def main(argv=None):
+    sys.path.insert(0, str(RAIZ))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escenario", choices=ESCENARIOS, action="append",
+                        help="por defecto, todos")
+    parser.add_argument("-n", "--repeticiones", type=int, default=3)
+    parser.add_argument("--seccion", action="append", help="título de la sección (por defecto, todas)")
+    parser.add_argument("--comparar", metavar="COMMIT", help="compara con la corrida guardada de ese commit")
+    parser.add_argument("--sin-guardar", action="store_true")
+    parser.add_argument("--resultados", type=Path, default=RUTA_RESULTADOS)
+    args = parser.parse_args(argv)
+
+    regresiones = 0
+    for escenario in args.escenario or ESCENARIOS:
+        print(f"== {escenario}")
+        resultados = correr_escenario(escenario, args.repeticiones, args.seccion)
+        actual = {"escenario": escenario, "secciones": resultados}
+        anterior = buscar(args.comparar, escenario, args.resultados) if args.comparar else None
+        if not args.sin_guardar:
+            guardar(escenario, resultados, args.resultados)
+        if args.comparar and anterior is None:
+            print(f"   Sin corrida guardada de {args.comparar} para '{escenario}'")
+        elif anterior:
+            print(f"   Comparación con {anterior['commit'][:10]} ({anterior['fecha']})")
+            for titulo, clave, antes, ahora, cambio, empeora in comparar(anterior, actual):
+                marca = "  ← regresión" if empeora else ""
+                regresiones += empeora
+                print(f"   {titulo:<24} {clave:<20} {antes:8.2f} → {ahora:8.2f}  ({cambio:+.0%}){marca}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
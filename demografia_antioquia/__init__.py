@@ -0,0 +1 @@
+"""Utilidades compartidas por el dashboard demográfico de Antioquia."""
@@ -0,0 +1,264 @@
+"""Almacén versionado de cubos de conteos con actualización incremental.
+
+Cada fuente (``defunciones``, ``nacimientos``, ``censo``) guarda sus cubos en
+``datos/agregados/<fuente>/`` como instantáneas inmutables ``vNNNN.parquet``,
+con claves :data:`~demografia_antioquia.ingesta.DIMENSIONES` (año, mes,
+municipio, sexo, grupo de edad, causa). Un archivo ``versiones.json`` registra
+cada versión, el lote que la produjo y cuál está publicada.
+
+Un lote mensual del DANE se reduce primero a un cubo pequeño (el delta) y se
+combina con la última versión: se suman los conteos o, si el lote es una
+nueva publicación de meses ya cargados, se reemplazan esos meses. Publicar una
+versión compara su cubo con el publicado, identifica los pares (año,
+municipio) que cambiaron y vuelve a derivar solo esas filas de las tablas del
+dashboard. El total departamental de un año solo se recalcula si el cubo trae
+todos los municipios de ese año; si no, se conservan las filas originales.
+Antes de la primera publicación se guarda una copia de cada tabla derivada en
+``originales/``: las filas que el cubo ya no cubre (por ejemplo, al publicar la
+versión 0) vuelven a su valor original en lugar de desaparecer. Publicar una
+versión anterior deja el dashboard fijo en esa instantánea.
+
+Uso::
+
+    python -m demografia_antioquia.agregados defunciones aplicar nofetal_2024_03.csv --publicar
+    python -m demografia_antioquia.agregados defunciones publicar 3
+    python -m demografia_antioquia.agregados defunciones versiones
+"""
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from demografia_antioquia import ingesta
+from demografia_antioquia.municipios import registro_municipios
+from demografia_antioquia.tablas import (CLAVES, DIRECTORIO_DATOS, ESQUEMAS, aplicar_esquema,
+                                         reemplazar_filas, ruta_tabla)
+
+DIRECTORIO_AGREGADOS = DIRECTORIO_DATOS / "agregados"
+MODOS = ("sumar", "reemplazar")
+
+
+# -----------------------------------------------------------
+# Combinación de cubos
+# -----------------------------------------------------------
+def combinar(base, delta, modo="sumar"):
+    """Cubo resultante de aplicar ``delta`` sobre ``base``.
+
+    ``modo="sumar"`` agrega los conteos; ``modo="reemplazar"`` descarta de
+    ``base`` los (año, mes) que trae el delta antes de sumarlo.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconocido: {modo!r}")
+    if modo == "reemplazar" and len(base):
+        meses = pd.MultiIndex.from_frame(delta[["anio", "mes"]].drop_duplicates())
+        base = base[~pd.MultiIndex.from_frame(base[["anio", "mes"]]).isin(meses)]
+    cubo = pd.concat([base, delta], ignore_index=True)
+    cubo = cubo.groupby(ingesta.DIMENSIONES, as_index=False, dropna=False)["conteo"].sum()
+    return cubo[cubo["conteo"] != 0].reset_index(drop=True)
+
+
+def diferencias(anterior, nuevo):
+    """Pares (año, territorio) cuyos conteos difieren entre dos cubos."""
+    claves = ingesta.DIMENSIONES
+    unidos = anterior.merge(nuevo, on=claves, how="outer", suffixes=("_a", "_n"))
+    distintos = unidos[unidos["conteo_a"].fillna(0) != unidos["conteo_n"].fillna(0)]
+    return distintos[["anio", "territorio"]].drop_duplicates().reset_index(drop=True)
+
+
+# -----------------------------------------------------------
+# Almacén
+# -----------------------------------------------------------
+class AlmacenAgregados:
+    """Versiones de los cubos de una fuente, con publicación incremental."""
+
+    def __init__(self, fuente, directorio=DIRECTORIO_AGREGADOS):
+        if fuente not in ingesta.FUENTES:
+            raise KeyError(f"Fuente desconocida: {fuente!r}")
+        self.fuente = fuente
+        self.directorio = directorio / fuente
+        # Reentrante: aplicar y publicar cargan cubos mientras lo tienen tomado
+        self._lock = threading.RLock()
+        self._cache = {}
+
+    # --- manifiesto ---
+    @property
+    def _ruta_manifiesto(self):
+        return self.directorio / "versiones.json"
+
+    def _manifiesto(self):
+        if not self._ruta_manifiesto.exists():
+            return {"versiones": [], "publicada": None}
+        return json.loads(self._ruta_manifiesto.read_text(encoding="utf-8"))
+
+    def _guardar_manifiesto(self, manifiesto):
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        temporal = self._ruta_manifiesto.with_suffix(".tmp")
+        temporal.write_text(json.dumps(manifiesto, ensure_ascii=False, indent=2), encoding="utf-8")
+        temporal.replace(self._ruta_manifiesto)
+
+    def versiones(self):
+        return self._manifiesto()["versiones"]
+
+    def ultima(self):
+        versiones = self.versiones()
+        return versiones[-1]["version"] if versiones else 0
+
+    def publicada(self):
+        return self._manifiesto()["publicada"]
+
+    # --- instantáneas ---
+    def _ruta(self, version):
+        return self.directorio / f"v{version:04d}.parquet"
+
+    def cargar(self, version=None):
+        """Cubo de ``version`` (por defecto la publicada, o la última si no hay)."""
+        if version is None:
+            publicada = self.publicada()
+            version = self.ultima() if publicada is None else publicada
+        if version == 0:
+            return pd.DataFrame(columns=ingesta.DIMENSIONES + ["conteo"])
+        with self._lock:
+            if version not in self._cache:
+                self._cache[version] = pd.read_parquet(self._ruta(version))
+            return self._cache[version]
+
+    def aplicar(self, delta, descripcion="", modo="sumar"):
+        """Crea una versión nueva combinando ``delta`` con la última; devuelve su número.
+
+        El lock se mantiene desde que se lee el manifiesto hasta que se
+        reescribe, de modo que dos lotes simultáneos no reciben el mismo número.
+        """
+        inicio = time.perf_counter()
+        with self._lock:
+            manifiesto = self._manifiesto()
+            anterior = manifiesto["versiones"][-1]["version"] if manifiesto["versiones"] else 0
+            cubo = combinar(self.cargar(anterior), delta, modo)
+            version = anterior + 1
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            cubo.to_parquet(self._ruta(version), index=False)
+            self._cache[version] = cubo
+            manifiesto["versiones"].append({
+                "version": version,
+                "base": anterior,
+                "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "descripcion": descripcion,
+                "modo": modo,
+                "filas_delta": int(len(delta)),
+                "registros_delta": int(delta["conteo"].sum()),
+                "combinaciones": int(len(cubo)),
+                "segundos": round(time.perf_counter() - inicio, 3),
+            })
+            self._guardar_manifiesto(manifiesto)
+        return version
+
+    def aplicar_archivo(self, ruta, modo="sumar", **opciones):
+        """Lee un lote de microdatos por bloques (ver :func:`ingesta.agregar`) y lo aplica."""
+        delta = ingesta.agregar(ruta, self.fuente, **opciones)
+        return self.aplicar(delta, descripcion=str(ruta), modo=modo)
+
+    # --- tablas originales ---
+    def _originales(self, nombre):
+        # Copia de la tabla tal como estaba antes de publicar cualquier versión
+        ruta = self.directorio / "originales" / f"{nombre}.parquet"
+        if ruta.exists():
+            return aplicar_esquema(nombre, pd.read_parquet(ruta))
+        if ruta_tabla(nombre).exists():
+            originales = pd.read_parquet(ruta_tabla(nombre))
+        else:
+            originales = pd.DataFrame(columns=[*CLAVES, *ESQUEMAS[nombre]])
+        originales = aplicar_esquema(nombre, originales)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        originales.to_parquet(ruta, index=False)
+        return originales
+
+    def publicar(self, version=None):
+        """Deja ``version`` visible en el dashboard recalculando solo las filas afectadas.
+
+        Las filas de municipios que el cubo cubre y los totales departamentales
+        de los años con todos los municipios se derivan del cubo; las demás
+        filas afectadas se restauran desde las tablas originales.
+        Devuelve los pares (año, territorio) reescritos en las tablas derivadas.
+        """
+        with self._lock:
+            version = self.ultima() if version is None else version
+            if version != 0 and not self._ruta(version).exists():
+                raise ValueError(f"No existe la versión {version} de {self.fuente!r}")
+            anterior = self.publicada() or 0
+            cubo_anterior, cubo = self.cargar(anterior), self.cargar(version)
+            afectados = diferencias(cubo_anterior, cubo)
+            if len(afectados):
+                self._reescribir(cubo, afectados)
+            manifiesto = self._manifiesto()
+            manifiesto["publicada"] = version
+            self._guardar_manifiesto(manifiesto)
+        return afectados
+
+    def _reescribir(self, cubo, afectados):
+        # Para el total departamental hacen falta todos los municipios del año
+        anios = afectados["anio"].unique()
+        cubo = cubo[cubo["anio"].isin(anios)]
+        municipios = set(registro_municipios().codigos)
+        completos = [anio for anio, territorios in cubo.groupby("anio")["territorio"]
+                     if municipios <= set(territorios)]
+        departamentos = afectados.assign(territorio=afectados["territorio"].str[:2]).drop_duplicates()
+        claves = pd.concat([afectados, departamentos], ignore_index=True)
+        derivables = pd.concat([afectados, departamentos[departamentos["anio"].isin(completos)]],
+                               ignore_index=True)
+        tablas = ingesta.tablas_desde_cubos(**{self.fuente: cubo}) if len(cubo) else {}
+        for nombre in ingesta.TABLAS_DERIVADAS[self.fuente]:
+            originales = self._originales(nombre)
+            nuevas = tablas[nombre].merge(derivables, on=list(CLAVES)) if nombre in tablas else originales.iloc[:0]
+            cubiertas = nuevas[list(CLAVES)].drop_duplicates()
+            restantes = claves.merge(cubiertas, how="left", indicator=True)
+            restantes = restantes.loc[restantes["_merge"] == "left_only", list(CLAVES)]
+            restauradas = originales.merge(restantes, on=list(CLAVES))
+            reemplazar_filas(nombre, pd.concat([nuevas, restauradas], ignore_index=True), claves=claves)
+
+
+def almacen(fuente):
+    """Almacén de ``fuente`` en el directorio de datos del repositorio."""
+    return AlmacenAgregados(fuente)
+
+
+# -----------------------------------------------------------
+# Línea de comandos
+# -----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cubos versionados con actualización incremental.")
+    parser.add_argument("fuente", choices=sorted(ingesta.FUENTES))
+    ordenes = parser.add_subparsers(dest="orden", required=True)
+    aplicar = ordenes.add_parser("aplicar", help="agrega un lote de microdatos como nueva versión")
+    aplicar.add_argument("ruta")
+    aplicar.add_argument("--modo", choices=MODOS, default="sumar")
+    aplicar.add_argument("--bloque", type=int, default=500_000)
+    aplicar.add_argument("--publicar", action="store_true")
+    publicar = ordenes.add_parser("publicar", help="fija el dashboard en una versión")
+    publicar.add_argument("version", type=int, nargs="?")
+    ordenes.add_parser("versiones", help="lista las versiones")
+    args = parser.parse_args(argv)
+
+    destino = almacen(args.fuente)
+    if args.orden == "aplicar":
+        version = destino.aplicar_archivo(args.ruta, modo=args.modo, tamano_bloque=args.bloque)
+        print(f"Versión {version} creada")
+        if args.publicar:
+            args.version = version
+    if args.orden == "publicar" or getattr(args, "publicar", False):
+        inicio = time.perf_counter()
+        afectados = destino.publicar(args.version)
+        print(f"Versión {destino.publicada()} publicada: {len(afectados)} pares (año, municipio) "
+              f"recalculados en {time.perf_counter() - inicio:.2f} s")
+    if args.orden == "versiones":
+        publicada = destino.publicada()
+        for v in destino.versiones():
+            marca = "*" if v["version"] == publicada else " "
+            print(f"{marca} v{v['version']:04d}  {v['fecha']}  {v['modo']:<10} "
+                  f"{v['registros_delta']:>10,} registros  {v['descripcion']}")
+
+
+if __name__ == "__main__":
+    main()
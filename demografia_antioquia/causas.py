@@ -0,0 +1,230 @@
+"""Cubo de causas de muerte (lista 6/67 de la OPS) con agregados precalculados.
+
+El cubo tiene las dimensiones año, territorio, sexo y grupo de edad, y dos
+niveles de causa: el gran grupo (primer dígito del código: 1 transmisibles,
+2 neoplasias, 3 circulatorio...) y la causa de tres dígitos. Al construirlo se
+calculan las sumas para cada combinación de dimensiones fijadas (2^4
+agregados por nivel), de modo que una consulta con cualquier filtro es una
+selección sobre un índice ya agregado más un ordenamiento de pocas filas, sin
+volver a recorrer los registros.
+
+Si hay un cubo de defunciones publicado (ver :mod:`demografia_antioquia.agregados`)
+se usa ese; si no, el cubo se siembra con la tabla ``causas_mortalidad``
+(solo totales departamentales).
+"""
+
+import re
+import threading
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONES = ["anio", "territorio", "sexo", "edad"]
+NIVELES = ("grupo", "causa")
+TODOS = None
+
+GRUPOS_667 = {
+    "1": "Enfermedades transmisibles",
+    "2": "Neoplasias (tumores)",
+    "3": "Enfermedades del sistema circulatorio",
+    "4": "Afecciones del periodo perinatal",
+    "5": "Causas externas",
+    "6": "Todas las demás enfermedades",
+    "7": "Síntomas, signos y afecciones mal definidas",
+    "9": "Resto de causas",
+}
+# Defunciones que la tabla publicada no desagrega por causa
+RESTO = "999"
+
+# Filas de ``causas_mortalidad`` cuyo texto no trae el código 6/67 completo
+_CODIGOS_TABLA = {
+    "Tumor órg. digestivos": "203",
+    "Cardiovascular otras": "304",
+}
+
+
+# -----------------------------------------------------------
+# Cubo
+# -----------------------------------------------------------
+class CuboCausas:
+    """Conteos de defunciones por causa con agregados para cada filtro posible.
+
+    ``conteos`` tiene columnas :data:`DIMENSIONES`, ``causa`` (código 6/67) y
+    ``conteo``. ``poblacion`` (opcional) es una Serie indexada por
+    ``(anio, territorio, sexo)`` para calcular tasas; ``nombres`` traduce
+    códigos a ``(nombre, nombre corto)``.
+    """
+
+    def __init__(self, conteos, poblacion=None, nombres=None):
+        datos = conteos.copy()
+        datos["causa"] = datos["causa"].astype(str)
+        datos["grupo"] = datos["causa"].str[0]
+        for dim in DIMENSIONES:
+            datos[dim] = datos[dim].astype(str)
+        self.valores = {dim: sorted(datos[dim].unique()) for dim in DIMENSIONES}
+        self._poblaciones = poblacion
+        self.nombres = nombres or {}
+        self._agregados = {}
+        for n in range(len(DIMENSIONES) + 1):
+            for fijas in combinations(DIMENSIONES, n):
+                for nivel in NIVELES:
+                    suma = datos.groupby([*fijas, nivel], observed=True)["conteo"].sum()
+                    self._agregados[fijas, nivel] = suma.sort_index()
+
+    def __len__(self):
+        return int(self._agregados[(), "causa"].sum())
+
+    def _seleccion(self, filtros, nivel):
+        fijas = tuple(d for d in DIMENSIONES if filtros.get(d) is not TODOS)
+        serie = self._agregados[fijas, nivel]
+        if fijas:
+            clave = tuple(str(filtros[d]) for d in fijas)
+            try:
+                serie = serie.xs(clave, level=list(fijas))
+            except KeyError:
+                return pd.Series(dtype="int64")
+        return serie
+
+    def poblacion(self, **filtros):
+        """Población del corte (``NaN`` si no se conoce, p. ej. al filtrar por edad)."""
+        if self._poblaciones is None or filtros.get("edad") is not TODOS:
+            return np.nan
+        p = self._poblaciones
+        for nivel, dim in enumerate(["anio", "territorio", "sexo"]):
+            valor = filtros.get(dim)
+            niveles = p.index.get_level_values(nivel)
+            if valor is not TODOS:
+                p = p[niveles == str(valor)]
+            elif dim == "territorio":
+                # Sin filtro de territorio, la población del departamento
+                p = p[niveles.str.len() == 2]
+            elif dim == "sexo":
+                p = p[niveles == "Total"]
+        return float(p.sum()) if len(p) else np.nan
+
+    def nombre(self, codigo, nivel="causa"):
+        if nivel == "grupo":
+            return GRUPOS_667.get(codigo, f"Grupo {codigo}")
+        return self.nombres.get(codigo, (f"Causa {codigo}",))[0]
+
+    def nombre_corto(self, codigo, nivel="causa"):
+        if nivel == "grupo":
+            return GRUPOS_667.get(codigo, f"Grupo {codigo}")
+        nombres = self.nombres.get(codigo)
+        return nombres[1] if nombres else codigo
+
+    def consultar(self, anio=TODOS, territorio=TODOS, sexo=TODOS, edad=TODOS,
+                  nivel="causa", grupo=None, top=17, por=1000):
+        """Ranking de causas (o grupos) para los filtros dados.
+
+        Devuelve ``Codigo, Causa, Causa_corta, Total, %, TMxCE``, ordenado de
+        mayor a menor y recortado a ``top`` filas. ``%`` se calcula sobre
+        todas las defunciones del corte y ``TMxCE`` (por ``por`` habitantes)
+        solo si hay población para el corte.
+        """
+        if nivel not in NIVELES:
+            raise ValueError(f"Nivel desconocido: {nivel!r}")
+        filtros = {"anio": anio, "territorio": territorio, "sexo": sexo, "edad": edad}
+        serie = self._seleccion(filtros, nivel)
+        total = serie.sum()
+        serie = serie.drop([RESTO, RESTO[0]], errors="ignore")
+        if grupo is not None and nivel == "causa":
+            serie = serie[serie.index.str.startswith(str(grupo))]
+        serie = serie.sort_values(ascending=False, kind="stable")
+        if top:
+            serie = serie.iloc[:top]
+        poblacion = self.poblacion(**filtros)
+        codigos = serie.index.tolist()
+        return pd.DataFrame({
+            "Codigo": codigos,
+            "Causa": [self.nombre(c, nivel) for c in codigos],
+            "Causa_corta": [self.nombre_corto(c, nivel) for c in codigos],
+            "Total": serie.to_numpy(dtype="int64"),
+            "%": np.round(100 * serie.to_numpy(dtype=float) / total, 2) if total else np.nan,
+            "TMxCE": serie.to_numpy(dtype=float) * por / poblacion,
+        })
+
+    def total(self, **filtros):
+        """Defunciones de todas las causas en el corte."""
+        return int(self._seleccion({d: filtros.get(d) for d in DIMENSIONES}, "grupo").sum())
+
+
+# -----------------------------------------------------------
+# Construcción desde los datos del repositorio
+# -----------------------------------------------------------
+def _codigo(causa, corta):
+    if corta in _CODIGOS_TABLA:
+        return _CODIGOS_TABLA[corta]
+    coincidencia = re.match(r"\s*(\d{3})\s", causa)
+    return coincidencia.group(1) if coincidencia else RESTO
+
+
+def desde_tabla(causas, general):
+    """Cubo sembrado con ``causas_mortalidad`` y ``mortalidad_general`` (sin filtrar).
+
+    Las defunciones que no están entre las causas listadas se guardan como
+    :data:`RESTO` para que los porcentajes sean sobre el total de defunciones.
+    """
+    codigos = [_codigo(c, k) for c, k in zip(causas["Causa"], causas["Causa_corta"])]
+    nombres = dict(zip(codigos, zip(causas["Causa"].str.replace(r"^\d+\s+", "", regex=True),
+                                    causas["Causa_corta"])))
+    conteos = causas.assign(causa=codigos, sexo="Total", edad="Total", conteo=causas["Total"])
+    defunciones = general[general["Indicador"].str.startswith("Defunciones")]
+    totales = defunciones.set_index(["anio", "territorio"])["Total"]
+    listadas = conteos.groupby(["anio", "territorio"])["conteo"].sum()
+    resto = (totales - listadas.reindex(totales.index, fill_value=0)).clip(lower=0)
+    conteos = pd.concat([
+        conteos[["anio", "territorio", "sexo", "edad", "causa", "conteo"]],
+        resto.rename("conteo").reset_index().assign(sexo="Total", edad="Total", causa=RESTO),
+    ], ignore_index=True)
+    return CuboCausas(conteos, _poblacion_general(general), nombres)
+
+
+def desde_microdatos(cubo, general, nombres=None):
+    """Cubo a partir del cubo de defunciones de :mod:`demografia_antioquia.ingesta`."""
+    cubo = cubo[cubo["causa"].astype(str).str.len() > 0]
+    cubo = cubo.groupby(["anio", "territorio", "sexo", "edad", "causa"], as_index=False)["conteo"].sum()
+    return CuboCausas(cubo, _poblacion_general(general), nombres)
+
+
+def _poblacion_general(general):
+    # Población por (año, territorio, sexo) a partir de las filas "Población <año>"
+    filas = general[general["Indicador"].str.startswith("Población")]
+    largo = filas.melt(id_vars=["anio", "territorio"], value_vars=["Hombres", "Mujeres", "Total"],
+                       var_name="sexo", value_name="poblacion")
+    largo["anio"] = largo["anio"].astype(str)
+    return largo.set_index(["anio", "territorio", "sexo"])["poblacion"]
+
+
+_cache = None
+_firma = None
+_lock = threading.Lock()
+
+
+def cubo_causas():
+    """Cubo de causas con los mejores datos disponibles en el repositorio.
+
+    Se construye una vez por proceso y se reconstruye solo si cambian las
+    tablas o la versión publicada de las defunciones.
+    """
+    global _cache, _firma
+    from demografia_antioquia.agregados import almacen
+    from demografia_antioquia.tablas import cargar_tabla, ruta_tabla
+
+    defunciones = almacen("defunciones")
+    version = defunciones.publicada() if defunciones.versiones() else None
+    firma = (
+        ruta_tabla("causas_mortalidad").stat().st_mtime_ns,
+        ruta_tabla("mortalidad_general").stat().st_mtime_ns,
+        version,
+    )
+    with _lock:
+        if _cache is None or firma != _firma:
+            general = cargar_tabla("mortalidad_general")
+            causas = cargar_tabla("causas_mortalidad")
+            _cache = desde_tabla(causas, general)
+            if version:
+                _cache = desde_microdatos(defunciones.cargar(version), general, _cache.nombres)
+            _firma = firma
+        return _cache
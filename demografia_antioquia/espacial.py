@@ -0,0 +1,240 @@
+"""Índice espacial de municipios para asignar puntos (lon, lat) a ``mpio_cdpmp``.
+
+Las direcciones geocodificadas de defunciones y nacimientos llegan por
+millones, y preguntar a cada polígono si contiene cada punto es demasiado lento.
+Aquí los polígonos de la capa se recortan con una rejilla regular (por defecto
+de 0,1°). Cada pieza queda con pocos vértices y su caja envolvente se ajusta
+bien a ella. Las piezas se guardan en un ``STRtree`` de shapely, que se
+consulta con el arreglo completo de puntos en una sola llamada vectorizada.
+Con lotes grandes, los puntos se reparten por bloques entre procesos, y cada
+proceso construye su copia del índice una sola vez.
+
+Uso::
+
+    python -m demografia_antioquia.espacial direcciones.csv --lon longitud --lat latitud -o asignadas.csv
+"""
+
+import argparse
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Lado de las celdas con que se recortan los polígonos (grados)
+PASO_REJILLA = 0.1
+# Por debajo de este número de puntos no vale la pena usar procesos
+UMBRAL_PROCESOS = 2_000_000
+# Puntos por bloque de trabajo
+TAMANO_BLOQUE = 500_000
+SIN_MUNICIPIO = -1
+
+
+# -----------------------------------------------------------
+# Índice
+# -----------------------------------------------------------
+def _recortar(geometrias, paso):
+    # Piezas de cada polígono dentro de las celdas de la rejilla que toca
+    import shapely
+
+    x0, y0, x1, y1 = shapely.total_bounds(geometrias)
+    xs = np.arange(x0, x1 + paso, paso)
+    ys = np.arange(y0, y1 + paso, paso)
+    izq, abajo = (a.ravel() for a in np.meshgrid(xs[:-1], ys[:-1]))
+    der, arriba = (a.ravel() for a in np.meshgrid(xs[1:], ys[1:]))
+    celdas = shapely.box(izq, abajo, der, arriba)
+    i_celda, i_poligono = shapely.STRtree(geometrias).query(celdas, predicate="intersects")
+    piezas = shapely.intersection(geometrias[i_poligono], celdas[i_celda])
+    validas = ~shapely.is_empty(piezas)
+    return piezas[validas], i_poligono[validas]
+
+
+class IndiceMunicipios:
+    """``STRtree`` sobre los polígonos municipales recortados por una rejilla.
+
+    ``geometrias`` es un arreglo de polígonos en EPSG:4326 y ``codigos`` el
+    ``mpio_cdpmp`` de cada uno, en el mismo orden.
+    """
+
+    def __init__(self, geometrias, codigos, paso=PASO_REJILLA):
+        import shapely
+
+        self.geometrias = np.asarray(geometrias, dtype=object)
+        self.codigos = np.asarray(codigos, dtype=object)
+        self.paso = paso
+        inicio = time.perf_counter()
+        self._piezas, self._duenos = _recortar(self.geometrias, paso) if paso else (
+            self.geometrias, np.arange(len(self.geometrias)))
+        self._arbol = shapely.STRtree(self._piezas)
+        self.tiempo_construccion = time.perf_counter() - inicio
+        self._pool = None
+        self._procesos_pool = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __reduce__(self):
+        # Se reconstruye en el proceso de destino en lugar de copiar el árbol
+        return IndiceMunicipios, (self.geometrias, self.codigos, self.paso)
+
+    def posiciones(self, lon, lat):
+        """Posición del municipio que contiene cada punto, o :data:`SIN_MUNICIPIO`.
+
+        Un punto sobre la frontera entre dos municipios se asigna al de menor
+        posición en la capa, de modo que el resultado es determinista.
+        """
+        import shapely
+
+        lon = np.asarray(lon, dtype=float)
+        lat = np.asarray(lat, dtype=float)
+        puntos = shapely.points(lon, lat)
+        i_punto, i_pieza = self._arbol.query(puntos, predicate="intersects")
+        resultado = np.full(len(puntos), SIN_MUNICIPIO, dtype=np.int64)
+        if len(i_punto):
+            duenos = self._duenos[i_pieza]
+            orden = np.lexsort((duenos, i_punto))
+            unicos, primero = np.unique(i_punto[orden], return_index=True)
+            resultado[unicos] = duenos[orden][primero]
+        return resultado
+
+    def _obtener_pool(self, procesos):
+        # Se recrea si cambia el número de procesos. "spawn" porque el servidor
+        # de Streamlit tiene hilos y un fork puede dejar locks tomados en los hijos
+        with self._lock:
+            if self._pool is None or self._procesos_pool != procesos:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=procesos, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_iniciar_proceso, initargs=(self,))
+                self._procesos_pool = procesos
+                _con_pool.add(self)
+            return self._pool
+
+    def cerrar_pool(self):
+        """Termina los procesos del pool del índice, si existe."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+            self._procesos_pool = None
+
+    def asignar(self, lon, lat, procesos=None, tamano_bloque=TAMANO_BLOQUE):
+        """``mpio_cdpmp`` de cada punto (``None`` si cae fuera de la capa).
+
+        ``procesos=None`` reparte los bloques entre un proceso por núcleo solo
+        si hay más de :data:`UMBRAL_PROCESOS` puntos; ``procesos=n`` los
+        reparte entre ``n`` procesos y ``procesos=1`` lo hace todo en el
+        proceso actual.
+        """
+        lon = np.asarray(lon, dtype=float).reshape(-1)
+        lat = np.asarray(lat, dtype=float).reshape(-1)
+        if procesos is None:
+            procesos = os.cpu_count() if len(lon) > UMBRAL_PROCESOS else 1
+        bloques = [slice(i, i + tamano_bloque) for i in range(0, len(lon), tamano_bloque)]
+        if procesos > 1 and len(bloques) > 1:
+            pool = self._obtener_pool(procesos)
+            partes = list(pool.map(_posiciones_bloque, [lon[b] for b in bloques], [lat[b] for b in bloques]))
+        else:
+            partes = [self.posiciones(lon[b], lat[b]) for b in bloques]
+        posiciones = np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+        codigos = np.append(self.codigos, None)
+        return codigos[posiciones]
+
+    def asignar_tabla(self, datos, lon="lon", lat="lat", destino="mpio_cdpmp", **opciones):
+        """Copia de ``datos`` con la columna ``destino`` calculada desde ``lon``/``lat``."""
+        datos = datos.copy()
+        datos[destino] = self.asignar(datos[lon].to_numpy(), datos[lat].to_numpy(), **opciones)
+        return datos
+
+
+# Índices con pool abierto, para terminarlos al salir
+_con_pool = weakref.WeakSet()
+
+
+@atexit.register
+def cerrar_pools():
+    """Termina los pools de todos los índices."""
+    for indice in list(_con_pool):
+        indice.cerrar_pool()
+
+
+# Índice del proceso de trabajo, creado por el inicializador del pool
+_indice_proceso = None
+
+
+def _iniciar_proceso(indice):
+    global _indice_proceso
+    _indice_proceso = indice
+
+
+def _posiciones_bloque(lon, lat):
+    return _indice_proceso.posiciones(lon, lat)
+
+
+# -----------------------------------------------------------
+# Índice compartido de la capa del repositorio
+# -----------------------------------------------------------
+_cache = None
+_firma = None
+_lock = threading.Lock()
+
+
+def indice_municipios():
+    """Índice de la capa de Antioquia, compartido por el proceso.
+
+    Se reconstruye solo si el almacén de geometrías recarga el shapefile.
+    """
+    global _cache, _firma
+    from demografia_antioquia.geometria import almacen, cargar_antioquia
+
+    capa = cargar_antioquia()
+    firma = almacen.estadisticas()["cargas"]
+    with _lock:
+        if _cache is None or firma != _firma:
+            _cache = IndiceMunicipios(capa.geometry.values, capa["mpio_cdpmp"].astype(str).values)
+            _firma = firma
+        return _cache
+
+
+def asignar_municipios(lon, lat, **opciones):
+    """``mpio_cdpmp`` de cada punto (lon, lat) usando el índice de la capa de Antioquia."""
+    return indice_municipios().asignar(lon, lat, **opciones)
+
+
+# -----------------------------------------------------------
+# Línea de comandos
+# -----------------------------------------------------------
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Asigna puntos (lon, lat) a municipios de Antioquia.")
+    parser.add_argument("ruta", help="CSV o Parquet con las coordenadas")
+    parser.add_argument("--lon", default="lon")
+    parser.add_argument("--lat", default="lat")
+    parser.add_argument("--destino", default="mpio_cdpmp")
+    parser.add_argument("--procesos", type=int)
+    parser.add_argument("-o", "--salida", required=True)
+    args = parser.parse_args(argv)
+
+    leer = pd.read_parquet if args.ruta.endswith(".parquet") else pd.read_csv
+    datos = leer(args.ruta)
+    inicio = time.perf_counter()
+    datos = indice_municipios().asignar_tabla(datos, args.lon, args.lat, args.destino,
+                                              procesos=args.procesos)
+    segundos = time.perf_counter() - inicio
+    fuera = int(datos[args.destino].isna().sum())
+    if args.salida.endswith(".parquet"):
+        datos.to_parquet(args.salida, index=False)
+    else:
+        datos.to_csv(args.salida, index=False)
+    print(f"{len(datos):,} puntos asignados en {segundos:.2f} s ({fuera:,} fuera de Antioquia)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Almacén de geometrías municipales compartido por todo el proceso.
+
+Streamlit vuelve a ejecutar el script completo en cada interacción, pero los
+módulos importados sobreviven entre ejecuciones y entre sesiones. Este módulo
+aprovecha eso para leer, reproyectar y normalizar el shapefile de Antioquia una
+sola vez por proceso, recargándolo únicamente si cambian los archivos en disco.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from demografia_antioquia.municipios import normalizar
+from demografia_antioquia.trazas import tramo
+
+RAIZ = Path(__file__).resolve().parent.parent
+RUTA_SHP = RAIZ / "antioquia_simplificado.shp"
+
+
+# -----------------------------------------------------------
+# Almacén de geometrías
+# -----------------------------------------------------------
+class AlmacenGeometrias:
+    """Carga perezosa y compartida de una capa vectorial.
+
+    La capa se lee con ``encoding``, se reproyecta a ``epsg`` y se le agregan
+    la columna ``mpio_norm`` y las coordenadas ``etiqueta_lon``/``etiqueta_lat``
+    de un punto representativo (siempre dentro del polígono). Las llamadas a
+    :meth:`obtener` devuelven copias profundas (la capa tiene ~125 filas y
+    copiarla cuesta menos de un milisegundo): ni agregar columnas ni escribir
+    sobre los arreglos, incluida la geometría, alteran la capa compartida.
+    """
+
+    def __init__(self, ruta_shp, encoding="iso-8859-1", epsg=4326):
+        self.ruta_shp = Path(ruta_shp)
+        self.encoding = encoding
+        self.epsg = epsg
+        self._capa = None
+        self._firma = None
+        self._lock = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._cargas = 0
+        self._tiempo_carga = None
+
+    def _archivos(self):
+        return [self.ruta_shp, self.ruta_shp.with_suffix(".dbf")]
+
+    def _firma_actual(self):
+        # mtime en nanosegundos de .shp y .dbf; cualquier cambio fuerza recarga
+        return tuple(os.stat(ruta).st_mtime_ns for ruta in self._archivos())
+
+    def _cargar(self):
+        import geopandas as gpd
+
+        inicio = time.perf_counter()
+        with tramo("geometria.read_file", ruta=self.ruta_shp.name):
+            capa = gpd.read_file(self.ruta_shp, encoding=self.encoding)
+        with tramo("geometria.to_crs", epsg=self.epsg):
+            capa = capa.to_crs(epsg=self.epsg)
+        with tramo("geometria.etiquetas"):
+            capa["mpio_norm"] = capa["mpio_cnmbr"].map(normalizar)
+            # Puntos para etiquetas, calculados una vez para toda la capa
+            puntos = capa.representative_point()
+            capa["etiqueta_lon"] = puntos.x
+            capa["etiqueta_lat"] = puntos.y
+        self._tiempo_carga = time.perf_counter() - inicio
+        self._cargas += 1
+        return capa
+
+    def obtener(self):
+        """Devuelve una copia independiente de la capa, cargándola si hace falta."""
+        firma = self._firma_actual()
+        with self._lock:
+            if self._capa is None or firma != self._firma:
+                self._fallos += 1
+                self._capa = self._cargar()
+                self._firma = firma
+            else:
+                self._aciertos += 1
+            return self._capa.copy(deep=True)
+
+    def invalidar(self):
+        """Descarta la capa en memoria; la próxima llamada la vuelve a leer."""
+        with self._lock:
+            self._capa = None
+            self._firma = None
+
+    def estadisticas(self):
+        """Aciertos, fallos, número de cargas y duración de la última carga (s)."""
+        with self._lock:
+            return {
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "cargas": self._cargas,
+                "tiempo_carga": self._tiempo_carga,
+            }
+
+
+# Instancia única por proceso para el shapefile del repositorio
+almacen = AlmacenGeometrias(RUTA_SHP)
+
+
+def cargar_antioquia():
+    """Capa de municipios de Antioquia en EPSG:4326 con ``mpio_norm`` y puntos de etiqueta."""
+    return almacen.obtener()
@@ -0,0 +1,123 @@
+"""Intervalos de confianza por simulación Monte Carlo para tasas.
+
+Una tasa ``eventos / expuestos × por`` se recalcula sobre réplicas de los
+eventos: Poisson para defunciones o nacimientos sobre población media, y
+binomial cuando los expuestos son ensayos (defunciones infantiles sobre
+nacidos vivos). Las réplicas se generan como una matriz
+``réplicas × indicadores`` y los percentiles se toman sobre el primer eje,
+sin bucles en Python.
+
+Con muchas réplicas e indicadores (10^5 × 125 municipios) el trabajo se
+reparte por bloques de indicadores entre procesos; cada proceso calcula sus
+propios percentiles y devuelve solo los límites, de modo que nunca se
+transfiere la matriz de réplicas completa. Los resultados no dependen del
+número de procesos: cada bloque tiene su propia semilla derivada.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DISTRIBUCIONES = ("poisson", "binomial")
+# Por debajo de este número de réplicas × indicadores no vale la pena usar procesos
+UMBRAL_PROCESOS = 2_000_000
+# Indicadores por bloque de trabajo
+TAMANO_BLOQUE = 16
+
+
+# -----------------------------------------------------------
+# Réplicas y percentiles
+# -----------------------------------------------------------
+def replicar(eventos, expuestos, replicas, distribucion="poisson", rng=None):
+    """Matriz ``(replicas, indicadores)`` de eventos simulados."""
+    if distribucion not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución desconocida: {distribucion!r}")
+    rng = rng if rng is not None else np.random.default_rng()
+    eventos = np.asarray(eventos, dtype=float)
+    if distribucion == "poisson":
+        return rng.poisson(eventos, size=(replicas,) + eventos.shape)
+    ensayos = np.asarray(expuestos, dtype=np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(ensayos > 0, eventos / ensayos, 0.0)
+    return rng.binomial(ensayos, p, size=(replicas,) + eventos.shape)
+
+
+def _intervalos_bloque(eventos, expuestos, por, replicas, distribucion, nivel, semilla):
+    rng = np.random.default_rng(semilla)
+    simulados = replicar(eventos, expuestos, replicas, distribucion, rng)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tasas = simulados * (por / np.asarray(expuestos, dtype=float))
+    alfa = (1 - nivel) / 2
+    return np.quantile(tasas, [alfa, 1 - alfa], axis=0)
+
+
+# -----------------------------------------------------------
+# Procesos
+# -----------------------------------------------------------
+# Pool compartido por el proceso; se recrea si cambia el número de procesos.
+# Se usa "spawn" porque el servidor de Streamlit tiene hilos y hacer fork de
+# un proceso con hilos puede dejar locks tomados en los hijos.
+_pool = None
+_procesos_pool = None
+_lock = threading.Lock()
+
+
+def _obtener_pool(procesos):
+    global _pool, _procesos_pool
+    with _lock:
+        if _pool is None or _procesos_pool != procesos:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=procesos,
+                                        mp_context=multiprocessing.get_context("spawn"))
+            _procesos_pool = procesos
+        return _pool
+
+
+@atexit.register
+def cerrar_pool():
+    """Termina los procesos del pool, si existe."""
+    global _pool, _procesos_pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        _procesos_pool = None
+
+
+def intervalos_tasa(eventos, expuestos, por=1000, replicas=10_000, distribucion="poisson",
+                    nivel=0.95, semilla=None, procesos=None):
+    """Estimación puntual y límites inferior y superior de ``eventos / expuestos × por``.
+
+    ``eventos`` y ``expuestos`` son arreglos de la misma forma (un valor por
+    indicador, municipio o causa). ``procesos=None`` usa un proceso por núcleo
+    solo si el trabajo supera :data:`UMBRAL_PROCESOS`; ``procesos=n`` reparte
+    los bloques entre ``n`` procesos y ``procesos=1`` calcula todo en el
+    proceso actual. Devuelve tres arreglos con la forma de ``eventos``.
+    """
+    eventos = np.asarray(eventos, dtype=float)
+    expuestos = np.broadcast_to(np.asarray(expuestos, dtype=float), eventos.shape)
+    forma = eventos.shape
+    eventos, expuestos = eventos.reshape(-1), expuestos.reshape(-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimacion = eventos * (por / expuestos)
+
+    bloques = [slice(i, i + TAMANO_BLOQUE) for i in range(0, len(eventos), TAMANO_BLOQUE)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(bloques))
+    argumentos = [
+        (eventos[b], expuestos[b], por, replicas, distribucion, nivel, s)
+        for b, s in zip(bloques, semillas)
+    ]
+    if procesos is None:
+        procesos = os.cpu_count() if replicas * len(eventos) > UMBRAL_PROCESOS else 1
+    if procesos > 1 and len(bloques) > 1:
+        limites = list(_obtener_pool(procesos).map(_intervalos_bloque, *zip(*argumentos)))
+    else:
+        limites = [_intervalos_bloque(*a) for a in argumentos]
+    inferior, superior = np.concatenate(limites, axis=1) if limites else np.empty((2, 0))
+    return estimacion.reshape(forma), inferior.reshape(forma), superior.reshape(forma)
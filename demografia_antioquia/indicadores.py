@@ -0,0 +1,219 @@
+"""Motor de indicadores demográficos calculados a partir de conteos.
+
+Todas las funciones reciben matrices ``territorios × grupos de edad`` (un
+vector de una sola fila también sirve) y devuelven un arreglo por indicador,
+con un valor por territorio. Así los 125 municipios se calculan en una sola
+pasada de NumPy en lugar de uno a uno. Las divisiones por cero dan ``NaN``.
+
+Las funciones ``*_por_territorio`` aceptan las tablas largas de
+:mod:`demografia_antioquia.tablas` (sin filtrar por territorio) y devuelven un
+DataFrame con una fila por territorio.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Grupos quinquenales del censo y edad de inicio de cada uno
+GRUPOS_QUINQUENALES = [
+    "0 a 4", "5 a 9", "10 a 14", "15 a 19", "20 a 24", "25 a 29", "30 a 34",
+    "35 a 39", "40 a 44", "45 a 49", "50 a 54", "55 a 59", "60 a 64",
+    "65 a 69", "70 a 74", "75 a 79", "80 a 84", "85 y más",
+]
+EDADES_QUINQUENALES = np.arange(0, 90, 5)
+
+# Grupos de edad fértil (15-49) de las tablas de fecundidad
+GRUPOS_FERTILES = ["15-19", "20-24", "25-29", "30-34", "35-39", "40-44", "45-49"]
+MARCAS_FERTILES = np.arange(17.5, 50, 5)
+
+RAIZ_TABLA_VIDA = 100000
+
+
+# -----------------------------------------------------------
+# Utilidades
+# -----------------------------------------------------------
+def _matriz(valores):
+    return np.atleast_2d(np.asarray(valores, dtype=float))
+
+
+def _razon(numerador, denominador, escala=1.0):
+    numerador = np.asarray(numerador, dtype=float)
+    denominador = np.asarray(denominador, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominador != 0, escala * numerador / denominador, np.nan)
+
+
+def matriz_por_grupo(datos, columna, grupos, grupo="Edad", territorio="territorio"):
+    """Pivota una tabla larga a ``(territorios, matriz territorios × grupos)``.
+
+    Los grupos que falten en un territorio quedan en 0; las filas que no están
+    en ``grupos`` (totales, subtotales) se ignoran.
+    """
+    tabla = (
+        datos[datos[grupo].isin(grupos)]
+        .pivot_table(index=territorio, columns=grupo, values=columna, aggfunc="sum")
+        .reindex(columns=grupos)
+        .fillna(0)
+    )
+    return tabla.index, tabla.to_numpy(dtype=float)
+
+
+# -----------------------------------------------------------
+# Estructura por edad y sexo
+# -----------------------------------------------------------
+def estructura_por_edad(total, hombres=None, mujeres=None, edades=EDADES_QUINQUENALES,
+                        limite_joven=15, limite_mayor=65):
+    """Grandes grupos de edad, índices de dependencia, envejecimiento y masculinidad.
+
+    ``edades`` es la edad de inicio de cada columna de ``total``. La población
+    joven tiene menos de ``limite_joven`` años, la mayor ``limite_mayor`` o
+    más, y la activa está entre ambas. Los índices se expresan por 100
+    (dependencia sobre la población activa, envejecimiento sobre la joven,
+    masculinidad hombres sobre mujeres).
+    """
+    total = _matriz(total)
+    edades = np.asarray(edades)
+    joven = total[:, edades < limite_joven].sum(axis=1)
+    activa = total[:, (edades >= limite_joven) & (edades < limite_mayor)].sum(axis=1)
+    mayor = total[:, edades >= limite_mayor].sum(axis=1)
+    resultado = {
+        "poblacion": total.sum(axis=1),
+        "poblacion_joven": joven,
+        "poblacion_activa": activa,
+        "poblacion_mayor": mayor,
+        "dependencia_total": _razon(joven + mayor, activa, 100),
+        "dependencia_juvenil": _razon(joven, activa, 100),
+        "dependencia_senil": _razon(mayor, activa, 100),
+        "envejecimiento": _razon(mayor, joven, 100),
+    }
+    if hombres is not None and mujeres is not None:
+        resultado["masculinidad"] = _razon(_matriz(hombres).sum(axis=1),
+                                           _matriz(mujeres).sum(axis=1), 100)
+    return resultado
+
+
+def estructura_por_territorio(datos, grupos=GRUPOS_QUINQUENALES, edades=EDADES_QUINQUENALES,
+                              limite_joven=15, limite_mayor=65,
+                              grupo="Edad", territorio="territorio"):
+    """:func:`estructura_por_edad` para cada territorio de una tabla ``poblacion_edad``."""
+    indice, total = matriz_por_grupo(datos, "Total", grupos, grupo, territorio)
+    _, hombres = matriz_por_grupo(datos, "Hombres", grupos, grupo, territorio)
+    _, mujeres = matriz_por_grupo(datos, "Mujeres", grupos, grupo, territorio)
+    resultado = estructura_por_edad(total, hombres, mujeres, edades, limite_joven, limite_mayor)
+    return pd.DataFrame(resultado, index=indice)
+
+
+# -----------------------------------------------------------
+# Fecundidad
+# -----------------------------------------------------------
+def fecundidad(nacimientos, mujeres, nacimientos_ninas=None, nLx=None,
+               marcas=MARCAS_FERTILES, amplitud=5, raiz=RAIZ_TABLA_VIDA,
+               nacimientos_totales=None, poblacion_total=None):
+    """TEF, TGF, ISF, edad media materna y, si hay datos, TBR, TNR y TBN.
+
+    ``nacimientos``, ``mujeres``, ``nacimientos_ninas`` y ``nLx`` son matrices
+    ``territorios × grupos fértiles``. Las tasas específicas y la TGF van por
+    1000 mujeres; ISF, TBR y TNR en hijos (o hijas) por mujer. La TNR usa los
+    años vividos ``nLx`` de una tabla de vida femenina con raíz ``raiz``. La
+    TBN necesita los nacimientos y la población totales, con todas las edades.
+    """
+    nacimientos = _matriz(nacimientos)
+    mujeres = _matriz(mujeres)
+    tef = _razon(nacimientos, mujeres, 1000)
+    suma_tef = np.nansum(tef, axis=1)
+    resultado = {
+        "tef": tef,
+        "tgf": _razon(nacimientos.sum(axis=1), mujeres.sum(axis=1), 1000),
+        "isf": amplitud * suma_tef / 1000,
+        "edad_media_materna": _razon(np.nansum(tef * np.asarray(marcas, dtype=float), axis=1),
+                                     suma_tef),
+    }
+    if nacimientos_ninas is not None:
+        tef_ninas = _razon(_matriz(nacimientos_ninas), mujeres, 1000)
+        resultado["tef_ninas"] = tef_ninas
+        resultado["tbr"] = amplitud * np.nansum(tef_ninas, axis=1) / 1000
+        if nLx is not None:
+            resultado["tnr"] = np.nansum(tef_ninas * _matriz(nLx), axis=1) / (1000 * raiz)
+    if nacimientos_totales is not None and poblacion_total is not None:
+        resultado["tbn"] = _razon(nacimientos_totales, poblacion_total, 1000)
+    return resultado
+
+
+def fecundidad_por_territorio(nacimientos, mujeres, ninas=None, nacimientos_totales=None,
+                              poblacion_total=None, grupos=GRUPOS_FERTILES,
+                              grupo="Grupos de edad", territorio="territorio"):
+    """:func:`fecundidad` para cada territorio de las tablas de fecundidad.
+
+    ``nacimientos`` es ``nacimientos_edad_madre``, ``mujeres`` es
+    ``poblacion_mujeres`` (población media y ``nLx``) y ``ninas`` es
+    ``nacimientos_ninas``. ``nacimientos_totales`` y ``poblacion_total`` son
+    Series opcionales indexadas por territorio. Solo se devuelven los
+    indicadores resumen, no las tasas por grupo.
+    """
+    indice, b = matriz_por_grupo(nacimientos, "Total", grupos, grupo, territorio)
+    _, w = matriz_por_grupo(mujeres, "30.06.2023", grupos, grupo, territorio)
+    _, nlx = matriz_por_grupo(mujeres, "nLx", grupos, grupo, territorio)
+    bf = None
+    if ninas is not None:
+        _, bf = matriz_por_grupo(ninas, "Población/Nacimientos", grupos, grupo, territorio)
+    if nacimientos_totales is not None:
+        nacimientos_totales = nacimientos_totales.reindex(indice).to_numpy(dtype=float)
+    if poblacion_total is not None:
+        poblacion_total = poblacion_total.reindex(indice).to_numpy(dtype=float)
+    resultado = fecundidad(b, w, nacimientos_ninas=bf, nLx=nlx,
+                           nacimientos_totales=nacimientos_totales,
+                           poblacion_total=poblacion_total)
+    return pd.DataFrame({k: v for k, v in resultado.items() if np.ndim(v) == 1}, index=indice)
+
+
+# -----------------------------------------------------------
+# Migración e índice de masculinidad
+# -----------------------------------------------------------
+# Nombres de las columnas de la tabla ``masculinidad_migracion``
+COLUMNAS_MASCULINIDAD = {
+    "total": "Total_AM",
+    "factual": "Factual",
+    "contrafactual": "ContraFactual",
+    "no_migrantes": "No_migrantes",
+    "efecto_absoluto": "Efecto_absoluto_migracion_Neta",
+    "efecto_relativo": "Efecto_Relativo_migracion_Neta",
+    "diferencia_inmigracion": "Diferencia_Relativa_Inmigracion",
+    "diferencia_emigracion": "Diferencia_Relativa_Emigracion",
+}
+
+
+def masculinidad_migracion(no_migrantes_h, no_migrantes_m, inmigrantes_h, inmigrantes_m,
+                           emigrantes_h, emigrantes_m):
+    """Índices de masculinidad factual y contrafactual y su descomposición.
+
+    Los seis argumentos son conteos por sexo de no migrantes, inmigrantes y
+    emigrantes del periodo, con cualquier forma común (por ejemplo
+    ``territorios × grupos de edad``); el resultado tiene esa misma forma.
+
+    - ``factual``: población observada (no migrantes + inmigrantes).
+    - ``contrafactual``: población sin migración (no migrantes + emigrantes).
+    - ``no_migrantes``: solo quienes no migraron.
+
+    Los índices van por 100 mujeres. El efecto de la migración neta es
+    ``factual - contrafactual``, y el relativo es por 100 sobre el
+    contrafactual. Las diferencias relativas de inmigración
+    (``factual - no_migrantes``) y de emigración (``no_migrantes -
+    contrafactual``) van por 1000 sobre los no migrantes, de modo que suman
+    el efecto neto en esa misma escala.
+    """
+    nm_h, nm_m = np.asarray(no_migrantes_h, dtype=float), np.asarray(no_migrantes_m, dtype=float)
+    factual = _razon(nm_h + np.asarray(inmigrantes_h, dtype=float),
+                     nm_m + np.asarray(inmigrantes_m, dtype=float), 100)
+    contrafactual = _razon(nm_h + np.asarray(emigrantes_h, dtype=float),
+                           nm_m + np.asarray(emigrantes_m, dtype=float), 100)
+    no_migrantes = _razon(nm_h, nm_m, 100)
+    efecto = factual - contrafactual
+    return {
+        "total": factual,
+        "factual": factual,
+        "contrafactual": contrafactual,
+        "no_migrantes": no_migrantes,
+        "efecto_absoluto": efecto,
+        "efecto_relativo": _razon(efecto, contrafactual, 100),
+        "diferencia_inmigracion": _razon(factual - no_migrantes, no_migrantes, 1000),
+        "diferencia_emigracion": _razon(no_migrantes - contrafactual, no_migrantes, 1000),
+    }
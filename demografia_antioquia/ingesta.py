@@ -0,0 +1,284 @@
+"""Ingesta por bloques de microdatos del DANE.
+
+Los archivos nacionales de estadísticas vitales (EEVV: defunciones no
+fetales y nacimientos) y del censo (CNPV 2018, personas) pesan varios GB. En
+lugar de cargarlos en un solo DataFrame se leen por bloques de
+``tamano_bloque`` filas, solo con las columnas necesarias, se filtran a
+Antioquia (departamento ``05``) y cada bloque se reduce a conteos por
+año, mes, municipio, sexo, grupo de edad y causa. La memoria usada depende
+del tamaño del bloque y del número de combinaciones distintas, no del tamaño
+del archivo.
+
+Los cubos resultantes se guardan en ``datos/cubos/<fuente>.parquet`` y de
+ellos se derivan las tablas del dashboard (:func:`tablas_desde_cubos`).
+Para incorporar lotes mensuales sin reconstruir todo, ver
+:mod:`demografia_antioquia.agregados`.
+
+Uso::
+
+    python -m demografia_antioquia.ingesta defunciones nofetal2023.csv
+    python -m demografia_antioquia.ingesta censo CNPV2018_personas.csv --actualizar-tablas
+"""
+
+import argparse
+import sys
+
+import pandas as pd
+
+from demografia_antioquia.indicadores import GRUPOS_FERTILES, GRUPOS_QUINQUENALES
+from demografia_antioquia.tablas import DIRECTORIO_DATOS
+from demografia_antioquia.tablas_vida import GRUPOS_ABREVIADOS
+
+DEPARTAMENTO = "05"
+DIRECTORIO_CUBOS = DIRECTORIO_DATOS / "cubos"
+DIMENSIONES = ["anio", "mes", "territorio", "sexo", "edad", "causa"]
+
+SEXOS = {"1": "Hombres", "2": "Mujeres"}
+
+
+# -----------------------------------------------------------
+# Códigos de edad del DANE
+# -----------------------------------------------------------
+def _edades_defunciones():
+    # GRU_ED1: 00-06 menores de un año, 07 un año, 08 2-4, 09 5-9 ... 24 80-84,
+    # 25-28 85 y más, 29 edad desconocida
+    codigos = {f"{c:02d}": "0" for c in range(7)}
+    codigos["07"] = "1"
+    for codigo, grupo in zip(range(8, 25), GRUPOS_ABREVIADOS[2:-1]):
+        codigos[f"{codigo:02d}"] = grupo
+    for codigo in range(25, 29):
+        codigos[f"{codigo:02d}"] = GRUPOS_ABREVIADOS[-1]
+    return codigos
+
+
+def _edades_madre():
+    # EDAD_MADRE: 01 10-14, 02 15-19 ... 08 45-49, 09 50-54, 99 sin información
+    grupos = ["10-14", *GRUPOS_FERTILES, "50-54"]
+    return {f"{c:02d}": g for c, g in enumerate(grupos, start=1)}
+
+
+def _edades_censo():
+    # P_EDADR: 1 0-4, 2 5-9 ... 17 80-84, 18-21 85 y más
+    codigos = {str(c): g for c, g in enumerate(GRUPOS_QUINQUENALES[:-1], start=1)}
+    for codigo in range(18, 22):
+        codigos[str(codigo)] = GRUPOS_QUINQUENALES[-1]
+    return codigos
+
+
+# Columnas de cada fuente y cómo se traducen sus códigos. ``anio`` o ``mes``
+# pueden ser un valor fijo en lugar de una columna.
+FUENTES = {
+    "defunciones": {
+        "departamento": "COD_DPTO", "municipio": "COD_MUNIC",
+        "anio": "ANO", "mes": "MES", "sexo": "SEXO",
+        "edad": "GRU_ED1", "causa": "CAUSA_666",
+        "edades": _edades_defunciones(), "relleno_edad": 2,
+    },
+    "nacimientos": {
+        "departamento": "COD_DPTO", "municipio": "COD_MUNIC",
+        "anio": "ANO", "mes": "MES", "sexo": "SEXO",
+        "edad": "EDAD_MADRE", "causa": None,
+        "edades": _edades_madre(), "relleno_edad": 2,
+    },
+    "censo": {
+        "departamento": "U_DPTO", "municipio": "U_MPIO",
+        "anio": 2018, "mes": 0, "sexo": "P_SEXO",
+        "edad": "P_EDADR", "causa": None,
+        "edades": _edades_censo(), "relleno_edad": 1,
+    },
+}
+
+
+# -----------------------------------------------------------
+# Lectura por bloques
+# -----------------------------------------------------------
+def _columnas(fuente):
+    return [c for c in (fuente[k] for k in
+                        ("departamento", "municipio", "anio", "mes", "sexo", "edad", "causa"))
+            if isinstance(c, str)]
+
+
+def _detectar_separador(ruta, encoding):
+    with open(ruta, encoding=encoding) as archivo:
+        encabezado = archivo.readline()
+    return max([";", ",", "|", "\t"], key=encabezado.count)
+
+
+def leer_bloques(ruta, columnas, tamano_bloque=500_000, anchos=None, separador=None, encoding="latin-1"):
+    """Iterador de bloques de texto con solo ``columnas``.
+
+    Sin ``anchos`` el archivo es delimitado (el separador se detecta si no se
+    indica); con ``anchos = {columna: (inicio, fin)}`` es de ancho fijo.
+    """
+    if anchos is not None:
+        return pd.read_fwf(ruta, colspecs=[anchos[c] for c in columnas], names=columnas,
+                           dtype=str, chunksize=tamano_bloque, encoding=encoding)
+    return pd.read_csv(ruta, usecols=lambda c: c.strip().upper() in columnas,
+                       sep=separador or _detectar_separador(ruta, encoding),
+                       dtype=str, chunksize=tamano_bloque, encoding=encoding)
+
+
+def reducir_bloque(bloque, fuente, departamento=DEPARTAMENTO):
+    """Filtra un bloque al departamento y lo reduce a conteos por :data:`DIMENSIONES`."""
+    bloque = bloque.rename(columns=lambda c: c.strip().upper())
+    dpto = bloque[fuente["departamento"]].str.strip().str.zfill(2)
+    bloque = bloque[dpto == departamento]
+    if bloque.empty:
+        return pd.Series(dtype="int64")
+
+    def columna(clave, relleno=None):
+        valor = fuente[clave]
+        if not isinstance(valor, str):
+            return pd.Series(valor, index=bloque.index)
+        serie = bloque[valor].str.strip()
+        return serie.str.zfill(relleno) if relleno else serie
+
+    reducido = pd.DataFrame({
+        "anio": pd.to_numeric(columna("anio"), errors="coerce"),
+        "mes": pd.to_numeric(columna("mes"), errors="coerce"),
+        "territorio": departamento + columna("municipio", 3),
+        "sexo": columna("sexo").map(SEXOS).fillna("Indeterminado"),
+        "edad": columna("edad", fuente["relleno_edad"]).map(fuente["edades"]).fillna("Sin información"),
+        "causa": columna("causa", 3) if fuente["causa"] else "",
+    })
+    return reducido.groupby(DIMENSIONES, dropna=False).size()
+
+
+def agregar(ruta, nombre, tamano_bloque=500_000, anchos=None, separador=None,
+            departamento=DEPARTAMENTO, progreso=None):
+    """Cubo de conteos de la fuente ``nombre`` leyendo ``ruta`` por bloques.
+
+    Devuelve un DataFrame con :data:`DIMENSIONES` y la columna ``conteo``.
+    ``progreso`` es una función opcional que recibe las filas leídas hasta el
+    momento.
+    """
+    fuente = FUENTES[nombre]
+    acumulado = pd.Series(dtype="int64")
+    leidas = 0
+    for bloque in leer_bloques(ruta, _columnas(fuente), tamano_bloque, anchos, separador):
+        leidas += len(bloque)
+        conteos = reducir_bloque(bloque, fuente, departamento)
+        if len(conteos):
+            acumulado = conteos if acumulado.empty else acumulado.add(conteos, fill_value=0)
+        if progreso:
+            progreso(leidas)
+    cubo = acumulado.astype("int64").rename("conteo").reset_index()
+    if cubo.empty:
+        cubo = pd.DataFrame(columns=DIMENSIONES + ["conteo"])
+    return cubo.astype({"anio": "Int16", "mes": "Int8", "conteo": "int64"})
+
+
+def ruta_cubo(nombre):
+    return DIRECTORIO_CUBOS / f"{nombre}.parquet"
+
+
+def guardar_cubo(nombre, cubo):
+    DIRECTORIO_CUBOS.mkdir(parents=True, exist_ok=True)
+    cubo.to_parquet(ruta_cubo(nombre), index=False)
+
+
+def cargar_cubo(nombre):
+    return pd.read_parquet(ruta_cubo(nombre))
+
+
+# -----------------------------------------------------------
+# Tablas del dashboard a partir de los cubos
+# -----------------------------------------------------------
+def _con_departamento(cubo):
+    # Agrega el total departamental como un territorio más
+    departamento = cubo.assign(territorio=cubo["territorio"].str[:2])
+    return pd.concat([departamento, cubo], ignore_index=True)
+
+
+def poblacion_edad(censo):
+    """Tabla ``poblacion_edad`` (Total, Hombres, Mujeres por grupo y fila Total) por territorio."""
+    censo = _con_departamento(censo[censo["edad"].isin(GRUPOS_QUINQUENALES)])
+    tabla = censo.pivot_table(index=["anio", "territorio", "edad"], columns="sexo",
+                              values="conteo", aggfunc="sum", fill_value=0)
+    tabla = tabla.reindex(columns=["Hombres", "Mujeres"], fill_value=0).rename_axis(columns=None)
+    tabla["Total"] = tabla["Hombres"] + tabla["Mujeres"]
+    tabla = tabla.reset_index().rename(columns={"edad": "Edad"})
+    totales = tabla.groupby(["anio", "territorio"], as_index=False)[["Hombres", "Mujeres", "Total"]].sum()
+    tabla = pd.concat([totales.assign(Edad="Total"), tabla], ignore_index=True)
+    tabla["orden"] = tabla["Edad"].map({g: i for i, g in enumerate(["Total", *GRUPOS_QUINQUENALES])})
+    return tabla.sort_values(["anio", "territorio", "orden"]).drop(columns="orden").reset_index(drop=True)
+
+
+def nacimientos_edad_madre(nacimientos):
+    """Tabla ``nacimientos_edad_madre`` (15-19 a 45-49 y fila 15-49) por territorio."""
+    nacimientos = _con_departamento(nacimientos[nacimientos["edad"].isin(GRUPOS_FERTILES)])
+    tabla = (nacimientos.groupby(["anio", "territorio", "edad"], as_index=False)["conteo"].sum()
+             .rename(columns={"edad": "Grupos de edad", "conteo": "Total"}))
+    totales = tabla.groupby(["anio", "territorio"], as_index=False)["Total"].sum()
+    tabla = pd.concat([tabla, totales.assign(**{"Grupos de edad": "15-49"})], ignore_index=True)
+    tabla["orden"] = tabla["Grupos de edad"].map({g: i for i, g in enumerate([*GRUPOS_FERTILES, "15-49"])})
+    return tabla.sort_values(["anio", "territorio", "orden"]).drop(columns="orden").reset_index(drop=True)
+
+
+# Tablas del dashboard que deriva cada fuente (ver :func:`tablas_desde_cubos`)
+TABLAS_DERIVADAS = {
+    "censo": ("poblacion_edad",),
+    "nacimientos": ("nacimientos_edad_madre",),
+    "defunciones": (),
+}
+
+
+def tablas_desde_cubos(censo=None, nacimientos=None, defunciones=None):
+    """Tablas del dashboard que se pueden derivar de los cubos disponibles.
+
+    El cubo de defunciones no genera tablas: lo consulta directamente
+    :func:`demografia_antioquia.causas.cubo_causas`.
+    """
+    tablas = {}
+    if censo is not None:
+        tablas["poblacion_edad"] = poblacion_edad(censo)
+    if nacimientos is not None:
+        tablas["nacimientos_edad_madre"] = nacimientos_edad_madre(nacimientos)
+    return tablas
+
+
+# -----------------------------------------------------------
+# Línea de comandos
+# -----------------------------------------------------------
+def _anchos(texto):
+    # "COD_DPTO=0:2,COD_MUNIC=2:5,..." -> {"COD_DPTO": (0, 2), ...}
+    anchos = {}
+    for parte in texto.split(","):
+        columna, rango = parte.split("=")
+        inicio, fin = rango.split(":")
+        anchos[columna.strip().upper()] = (int(inicio), int(fin))
+    return anchos
+
+
+def main(argv=None):
+    from demografia_antioquia.tablas import reemplazar_filas
+
+    parser = argparse.ArgumentParser(description="Agrega microdatos del DANE por bloques.")
+    parser.add_argument("fuente", choices=sorted(FUENTES))
+    parser.add_argument("ruta")
+    parser.add_argument("--bloque", type=int, default=500_000, help="filas por bloque")
+    parser.add_argument("--separador", help="separador del CSV (por defecto se detecta)")
+    parser.add_argument("--anchos", type=_anchos,
+                        help="archivo de ancho fijo: COLUMNA=inicio:fin,COLUMNA=inicio:fin,...")
+    parser.add_argument("--actualizar-tablas", action="store_true",
+                        help="reescribe en datos/ las filas de las tablas derivadas")
+    args = parser.parse_args(argv)
+
+    def progreso(filas):
+        print(f"\r{filas:,} filas leídas", end="", file=sys.stderr)
+
+    cubo = agregar(args.ruta, args.fuente, args.bloque, args.anchos, args.separador,
+                   progreso=progreso)
+    print(file=sys.stderr)
+    guardar_cubo(args.fuente, cubo)
+    print(f"{ruta_cubo(args.fuente)}: {len(cubo):,} combinaciones, {cubo['conteo'].sum():,} registros")
+
+    if args.actualizar_tablas:
+        derivadas = tablas_desde_cubos(**{args.fuente: cubo})
+        for nombre, tabla in derivadas.items():
+            reemplazar_filas(nombre, tabla)
+            print(f"Tabla {nombre} actualizada ({tabla['territorio'].nunique()} territorios)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""Mapas coropléticos que comparten una sola capa de geometría.
+
+En vez de un mapa (y una copia de la geometría) por indicador, se dibuja una
+única capa TopoJSON y se envían al navegador solo los colores de cada
+indicador. Un selector sobre el mapa cambia el indicador en el cliente, sin
+volver a ejecutar el script.
+"""
+
+import html
+
+import numpy as np
+import pandas as pd
+from branca.element import Template
+from branca.utilities import color_brewer
+from folium.elements import JSCSSMixin
+from folium.map import Layer
+
+from demografia_antioquia.topologia import OBJETO
+from demografia_antioquia.trazas import trazar
+
+CENTRO_VALLE_ABURRA = [6.25, -75.56]
+
+
+# -----------------------------------------------------------
+# Escalas de color
+# -----------------------------------------------------------
+def clasificar(valores, paleta="RdYlGn", bins=6):
+    """Bordes de clase (histograma de igual ancho) y colores de una paleta ColorBrewer.
+
+    Reproduce la clasificación por defecto de ``folium.Choropleth``.
+    """
+    reales = np.asarray(valores, dtype=float)
+    reales = reales[~np.isnan(reales)]
+    if len(reales) == 0:
+        return [], []
+    _, bordes = np.histogram(reales, bins=bins)
+    return bordes.tolist(), color_brewer(paleta, n=len(bordes) - 1)
+
+
+def color_clase(valor, bordes, colores):
+    """Color de la clase de :func:`clasificar` en que cae ``valor`` (``None`` si no hay dato)."""
+    if pd.isna(valor) or not bordes:
+        return None
+    idx = int(np.searchsorted(bordes, valor, side="right")) - 1
+    return colores[min(max(idx, 0), len(colores) - 1)]
+
+
+def leyenda(titulo, bordes, colores):
+    """HTML de la leyenda: título y una fila por clase con su color y su rango."""
+    filas = "".join(
+        f'<div><i style="background:{c};width:14px;height:10px;display:inline-block;'
+        f'margin-right:4px"></i>{a:,.2f} – {b:,.2f}</div>'
+        for c, a, b in zip(colores, bordes[:-1], bordes[1:])
+    )
+    return f"<b>{html.escape(titulo)}</b>{filas}"
+
+
+# -----------------------------------------------------------
+# Capa con varios indicadores
+# -----------------------------------------------------------
+class CapaIndicadores(JSCSSMixin, Layer):
+    """Capa TopoJSON única con selector de indicador en el navegador.
+
+    Si ``topo`` trae la clave ``niveles`` (ver
+    :func:`demografia_antioquia.topologia.cargar_topojson`), la geometría se
+    arma en el navegador con el nivel de detalle del zoom actual y se vuelve a
+    armar, una vez por nivel, al acercar o alejar el mapa.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }}_topo = {{ this.topo|tojson }};
+            var {{ this.get_name() }}_colores = {{ this.colores|tojson }};
+            var {{ this.get_name() }}_valores = {{ this.valores|tojson }};
+            var {{ this.get_name() }}_leyendas = {{ this.leyendas|tojson }};
+            var {{ this.get_name() }}_titulos = {{ this.titulos|tojson }};
+            var {{ this.get_name() }}_orden = {{ this.orden|tojson }};
+            var {{ this.get_name() }}_actual = {{ this.inicial|tojson }};
+
+            function {{ this.get_name() }}_estilo(feature) {
+                var clave = feature.properties[{{ this.clave|tojson }}];
+                var color = {{ this.get_name() }}_colores[{{ this.get_name() }}_actual][clave];
+                if (color === undefined) {
+                    return {fillColor: "lightgray", fillOpacity: 0.2, color: "white", weight: 0.5};
+                }
+                return {fillColor: color, fillOpacity: {{ this.fill_opacity }},
+                        color: "black", opacity: {{ this.line_opacity }}, weight: 1};
+            }
+
+            // Nivel de detalle: cada vértice trae el primer nivel que lo conserva
+            var {{ this.get_name() }}_niveles = {{ this.niveles|tojson }};
+            var {{ this.get_name() }}_absolutos = null;
+            var {{ this.get_name() }}_geometrias = {};
+
+            function {{ this.get_name() }}_nivel(zoom) {
+                var niveles = {{ this.get_name() }}_niveles;
+                if (niveles === null) { return 0; }
+                var nivel = 0;
+                niveles.zooms.forEach(function (z, i) { if (zoom >= z) { nivel = i; } });
+                return nivel;
+            }
+
+            function {{ this.get_name() }}_geometria(nivel) {
+                var cache = {{ this.get_name() }}_geometrias;
+                if (cache[nivel] !== undefined) { return cache[nivel]; }
+                var topo = {{ this.get_name() }}_topo;
+                var niveles = {{ this.get_name() }}_niveles;
+                if (niveles !== null) {
+                    if ({{ this.get_name() }}_absolutos === null) {
+                        {{ this.get_name() }}_absolutos = topo.arcs.map(function (arco) {
+                            var x = 0, y = 0;
+                            return arco.map(function (d) { x += d[0]; y += d[1]; return [x, y]; });
+                        });
+                    }
+                    var arcos = {{ this.get_name() }}_absolutos.map(function (arco, i) {
+                        var codigos = niveles.vertices[i], salida = [], px = 0, py = 0;
+                        arco.forEach(function (p, j) {
+                            if (codigos.charCodeAt(j) - 48 <= nivel) {
+                                salida.push([p[0] - px, p[1] - py]);
+                                px = p[0]; py = p[1];
+                            }
+                        });
+                        return salida;
+                    });
+                    topo = Object.assign({}, topo, {arcs: arcos});
+                }
+                cache[nivel] = topojson.feature(topo, topo.objects[{{ this.objeto|tojson }}]);
+                return cache[nivel];
+            }
+
+            var {{ this.get_name() }}_nivel_actual = {{ this.get_name() }}_nivel(
+                {{ this._parent.get_name() }}.getZoom());
+            var {{ this.get_name() }} = L.geoJson(
+                {{ this.get_name() }}_geometria({{ this.get_name() }}_nivel_actual),
+                {style: {{ this.get_name() }}_estilo}
+            ).addTo({{ this._parent.get_name() }});
+
+            {{ this._parent.get_name() }}.on("zoomend", function () {
+                var nivel = {{ this.get_name() }}_nivel({{ this._parent.get_name() }}.getZoom());
+                if (nivel === {{ this.get_name() }}_nivel_actual) { return; }
+                {{ this.get_name() }}_nivel_actual = nivel;
+                {{ this.get_name() }}.clearLayers();
+                {{ this.get_name() }}.addData({{ this.get_name() }}_geometria(nivel));
+            });
+
+            {{ this.get_name() }}.bindTooltip(function (capa) {
+                var p = capa.feature.properties;
+                var clave = p[{{ this.clave|tojson }}];
+                var valor = {{ this.get_name() }}_valores[{{ this.get_name() }}_actual][clave];
+                var texto = "<b>" + p[{{ this.etiqueta|tojson }}] + "</b>";
+                if (valor !== undefined && valor !== null) {
+                    texto += "<br>" + {{ this.get_name() }}_titulos[{{ this.get_name() }}_actual]
+                        + ": " + valor.toFixed(2);
+                }
+                return texto;
+            }, {sticky: true});
+
+            var {{ this.get_name() }}_control = L.control({position: "topright"});
+            {{ this.get_name() }}_control.onAdd = function () {
+                var div = L.DomUtil.create("div", "leaflet-bar");
+                div.style.background = "white";
+                div.style.padding = "6px 8px";
+                div.style.font = "12px sans-serif";
+                var opciones = {{ this.get_name() }}_orden.map(function (k) {
+                    var sel = k === {{ this.get_name() }}_actual ? " selected" : "";
+                    return '<option value="' + k + '"' + sel + ">"
+                        + {{ this.get_name() }}_titulos[k] + "</option>";
+                }).join("");
+                div.innerHTML = "<select>" + opciones + "</select>"
+                    + '<div class="leyenda" style="margin-top:6px"></div>';
+                var leyenda = div.querySelector(".leyenda");
+                leyenda.innerHTML = {{ this.get_name() }}_leyendas[{{ this.get_name() }}_actual];
+                div.querySelector("select").addEventListener("change", function (e) {
+                    {{ this.get_name() }}_actual = e.target.value;
+                    {{ this.get_name() }}.setStyle({{ this.get_name() }}_estilo);
+                    leyenda.innerHTML = {{ this.get_name() }}_leyendas[{{ this.get_name() }}_actual];
+                });
+                L.DomEvent.disableClickPropagation(div);
+                return div;
+            };
+            {{ this.get_name() }}_control.addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+        """
+    )
+
+    default_js = [
+        ("topojson", "https://cdnjs.cloudflare.com/ajax/libs/topojson/1.6.9/topojson.min.js"),
+    ]
+
+    def __init__(self, topo, datos, clave, indicadores, clave_datos=None,
+                 etiqueta="mpio_cnmbr", objeto=OBJETO, fill_opacity=0.8,
+                 line_opacity=0.5, name=None):
+        super().__init__(name=name, overlay=True, control=True, show=True)
+        self._name = "CapaIndicadores"
+        clave_datos = clave_datos or clave
+        self.niveles = topo.get("niveles")
+        self.topo = {k: v for k, v in topo.items() if k != "niveles"}
+        self.objeto = objeto
+        self.clave = clave
+        self.etiqueta = etiqueta
+        self.fill_opacity = fill_opacity
+        self.line_opacity = line_opacity
+        self.colores, self.valores, self.leyendas, self.titulos = {}, {}, {}, {}
+
+        claves = datos[clave_datos].astype(str).tolist()
+        for columna, titulo, paleta in indicadores:
+            serie = pd.to_numeric(datos[columna], errors="coerce")
+            bordes, colores = clasificar(serie, paleta)
+            self.titulos[columna] = titulo
+            self.leyendas[columna] = leyenda(titulo, bordes, colores) if bordes else ""
+            self.colores[columna] = {}
+            self.valores[columna] = {}
+            for k, v in zip(claves, serie.tolist()):
+                color = color_clase(v, bordes, colores)
+                if color is not None:
+                    self.colores[columna][k] = color
+                    self.valores[columna][k] = round(float(v), 6)
+        self.orden = [columna for columna, _, _ in indicadores]
+        self.inicial = self.orden[0]
+
+
+# -----------------------------------------------------------
+# Teselas vectoriales
+# -----------------------------------------------------------
+def capa_teselas(url, datos, columna, titulo, paleta="RdYlGn", capa="municipios",
+                 zoom_max_nativo=12, name=None):
+    """Capa ``VectorGridProtobuf`` coloreada por ``columna`` desde las propiedades de cada tesela.
+
+    Las teselas (ver :mod:`demografia_antioquia.teselas`) ya traen los
+    valores del indicador; al navegador solo se envían los bordes de clase y
+    los colores, calculados con :func:`clasificar` sobre ``datos[columna]``.
+    """
+    import json
+
+    from folium.plugins import VectorGridProtobuf
+
+    bordes, colores = clasificar(pd.to_numeric(datos[columna], errors="coerce"), paleta)
+    estilo = f"""function (p) {{
+            var v = p[{json.dumps(columna)}], bordes = {json.dumps(bordes)}, colores = {json.dumps(colores)};
+            if (v === undefined || v === null || !bordes.length) {{
+                return {{fill: true, fillColor: "lightgray", fillOpacity: 0.2, color: "white", weight: 0.5}};
+            }}
+            var i = 0;
+            while (i < colores.length - 1 && v >= bordes[i + 1]) {{ i++; }}
+            return {{fill: true, fillColor: colores[i], fillOpacity: 0.8, color: "black", opacity: 0.5, weight: 1}};
+        }}"""
+    opciones = (f'{{"vectorTileLayerStyles": {{{json.dumps(capa)}: {estilo}}}, '
+                f'"maxNativeZoom": {int(zoom_max_nativo)}, "interactive": false}}')
+    return VectorGridProtobuf(url, name=name or titulo, options=opciones)
+
+
+# -----------------------------------------------------------
+# Etiquetas
+# -----------------------------------------------------------
+def capa_etiquetas(datos, campos, alias=None, lon="etiqueta_lon", lat="etiqueta_lat",
+                   color="blue", icono="info-sign", name=None):
+    """Una sola capa GeoJSON de puntos con popups, en lugar de un Marker por fila.
+
+    ``datos`` debe traer las coordenadas en ``lon``/``lat`` (por ejemplo las
+    que el almacén de geometrías guarda con la capa) y las columnas ``campos``
+    ya formateadas para el popup.
+    """
+    import folium
+
+    datos = datos.dropna(subset=[lon, lat])
+    propiedades = datos[campos].astype(object).where(datos[campos].notna(), None)
+    coordenadas = np.column_stack([datos[lon].to_numpy(float), datos[lat].to_numpy(float)])
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": c}, "properties": p}
+            for c, p in zip(coordenadas.tolist(), propiedades.to_dict(orient="records"))
+        ],
+    }
+    return folium.GeoJson(
+        geojson,
+        name=name,
+        marker=folium.Marker(icon=folium.Icon(color=color, icon=icono)),
+        popup=folium.GeoJsonPopup(fields=campos, aliases=alias or campos),
+    )
+
+
+@trazar("folium.mapa")
+def mapa_coropletico(topo, datos, clave, indicadores, clave_datos=None,
+                     location=CENTRO_VALLE_ABURRA, zoom_start=10,
+                     tiles="CartoDB positron", **kwargs):
+    """Mapa folium con una sola geometría y varios indicadores conmutables.
+
+    ``indicadores`` es una lista de tuplas ``(columna, título, paleta)``; la
+    primera es la que se muestra al abrir el mapa. ``clave`` es la propiedad
+    del TopoJSON que se cruza con ``datos[clave_datos]``.
+    """
+    import folium
+
+    mapa = folium.Map(location=location, zoom_start=zoom_start, tiles=tiles)
+    CapaIndicadores(topo, datos, clave, indicadores, clave_datos=clave_datos,
+                    **kwargs).add_to(mapa)
+    return mapa
@@ -0,0 +1,228 @@
+"""Coropletas renderizadas en el servidor como imágenes SVG o PNG.
+
+El mapa interactivo envía al navegador Leaflet, la geometría de los 125
+municipios y los colores de cada indicador, y cada interacción pasa por el
+componente de folium. En una conexión móvil lenta eso pesa mucho más que una
+imagen. Este módulo dibuja la misma coropleta en el servidor, con la misma
+clasificación y paleta que :mod:`demografia_antioquia.mapas`. Solo incluye los
+municipios que caen en el encuadre de los datos, con las coordenadas
+redondeadas a la rejilla de píxeles.
+
+Las imágenes se memoizan por contenido de los datos, indicador, paleta y
+formato (ver :mod:`demografia_antioquia.memo`) y por la firma del shapefile,
+de modo que se dibujan una vez por proceso y se sirven igual a todas las
+sesiones.
+"""
+
+import html
+import io
+
+import numpy as np
+
+from demografia_antioquia.memo import memoizar
+
+FORMATOS = ("svg", "png")
+ANCHO = 800
+ALTO_LEYENDA = 28
+MARGEN = 0.08
+# Factor de sobremuestreo para suavizar los bordes del PNG
+SOBREMUESTREO = 2
+SIN_DATOS = "#d3d3d3"
+
+
+# -----------------------------------------------------------
+# Geometría en píxeles
+# -----------------------------------------------------------
+def _poligonos(geometria):
+    if geometria.geom_type == "Polygon":
+        return [geometria]
+    return list(geometria.geoms)
+
+
+def _encuadre(capa, con_datos):
+    # Caja de los municipios con datos (o de toda la capa), con margen
+    seleccion = capa[con_datos] if con_datos.any() else capa
+    x0, y0, x1, y1 = seleccion.total_bounds
+    dx, dy = (x1 - x0) * MARGEN, (y1 - y0) * MARGEN
+    return x0 - dx, y0 - dy, x1 + dx, y1 + dy
+
+
+class _Lienzo:
+    """Transformación lon/lat → píxeles con corrección de aspecto por latitud."""
+
+    def __init__(self, encuadre, ancho):
+        x0, y0, x1, y1 = encuadre
+        self.encuadre = encuadre
+        self.x0, self.y1 = x0, y1
+        self.kx = np.cos(np.radians((y0 + y1) / 2))
+        self.escala = ancho / ((x1 - x0) * self.kx)
+        self.ancho = ancho
+        self.alto = int(round((y1 - y0) * self.escala))
+
+    def visible(self, geometria):
+        x0, y0, x1, y1 = geometria.bounds
+        e = self.encuadre
+        return x0 <= e[2] and x1 >= e[0] and y0 <= e[3] and y1 >= e[1]
+
+    def pixeles(self, coords, decimales=1):
+        coords = np.asarray(coords)[:, :2]
+        x = (coords[:, 0] - self.x0) * self.kx * self.escala
+        y = (self.y1 - coords[:, 1]) * self.escala
+        p = np.column_stack([x, y])
+        if decimales is not None:
+            p = np.round(p, decimales)
+        # Vértices que caen en el mismo punto de la rejilla se dibujan una vez
+        conservar = np.ones(len(p), dtype=bool)
+        conservar[1:] = np.any(p[1:] != p[:-1], axis=1)
+        return p[conservar]
+
+
+def _capa_y_colores(datos, columna, paleta, clave_datos):
+    from demografia_antioquia.geometria import cargar_antioquia
+    from demografia_antioquia.mapas import clasificar, color_clase
+
+    capa = cargar_antioquia()
+    valores = dict(zip(datos[clave_datos].astype(str), datos[columna].astype(float)))
+    serie = capa["mpio_cdpmp"].astype(str).map(valores)
+    bordes, colores = clasificar(serie, paleta)
+    relleno = [color_clase(v, bordes, colores) for v in serie]
+    return capa, serie, relleno, bordes, colores
+
+
+# -----------------------------------------------------------
+# SVG
+# -----------------------------------------------------------
+def _svg(capa, serie, relleno, bordes, colores, titulo, ancho):
+    lienzo = _Lienzo(_encuadre(capa, serie.notna().to_numpy()), ancho)
+    alto_total = lienzo.alto + ALTO_LEYENDA * (len(colores) + 1)
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {ancho} {alto_total}" '
+        f'width="{ancho}" height="{alto_total}" font-family="sans-serif" font-size="12">',
+        f'<clipPath id="c"><rect width="{ancho}" height="{lienzo.alto}"/></clipPath><g clip-path="url(#c)">',
+    ]
+    etiquetas = []
+    for geometria, color, nombre, lon, lat in zip(capa.geometry, relleno, capa["mpio_cnmbr"],
+                                                 capa["etiqueta_lon"], capa["etiqueta_lat"]):
+        if not lienzo.visible(geometria):
+            continue
+        d = []
+        for poligono in _poligonos(geometria):
+            for anillo in [poligono.exterior, *poligono.interiors]:
+                p = lienzo.pixeles(anillo.coords)
+                d.append("M" + "L".join(f"{x:g},{y:g}" for x, y in p) + "Z")
+        estilo = (f'fill="{color}" fill-opacity="0.8" stroke="black" stroke-opacity="0.5"'
+                  if color else f'fill="{SIN_DATOS}" fill-opacity="0.2" stroke="white"')
+        partes.append(f'<path d="{"".join(d)}" {estilo} stroke-width="1"><title>{html.escape(nombre)}</title></path>')
+        if color:
+            x, y = lienzo.pixeles([[lon, lat]])[0]
+            etiquetas.append(f'<text x="{x:g}" y="{y:g}" text-anchor="middle" '
+                             f'paint-order="stroke" stroke="white" stroke-width="3">{html.escape(nombre)}</text>')
+    partes.extend(etiquetas)
+    partes.append("</g>")
+    y = lienzo.alto + ALTO_LEYENDA - 8
+    partes.append(f'<text x="8" y="{y}" font-weight="bold">{html.escape(titulo)}</text>')
+    for color, a, b in zip(colores, bordes[:-1], bordes[1:]):
+        y += ALTO_LEYENDA
+        partes.append(f'<rect x="8" y="{y - 11}" width="18" height="12" fill="{color}"/>'
+                      f'<text x="32" y="{y}">{a:,.2f} – {b:,.2f}</text>')
+    partes.append("</svg>")
+    return "".join(partes).encode("utf-8")
+
+
+# -----------------------------------------------------------
+# PNG
+# -----------------------------------------------------------
+def _fuente(tamano):
+    # DejaVu si está instalada; la fuente por defecto de Pillow no trae tildes
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", tamano), str
+    except OSError:
+        from demografia_antioquia.municipios import _TABLA_TILDES
+
+        return ImageFont.load_default(size=tamano), lambda t: t.replace("–", "-").translate(_TABLA_TILDES)
+
+
+def _rellenar(imagen, anillos, rgba):
+    # Pinta el exterior con una máscara del tamaño de su caja en la que los
+    # huecos quedan transparentes: lo que haya dentro de un hueco (otro
+    # municipio) se conserva, sin importar el orden de dibujo
+    from PIL import Image, ImageDraw
+
+    x0, y0 = np.floor(anillos[0].min(axis=0)).astype(int)
+    x1, y1 = np.ceil(anillos[0].max(axis=0)).astype(int) + 1
+    mascara = Image.new("L", (int(x1 - x0), int(y1 - y0)), 0)
+    dibujo = ImageDraw.Draw(mascara)
+    for i, anillo in enumerate(anillos):
+        dibujo.polygon([tuple(p) for p in anillo - (x0, y0)], fill=rgba[3] if i == 0 else 0)
+    imagen.paste(rgba[:3], (int(x0), int(y0), int(x1), int(y1)), mascara)
+
+
+def _png(capa, serie, relleno, bordes, colores, titulo, ancho):
+    from PIL import Image, ImageColor, ImageDraw
+
+    k = SOBREMUESTREO
+    lienzo = _Lienzo(_encuadre(capa, serie.notna().to_numpy()), ancho * k)
+    alto_total = lienzo.alto + k * ALTO_LEYENDA * (len(colores) + 1)
+    imagen = Image.new("RGB", (ancho * k, alto_total), "white")
+    dibujo = ImageDraw.Draw(imagen, "RGBA")
+    fuente, texto = _fuente(12 * k)
+    gris = ImageColor.getrgb(SIN_DATOS) + (51,)
+    for geometria, color in zip(capa.geometry, relleno):
+        if not lienzo.visible(geometria):
+            continue
+        rgba = ImageColor.getrgb(color) + (204,) if color else gris
+        contorno = (0, 0, 0, 128) if color else "white"
+        for poligono in _poligonos(geometria):
+            anillos = [lienzo.pixeles(poligono.exterior.coords, None)]
+            anillos += [lienzo.pixeles(hueco.coords, None) for hueco in poligono.interiors]
+            if len(anillos) == 1:
+                dibujo.polygon([tuple(p) for p in anillos[0]], fill=rgba, outline=contorno, width=k)
+                continue
+            _rellenar(imagen, anillos, rgba)
+            for anillo in anillos:
+                dibujo.polygon([tuple(p) for p in anillo], outline=contorno, width=k)
+    for color, nombre, lon, lat in zip(relleno, capa["mpio_cnmbr"], capa["etiqueta_lon"], capa["etiqueta_lat"]):
+        if color:
+            x, y = lienzo.pixeles([[lon, lat]], None)[0]
+            dibujo.text((x, y), texto(nombre), fill="black", font=fuente, anchor="mm",
+                        stroke_width=k, stroke_fill="white")
+    dibujo.rectangle([0, lienzo.alto, ancho * k, alto_total], fill="white")
+    y = lienzo.alto + k * (ALTO_LEYENDA - 8)
+    dibujo.text((8 * k, y), texto(titulo), fill="black", font=fuente, anchor="ls")
+    for color, a, b in zip(colores, bordes[:-1], bordes[1:]):
+        y += k * ALTO_LEYENDA
+        dibujo.rectangle([8 * k, y - 11 * k, 26 * k, y + k], fill=color)
+        dibujo.text((32 * k, y), texto(f"{a:,.2f} – {b:,.2f}"), fill="black", font=fuente, anchor="ls")
+    imagen = imagen.resize((ancho, alto_total // k), Image.LANCZOS)
+    salida = io.BytesIO()
+    imagen.save(salida, format="PNG", optimize=True)
+    return salida.getvalue()
+
+
+# -----------------------------------------------------------
+# API
+# -----------------------------------------------------------
+@memoizar("mapas_estaticos.coropleta")
+def _coropleta(datos, columna, titulo, paleta, formato, ancho, clave_datos, firma_capa):
+    capa, serie, relleno, bordes, colores = _capa_y_colores(datos, columna, paleta, clave_datos)
+    dibujar = _svg if formato == "svg" else _png
+    return dibujar(capa, serie, relleno, bordes, colores, titulo, ancho)
+
+
+def coropleta_estatica(datos, columna, titulo, paleta="RdYlGn", formato="svg", ancho=ANCHO,
+                       clave_datos="mpio_cdpmp"):
+    """Bytes de una coropleta de ``datos[columna]`` en ``formato`` (``"svg"`` o ``"png"``).
+
+    ``datos[clave_datos]`` se cruza con ``mpio_cdpmp`` de la capa. El
+    encuadre es el de los municipios con datos; los demás municipios visibles
+    se dibujan en gris, como en el mapa interactivo.
+    """
+    from demografia_antioquia.geometria import almacen
+
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato!r}")
+    datos = datos[[clave_datos, columna]].dropna()
+    return _coropleta(datos, columna, titulo, paleta, formato, int(ancho), clave_datos,
+                      almacen._firma_actual())
@@ -0,0 +1,379 @@
+"""Memoización de tablas derivadas y especificaciones de gráficos.
+
+Cada cambio en la barra lateral vuelve a ejecutar la sección completa. Las
+funciones decoradas con :func:`memoizar` guardan su resultado en una caché LRU
+de tamaño acotado, compartida por todas las sesiones del proceso, con una
+clave formada por el nombre de la función y un hash del contenido de sus
+argumentos (no de su identidad). Así una función definida de nuevo en cada
+ejecución del script sigue encontrando sus resultados.
+
+Los valores guardados se comparten entre sesiones: quien los recibe no debe
+modificarlos en sitio.
+
+Con varias réplicas del dashboard, cada proceso tendría que calcular todo de
+nuevo. La variable de entorno ``DEMOGRAFIA_CACHE`` elige dónde viven los
+resultados (ver :func:`crear_cache`):
+
+- sin definir o ``memoria``: LRU dentro del proceso;
+- ``sqlite:///ruta/cache.sqlite``: archivo SQLite compartido por los procesos
+  de la máquina;
+- ``redis://host:6379/0``: servidor Redis (o compatible) compartido por todas
+  las réplicas.
+
+Con un almacén compartido, cada proceso conserva además una LRU pequeña
+delante, para no deserializar en cada ejecución del script lo que ya tiene.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from demografia_antioquia.trazas import tramo
+
+
+# -----------------------------------------------------------
+# Hash de contenido
+# -----------------------------------------------------------
+def _actualizar(h, obj):
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"DataFrame")
+        h.update(repr(list(obj.columns)).encode())
+        h.update(repr([str(t) for t in obj.dtypes]).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(b"Series")
+        h.update(repr((obj.name, str(obj.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(b"ndarray")
+        h.update(repr((obj.shape, str(obj.dtype))).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        for x in obj:
+            _actualizar(h, x)
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for k in sorted(obj, key=repr):
+            _actualizar(h, k)
+            _actualizar(h, obj[k])
+    elif isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        h.update(repr(obj).encode())
+    else:
+        h.update(pickle.dumps(obj, protocol=4))
+
+
+def huella(*objetos):
+    """Hash SHA-1 del contenido de ``objetos`` (DataFrames, arreglos, escalares...)."""
+    h = hashlib.sha1()
+    for obj in objetos:
+        _actualizar(h, obj)
+    return h.hexdigest()
+
+
+# -----------------------------------------------------------
+# Caché LRU
+# -----------------------------------------------------------
+class CacheLRU:
+    """Caché con desalojo del elemento usado hace más tiempo."""
+
+    def __init__(self, max_entradas=256):
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser al menos 1")
+        self.max_entradas = max_entradas
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._desalojos = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def obtener(self, clave, calcular):
+        """Valor de ``clave``; si no está, lo calcula con ``calcular()`` y lo guarda."""
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self._aciertos += 1
+                return self._datos[clave]
+            self._fallos += 1
+        # Se calcula fuera del lock para no bloquear a otras sesiones
+        valor = calcular()
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self._desalojos += 1
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def estadisticas(self):
+        """Aciertos, fallos, desalojos, tamaño y tasa de aciertos."""
+        with self._lock:
+            consultas = self._aciertos + self._fallos
+            return {
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "desalojos": self._desalojos,
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "tasa_aciertos": self._aciertos / consultas if consultas else 0.0,
+            }
+
+
+# -----------------------------------------------------------
+# Almacenes compartidos entre procesos
+# -----------------------------------------------------------
+class AlmacenSQLite:
+    """Pares clave → bytes en un archivo SQLite, con desalojo LRU aproximado.
+
+    Cada hilo abre su propia conexión. El modo WAL permite que varios
+    procesos lean mientras uno escribe. Una lectura no escribe: el momento de
+    uso de cada clave leída se acumula en memoria y se vuelca en un solo
+    ``executemany`` cada ``intervalo_uso`` segundos o en la siguiente
+    escritura, antes de desalojar.
+    """
+
+    def __init__(self, ruta, max_entradas=2048, intervalo_uso=30.0):
+        self.ruta = os.fspath(ruta)
+        self.max_entradas = max_entradas
+        self.intervalo_uso = intervalo_uso
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._usos = {}
+        self._ultimo_volcado = time.monotonic()
+        directorio = os.path.dirname(os.path.abspath(self.ruta))
+        os.makedirs(directorio, exist_ok=True)
+        with self._conexion() as conexion:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS cache (clave TEXT PRIMARY KEY, valor BLOB, uso REAL)"
+            )
+
+    def _conexion(self):
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=30)
+            self._local.conexion = conexion
+        return conexion
+
+    def __len__(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def _pendientes(self, forzar=False):
+        # Usos acumulados para volcar, o None si aún no toca
+        with self._lock:
+            if not self._usos or not (forzar or time.monotonic() - self._ultimo_volcado >= self.intervalo_uso):
+                return None
+            usos, self._usos = self._usos, {}
+            self._ultimo_volcado = time.monotonic()
+        return [(uso, clave) for clave, uso in usos.items()]
+
+    def _volcar(self, conexion, usos):
+        conexion.executemany("UPDATE cache SET uso = MAX(uso, ?) WHERE clave = ?", usos)
+
+    def leer(self, clave):
+        fila = self._conexion().execute("SELECT valor FROM cache WHERE clave = ?", (clave,)).fetchone()
+        if fila is None:
+            return None
+        with self._lock:
+            self._usos[clave] = time.time()
+        usos = self._pendientes()
+        if usos:
+            with self._conexion() as conexion:
+                self._volcar(conexion, usos)
+        return bytes(fila[0])
+
+    def escribir(self, clave, valor):
+        usos = self._pendientes(forzar=True)
+        with self._conexion() as conexion:
+            if usos:
+                self._volcar(conexion, usos)
+            conexion.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (clave, valor, time.time()))
+            conexion.execute(
+                "DELETE FROM cache WHERE clave IN (SELECT clave FROM cache ORDER BY uso DESC LIMIT -1 OFFSET ?)",
+                (self.max_entradas,),
+            )
+
+    def limpiar(self):
+        with self._conexion() as conexion:
+            conexion.execute("DELETE FROM cache")
+
+
+class AlmacenRedis:
+    """Pares clave → bytes en un servidor Redis, con expiración opcional.
+
+    ``cliente`` es cualquier objeto con ``get``, ``set``, ``scan_iter`` y
+    ``delete`` al estilo de ``redis.Redis``; así un sustituto local (por
+    ejemplo ``fakeredis``) puede reemplazar al servidor.
+    """
+
+    def __init__(self, cliente, prefijo="demografia:", expiracion=None):
+        self.cliente = cliente
+        self.prefijo = prefijo
+        self.expiracion = expiracion
+
+    @classmethod
+    def desde_url(cls, url, **opciones):
+        import redis
+
+        return cls(redis.Redis.from_url(url), **opciones)
+
+    def __len__(self):
+        return sum(1 for _ in self.cliente.scan_iter(match=self.prefijo + "*"))
+
+    def leer(self, clave):
+        return self.cliente.get(self.prefijo + clave)
+
+    def escribir(self, clave, valor):
+        self.cliente.set(self.prefijo + clave, valor, ex=self.expiracion)
+
+    def limpiar(self):
+        claves = list(self.cliente.scan_iter(match=self.prefijo + "*"))
+        if claves:
+            self.cliente.delete(*claves)
+
+
+class CacheCompartida:
+    """Caché con la misma interfaz que :class:`CacheLRU` sobre un almacén compartido.
+
+    Los valores se serializan con pickle. Si el almacén falla (por ejemplo,
+    Redis no responde), se avisa una vez y se sigue calculando sin él: una
+    caché caída no debe tumbar el dashboard.
+    """
+
+    def __init__(self, almacen, max_locales=64):
+        self.almacen = almacen
+        self.local = CacheLRU(max_locales)
+        self._lock = threading.Lock()
+        self._aciertos_compartidos = 0
+        self._fallos = 0
+        self._errores = 0
+
+    def __len__(self):
+        return len(self.almacen)
+
+    def _error(self, error):
+        with self._lock:
+            self._errores += 1
+            primero = self._errores == 1
+        if primero:
+            warnings.warn(f"Caché compartida no disponible ({error!r}); se calcula sin ella")
+
+    def _compartida(self, clave, calcular):
+        clave = clave if isinstance(clave, str) else repr(clave)
+        try:
+            datos = self.almacen.leer(clave)
+        except Exception as error:
+            self._error(error)
+            datos = None
+        if datos is not None:
+            with self._lock:
+                self._aciertos_compartidos += 1
+            return pickle.loads(datos)
+        with self._lock:
+            self._fallos += 1
+        valor = calcular()
+        try:
+            self.almacen.escribir(clave, pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as error:
+            self._error(error)
+        return valor
+
+    def obtener(self, clave, calcular):
+        """Valor de ``clave``: LRU local, luego almacén compartido y, si no, ``calcular()``."""
+        return self.local.obtener(clave, lambda: self._compartida(clave, calcular))
+
+    def limpiar(self):
+        self.local.limpiar()
+        self.almacen.limpiar()
+
+    def estadisticas(self):
+        """Aciertos locales y compartidos, fallos (cálculos) y errores del almacén."""
+        local = self.local.estadisticas()
+        with self._lock:
+            consultas = local["aciertos"] + local["fallos"]
+            aciertos = local["aciertos"] + self._aciertos_compartidos
+            return {
+                "aciertos": aciertos,
+                "aciertos_locales": local["aciertos"],
+                "aciertos_compartidos": self._aciertos_compartidos,
+                "fallos": self._fallos,
+                "errores": self._errores,
+                "desalojos": local["desalojos"],
+                "entradas": local["entradas"],
+                "max_entradas": local["max_entradas"],
+                "tasa_aciertos": aciertos / consultas if consultas else 0.0,
+            }
+
+
+def _repr_constante(constante):
+    # repr de un frozenset depende de PYTHONHASHSEED: se ordenan sus elementos
+    if isinstance(constante, (set, frozenset)):
+        return f"{type(constante).__name__}({sorted(_repr_constante(c) for c in constante)})"
+    if isinstance(constante, tuple):
+        return f"({', '.join(_repr_constante(c) for c in constante)},)"
+    return repr(constante)
+
+
+def _version_codigo(codigo):
+    # Hash estable entre procesos del bytecode, incluidas funciones anidadas
+    h = hashlib.sha1(codigo.co_code)
+    for constante in codigo.co_consts:
+        if hasattr(constante, "co_code"):
+            h.update(_version_codigo(constante).encode())
+        else:
+            h.update(_repr_constante(constante).encode())
+    return h.hexdigest()[:12]
+
+
+def crear_cache(url=None):
+    """Caché según ``url``: ``None``/``"memoria"``, ``"sqlite:///ruta"`` o ``"redis://..."``."""
+    if not url or url == "memoria":
+        return CacheLRU()
+    if url.startswith("sqlite:///"):
+        return CacheCompartida(AlmacenSQLite(url[len("sqlite:///"):]))
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return CacheCompartida(AlmacenRedis.desde_url(url))
+    raise ValueError(f"Caché desconocida: {url!r}")
+
+
+# Caché compartida por todas las secciones
+cache = crear_cache(os.environ.get("DEMOGRAFIA_CACHE"))
+
+
+def memoizar(nombre, cache=cache):
+    """Decorador: memoiza la función bajo ``nombre`` según el contenido de sus argumentos.
+
+    La clave incluye además un hash del código de la función, para que
+    réplicas con versiones distintas del código no compartan resultados.
+    """
+    def decorador(funcion):
+        version = _version_codigo(funcion.__code__)
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            def calcular():
+                with tramo(f"calcular:{nombre}"):
+                    return funcion(*args, **kwargs)
+
+            # Sin tramo hijo "calcular" fue un acierto de la caché
+            with tramo(f"memo:{nombre}"):
+                clave = f"{nombre}:{version}:{huella(args, kwargs)}"
+                return cache.obtener(clave, calcular)
+        return envoltura
+    return decorador
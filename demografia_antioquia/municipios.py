@@ -0,0 +1,133 @@
+"""Registro de municipios de Antioquia indexado por código DANE.
+
+Las tablas de indicadores traen nombres de municipio escritos a mano
+("ITAGÜÍ", "Itagui", "SANTA FE DE ANTIOQUIA"...), mientras que la capa
+geográfica identifica cada municipio por ``mpio_cdpmp``. El registro normaliza
+los nombres una sola vez, guarda un índice nombre normalizado → código y ofrece
+búsquedas O(1) para unir cualquier tabla a la geometría, informando los nombres
+que no encuentran pareja en lugar de dejar NaN silenciosos.
+"""
+
+import os
+import threading
+import unicodedata
+
+from demografia_antioquia.trazas import trazar
+
+
+# -----------------------------------------------------------
+# Normalización de nombres
+# -----------------------------------------------------------
+def _tabla_tildes():
+    # Letras latinas con diacríticos -> letra base; marcas combinantes -> nada
+    tabla = {}
+    for codigo in range(0x00C0, 0x0250):
+        c = chr(codigo)
+        base = ''.join(d for d in unicodedata.normalize('NFD', c) if unicodedata.category(d) != 'Mn')
+        if base != c:
+            tabla[codigo] = base
+    for codigo in range(0x0300, 0x0370):
+        tabla[codigo] = None
+    return str.maketrans(tabla)
+
+
+_TABLA_TILDES = _tabla_tildes()
+
+
+def normalizar(texto):
+    """Mayúsculas, sin espacios extremos y sin tildes."""
+    return str(texto).upper().strip().translate(_TABLA_TILDES)
+
+
+# Variantes frecuentes en tablas del DANE y de la gobernación
+ALIAS = {
+    "SANTAFE DE ANTIOQUIA": "SANTA FE DE ANTIOQUIA",
+    "DON MATIAS": "DONMATIAS",
+    "EL PENOL": "PENOL",
+    "EL RETIRO": "RETIRO",
+    "SANTUARIO": "EL SANTUARIO",
+    "CARMEN DE VIBORAL": "EL CARMEN DE VIBORAL",
+    "SAN VICENTE": "SAN VICENTE FERRER",
+    "CAROLINA DEL PRINCIPE": "CAROLINA",
+    "SAN ANDRES": "SAN ANDRES DE CUERQUIA",
+}
+
+
+# -----------------------------------------------------------
+# Registro
+# -----------------------------------------------------------
+class RegistroMunicipios:
+    """Índices código DANE ↔ nombre construidos una sola vez."""
+
+    def __init__(self, atributos, codigo="mpio_cdpmp", nombre="mpio_cnmbr"):
+        codigos = atributos[codigo].astype(str).tolist()
+        nombres = atributos[nombre].astype(str).tolist()
+        self._nombres = dict(zip(codigos, nombres))
+        self._indice = {normalizar(n): c for c, n in zip(codigos, nombres)}
+        for alias, canonico in ALIAS.items():
+            if canonico in self._indice:
+                self._indice.setdefault(alias, self._indice[canonico])
+
+    def __len__(self):
+        return len(self._nombres)
+
+    def __contains__(self, codigo):
+        return codigo in self._nombres
+
+    @property
+    def codigos(self):
+        """Códigos DANE de todos los municipios de la capa."""
+        return list(self._nombres)
+
+    def codigo(self, nombre):
+        """Código DANE de un nombre de municipio, o ``None`` si no existe."""
+        return self._indice.get(normalizar(nombre))
+
+    def nombre(self, codigo):
+        """Nombre oficial (con tildes) de un código DANE."""
+        return self._nombres.get(str(codigo))
+
+    def codificar(self, nombres):
+        """Serie de códigos para una serie de nombres; normaliza cada nombre distinto una vez."""
+        unicos = {n: self.codigo(n) for n in nombres.dropna().unique()}
+        return nombres.map(unicos)
+
+    @trazar("municipios.unir")
+    def unir(self, datos, columna="Municipio", destino="mpio_cdpmp", ignorar=("TOTAL",)):
+        """Agrega la columna ``destino`` con el código DANE de ``datos[columna]``.
+
+        Devuelve ``(datos_con_codigo, sin_coincidencia)``, donde
+        ``sin_coincidencia`` lista los nombres que no están en el registro
+        (excepto los de ``ignorar``, como la fila de totales).
+        """
+        datos = datos.copy()
+        datos[destino] = self.codificar(datos[columna])
+        ignorados = {normalizar(n) for n in ignorar}
+        faltantes = datos.loc[datos[destino].isna(), columna].dropna().unique()
+        sin_coincidencia = [n for n in faltantes if normalizar(n) not in ignorados]
+        return datos, sin_coincidencia
+
+
+_registro = None
+_firma = None
+_lock = threading.Lock()
+
+
+def registro_municipios():
+    """Registro compartido por el proceso, leído del .dbf del shapefile.
+
+    Solo se leen los atributos (sin geometría) y se recarga si cambia el .dbf.
+    """
+    global _registro, _firma
+    from demografia_antioquia.geometria import RUTA_SHP
+
+    ruta_dbf = RUTA_SHP.with_suffix(".dbf")
+    firma = os.stat(ruta_dbf).st_mtime_ns
+    with _lock:
+        if _registro is None or firma != _firma:
+            import geopandas as gpd
+
+            atributos = gpd.read_file(RUTA_SHP, encoding="iso-8859-1", ignore_geometry=True)
+            _registro = RegistroMunicipios(atributos)
+            _firma = firma
+        return _registro
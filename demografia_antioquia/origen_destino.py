@@ -0,0 +1,412 @@
+"""Matriz origen–destino de migración dispersa (municipio × municipio × sexo × edad).
+
+La tabla ``migracion`` solo trae totales por municipio. Aquí los flujos se
+guardan como una matriz dispersa: tripletas COO ``(origen, destino, capa,
+flujo)``, donde la capa es la combinación sexo × grupo de edad, ordenadas por
+origen y con un ``indptr`` al estilo CSR. Con los 1.100+ municipios del país
+la matriz densa tendría más de 40 millones de celdas, casi todas en cero; la
+dispersa solo guarda los pares que tienen flujo.
+
+Las columnas de la tabla del dashboard salen de reducciones sobre esas
+tripletas: emigrantes = suma por fila fuera de la diagonal, inmigrantes =
+suma por columna fuera de la diagonal, no migrantes = la diagonal. Las tasas
+son anuales por mil sobre la población media del periodo.
+
+El origen es el municipio de residencia cinco años antes del censo. Un origen
+fuera del país se codifica como :data:`EXTERIOR`.
+
+Uso::
+
+    python -m demografia_antioquia.origen_destino CNPV2018_personas.csv
+"""
+
+import argparse
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from demografia_antioquia import ingesta
+
+EXTERIOR = "EXTERIOR"
+PERIODO = 5
+RUTA_MATRIZ = ingesta.DIRECTORIO_CUBOS / "origen_destino.parquet"
+
+# Columnas del archivo de personas del censo. Los nombres de residencia hace
+# cinco años dependen de la versión del diccionario de datos; se pueden
+# cambiar con ``--columnas`` en la línea de comandos.
+COLUMNAS_CENSO = {
+    "departamento": "U_DPTO", "municipio": "U_MPIO",
+    "departamento_origen": "PA_DPTO_5ANOS", "municipio_origen": "PA_MPIO_5ANOS",
+    "vivia": "PA_VIVIA_5ANOS", "sexo": "P_SEXO", "edad": "P_EDADR",
+}
+# PA_VIVIA_5ANOS: 1 en este municipio, 2 en otro municipio, 3 en otro país
+VIVIA_MISMO, VIVIA_OTRO, VIVIA_EXTERIOR = "1", "2", "3"
+
+
+# -----------------------------------------------------------
+# Matriz
+# -----------------------------------------------------------
+class MatrizOD:
+    """Flujos migratorios dispersos con índices CSR por origen.
+
+    ``origen``, ``destino``, ``sexo`` y ``edad`` son arreglos del mismo largo
+    que ``flujo`` (una fila por combinación con flujo); los pares repetidos se
+    suman. ``territorios`` fija el orden de los códigos (por defecto, los que
+    aparecen, ordenados).
+    """
+
+    def __init__(self, origen, destino, flujo, sexo=None, edad=None, territorios=None):
+        flujo = np.asarray(flujo, dtype=np.int64)
+        sexo = np.full(len(flujo), "Total", dtype=object) if sexo is None else sexo
+        edad = np.full(len(flujo), "Total", dtype=object) if edad is None else edad
+        # Cada código distinto se compara una vez; luego todo es aritmética de enteros
+        origen_id, origenes = _codificar(origen)
+        destino_id, destinos = _codificar(destino)
+
+        if territorios is None:
+            territorios = np.union1d(origenes, destinos)
+        self.territorios = np.asarray([str(t) for t in territorios], dtype=object)
+        self._posicion = pd.Index(self.territorios)
+        sexo_id, self.sexos = _codificar(sexo)
+        edad_id, self.edades = _codificar(edad)
+        o = self._posicion.get_indexer(origenes)[origen_id] if len(origenes) else origen_id
+        d = self._posicion.get_indexer(destinos)[destino_id] if len(destinos) else destino_id
+        if (o < 0).any() or (d < 0).any():
+            raise KeyError("Hay orígenes o destinos que no están en 'territorios'")
+        capa = sexo_id * len(self.edades) + edad_id
+
+        # Suma de duplicados y orden CSR (origen, destino, capa) en un solo paso
+        n, c = len(self.territorios), len(self.sexos) * len(self.edades)
+        lineal = (o.astype(np.int64) * n + d) * c + capa
+        lineal, inversa = np.unique(lineal, return_inverse=True)
+        suma = np.bincount(inversa, weights=flujo, minlength=len(lineal)).astype(np.int64)
+        conservar = suma != 0
+        lineal, suma = lineal[conservar], suma[conservar]
+        self.capa = (lineal % c).astype(np.int32)
+        par = lineal // c
+        self.origen = (par // n).astype(np.int32)
+        self.destino = (par % n).astype(np.int32)
+        self.flujo = suma
+        self.indptr = np.searchsorted(self.origen, np.arange(n + 1)).astype(np.int64)
+
+    def __len__(self):
+        return len(self.flujo)
+
+    @property
+    def forma(self):
+        return (len(self.territorios), len(self.territorios), len(self.sexos), len(self.edades))
+
+    # --- filtros ---
+    def _mascara(self, sexo=None, edad=None):
+        mascara = np.ones(len(self.flujo), dtype=bool)
+        n_edades = len(self.edades)
+        if sexo is not None:
+            ids = np.flatnonzero(np.isin(self.sexos, np.atleast_1d(sexo)))
+            mascara &= np.isin(self.capa // n_edades, ids)
+        if edad is not None:
+            ids = np.flatnonzero(np.isin(self.edades, np.atleast_1d(edad)))
+            mascara &= np.isin(self.capa % n_edades, ids)
+        return mascara
+
+    def _reducir(self, indices, mascara, por_capa=False):
+        if not por_capa:
+            return np.bincount(indices[mascara], weights=self.flujo[mascara],
+                               minlength=len(self.territorios)).astype(np.int64)
+        # Territorio × sexo × edad en una sola pasada
+        c = len(self.sexos) * len(self.edades)
+        lineal = indices[mascara].astype(np.int64) * c + self.capa[mascara]
+        suma = np.bincount(lineal, weights=self.flujo[mascara], minlength=len(self.territorios) * c)
+        return suma.astype(np.int64).reshape(len(self.territorios), len(self.sexos), len(self.edades))
+
+    # --- reducciones por territorio (``por_capa=True``: territorio × sexo × edad) ---
+    def emigrantes(self, por_capa=False, **filtros):
+        """Salidas de cada territorio hacia otro (suma por fila sin la diagonal)."""
+        mascara = self._mascara(**filtros) & (self.origen != self.destino)
+        return self._reducir(self.origen, mascara, por_capa)
+
+    def inmigrantes(self, por_capa=False, **filtros):
+        """Llegadas a cada territorio desde otro (suma por columna sin la diagonal)."""
+        mascara = self._mascara(**filtros) & (self.origen != self.destino)
+        return self._reducir(self.destino, mascara, por_capa)
+
+    def no_migrantes(self, por_capa=False, **filtros):
+        """Personas que residían en el mismo territorio al inicio y al final (la diagonal)."""
+        mascara = self._mascara(**filtros) & (self.origen == self.destino)
+        return self._reducir(self.origen, mascara, por_capa)
+
+    def flujo_entre(self, origen, destino, **filtros):
+        """Flujo total de ``origen`` a ``destino`` (búsqueda en la fila CSR del origen)."""
+        o, d = self._posicion.get_loc(str(origen)), self._posicion.get_loc(str(destino))
+        fila = slice(self.indptr[o], self.indptr[o + 1])
+        mascara = (self.destino[fila] == d) & self._mascara(**filtros)[fila]
+        return int(self.flujo[fila][mascara].sum())
+
+    # --- tablas ---
+    def tabla(self, territorios=None, nombres=None, periodo=PERIODO, anio=None, total=True, **filtros):
+        """Tabla con las columnas de ``migracion`` para ``territorios``, derivada de la matriz.
+
+        La población al inicio del periodo es la suma de la fila (incluida la
+        diagonal) y la del final la suma de la columna. La fila ``TOTAL`` suma
+        los territorios elegidos.
+        """
+        emigrantes = self.emigrantes(**filtros)
+        inmigrantes = self.inmigrantes(**filtros)
+        quedan = self.no_migrantes(**filtros)
+        inicial = quedan + emigrantes
+        final = quedan + inmigrantes
+        indices = (np.arange(len(self.territorios)) if territorios is None
+                   else self._posicion.get_indexer([str(t) for t in territorios]))
+        codigos = self.territorios[indices]
+        nombres = nombres or {}
+        tabla = pd.DataFrame({
+            "territorio": codigos,
+            "Municipio": [nombres.get(c, c) for c in codigos],
+            "Poblacion_2020": final[indices],
+            "Poblacion_2015": inicial[indices],
+            "No_migrantes": quedan[indices],
+            "Inmigrantes": inmigrantes[indices],
+            "Emigrantes": emigrantes[indices],
+        })
+        if total:
+            suma = tabla.drop(columns=["territorio", "Municipio"]).sum()
+            fila = pd.DataFrame([{"territorio": "TOTAL", "Municipio": "TOTAL", **suma.to_dict()}])
+            tabla = pd.concat([fila, tabla], ignore_index=True)
+        tabla = derivar_columnas(tabla, periodo)
+        if anio is not None:
+            tabla.insert(0, "anio", anio)
+        return tabla
+
+    def masculinidad(self, territorios=None, nombres=None, por_edad=False, anio=None,
+                     hombres="Hombres", mujeres="Mujeres"):
+        """Tabla ``masculinidad_migracion`` para ``territorios``, derivada de la matriz.
+
+        Ver :func:`demografia_antioquia.indicadores.masculinidad_migracion`.
+        Con ``por_edad=True`` hay una fila por territorio y grupo de edad
+        (columna ``Edad``), más la fila ``Total`` de cada territorio; todo se
+        calcula en una sola pasada sobre el arreglo territorio × edad.
+        """
+        from demografia_antioquia.indicadores import COLUMNAS_MASCULINIDAD, masculinidad_migracion
+
+        h = np.flatnonzero(self.sexos == hombres)
+        m = np.flatnonzero(self.sexos == mujeres)
+        indices = (np.arange(len(self.territorios)) if territorios is None
+                   else self._posicion.get_indexer([str(t) for t in territorios]))
+        conteos = []
+        for reduccion in (self.no_migrantes, self.inmigrantes, self.emigrantes):
+            # territorio × edad, con la suma de todas las edades como última columna
+            por_sexo = reduccion(por_capa=True)[indices]
+            for sexo in (h, m):
+                matriz = por_sexo[:, sexo, :].sum(axis=1)
+                conteos.append(np.column_stack([matriz, matriz.sum(axis=1)]))
+        resultado = masculinidad_migracion(*conteos)
+        edades = np.append(self.edades, "Total")
+        if not por_edad:
+            edades = edades[-1:]
+            resultado = {k: v[:, -1:] for k, v in resultado.items()}
+        codigos = self.territorios[indices]
+        nombres = nombres or {}
+        tabla = pd.DataFrame({
+            "territorio": np.repeat(codigos, len(edades)),
+            "Municipio": np.repeat([nombres.get(c, c) for c in codigos], len(edades)),
+            "Edad": np.tile(edades, len(codigos)),
+            **{COLUMNAS_MASCULINIDAD[k]: v.ravel() for k, v in resultado.items()},
+        })
+        if not por_edad:
+            tabla = tabla.drop(columns="Edad")
+        if anio is not None:
+            tabla.insert(0, "anio", anio)
+        return tabla
+
+    def corredores(self, k=10, neto=False, territorios=None, **filtros):
+        """Los ``k`` pares origen → destino con mayor flujo (o mayor flujo neto).
+
+        Con ``neto=True`` cada par aparece una vez, en el sentido del flujo
+        neto positivo, con ``Contraflujo`` y ``Neto``. ``territorios`` limita
+        a los pares con origen o destino en ese conjunto.
+        """
+        mascara = self._mascara(**filtros) & (self.origen != self.destino)
+        if territorios is not None:
+            elegidos = np.zeros(len(self.territorios), dtype=bool)
+            elegidos[self._posicion.get_indexer([str(t) for t in territorios])] = True
+            mascara &= elegidos[self.origen] | elegidos[self.destino]
+        n = len(self.territorios)
+        par = self.origen[mascara].astype(np.int64) * n + self.destino[mascara]
+        pares, inversa = np.unique(par, return_inverse=True)
+        flujos = np.bincount(inversa, weights=self.flujo[mascara]).astype(np.int64)
+        o, d = pares // n, pares % n
+        # Flujo en sentido contrario, buscando el par (d, o) entre los pares ordenados
+        inverso = d * n + o
+        contra = np.zeros_like(flujos)
+        if len(pares):
+            posicion = np.minimum(np.searchsorted(pares, inverso), len(pares) - 1)
+            encontrado = pares[posicion] == inverso
+            contra[encontrado] = flujos[posicion[encontrado]]
+        valor = flujos - contra if neto else flujos
+        candidatos = np.flatnonzero(valor > 0) if neto else np.arange(len(valor))
+        if len(candidatos) > k:
+            candidatos = candidatos[np.argpartition(-valor[candidatos], k - 1)[:k]]
+        candidatos = candidatos[np.lexsort((pares[candidatos], -valor[candidatos]))]
+        resultado = pd.DataFrame({
+            "Origen": self.territorios[o[candidatos]],
+            "Destino": self.territorios[d[candidatos]],
+            "Flujo": flujos[candidatos],
+        })
+        if neto:
+            resultado["Contraflujo"] = contra[candidatos]
+            resultado["Neto"] = valor[candidatos]
+        return resultado
+
+    # --- persistencia ---
+    def a_tabla_coo(self):
+        """Tripletas COO como DataFrame (origen, destino, sexo, edad, flujo)."""
+        n_edades = len(self.edades)
+        return pd.DataFrame({
+            "origen": pd.Categorical.from_codes(self.origen, self.territorios),
+            "destino": pd.Categorical.from_codes(self.destino, self.territorios),
+            "sexo": pd.Categorical.from_codes(self.capa // n_edades, self.sexos),
+            "edad": pd.Categorical.from_codes(self.capa % n_edades, self.edades),
+            "flujo": self.flujo,
+        })
+
+    @classmethod
+    def desde_tabla(cls, coo, territorios=None):
+        return cls(coo["origen"], coo["destino"], coo["flujo"], coo.get("sexo"), coo.get("edad"),
+                   territorios=territorios)
+
+    def guardar(self, ruta=RUTA_MATRIZ):
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        self.a_tabla_coo().to_parquet(ruta, index=False)
+
+
+def _codificar(valores):
+    # Ids enteros y categorías ordenadas, como texto
+    ids, categorias = pd.factorize(pd.Series(valores).astype(str), sort=True)
+    return ids.astype(np.int64), np.asarray(categorias, dtype=object)
+
+
+def derivar_columnas(tabla, periodo=PERIODO):
+    """Agrega a ``tabla`` las columnas derivadas de ``migracion`` a partir de los conteos.
+
+    Necesita ``Poblacion_2020``, ``Poblacion_2015``, ``Inmigrantes`` y
+    ``Emigrantes``; las tasas son anuales por mil sobre la población media.
+    """
+    tabla = tabla.copy()
+    tabla["Migracion_Neta"] = tabla["Inmigrantes"] - tabla["Emigrantes"]
+    tabla["Migracion_Bruta"] = tabla["Inmigrantes"] + tabla["Emigrantes"]
+    tabla["Poblacion_Media"] = (tabla["Poblacion_2020"] + tabla["Poblacion_2015"]) / 2
+    anual = 1000 / (tabla["Poblacion_Media"] * periodo)
+    tabla["Tasa_Inmigracion"] = tabla["Inmigrantes"] * anual
+    tabla["Tasa_Emigracion"] = tabla["Emigrantes"] * anual
+    tabla["Tasa_migracion"] = tabla["Migracion_Neta"] * anual
+    tabla["Indice_Eficacia_Migratoria"] = 100 * tabla["Migracion_Neta"] / tabla["Migracion_Bruta"].where(
+        tabla["Migracion_Bruta"] != 0)
+    return tabla
+
+
+def cargar_matriz(ruta=RUTA_MATRIZ):
+    """Matriz guardada por :meth:`MatrizOD.guardar`, o ``None`` si no existe."""
+    if not ruta.exists():
+        return None
+    return MatrizOD.desde_tabla(pd.read_parquet(ruta))
+
+
+_cache = None
+_firma = None
+_lock = threading.Lock()
+
+
+def matriz_od():
+    """Matriz del repositorio compartida por el proceso (``None`` si no se ha generado).
+
+    Se vuelve a leer solo si cambia el archivo.
+    """
+    global _cache, _firma
+    firma = RUTA_MATRIZ.stat().st_mtime_ns if RUTA_MATRIZ.exists() else None
+    with _lock:
+        if firma != _firma:
+            _cache = cargar_matriz() if firma is not None else None
+            _firma = firma
+        return _cache
+
+
+# -----------------------------------------------------------
+# Ingesta del censo por bloques
+# -----------------------------------------------------------
+def reducir_bloque(bloque, columnas=COLUMNAS_CENSO):
+    """Conteos por (origen, destino, sexo, edad) de un bloque de personas del censo."""
+    bloque = bloque.rename(columns=lambda c: c.strip().upper())
+
+    def codigo(dpto, mpio):
+        return (bloque[columnas[dpto]].str.strip().str.zfill(2)
+                + bloque[columnas[mpio]].str.strip().str.zfill(3))
+
+    destino = codigo("departamento", "municipio")
+    vivia = bloque[columnas["vivia"]].str.strip()
+    origen = pd.Series(np.select(
+        [vivia == VIVIA_MISMO, vivia == VIVIA_OTRO, vivia == VIVIA_EXTERIOR],
+        [destino, codigo("departamento_origen", "municipio_origen"), EXTERIOR],
+        default="",
+    ), index=bloque.index)
+    edades = ingesta.FUENTES["censo"]["edades"]
+    reducido = pd.DataFrame({
+        "origen": origen,
+        "destino": destino,
+        "sexo": bloque[columnas["sexo"]].str.strip().map(ingesta.SEXOS).fillna("Indeterminado"),
+        "edad": bloque[columnas["edad"]].str.strip().map(edades).fillna("Sin información"),
+    })
+    # Sin información de residencia anterior no hay par origen–destino
+    reducido = reducido[reducido["origen"].str.len() > 0]
+    return reducido.groupby(["origen", "destino", "sexo", "edad"]).size()
+
+
+def agregar_censo(ruta, columnas=COLUMNAS_CENSO, tamano_bloque=500_000, separador=None, progreso=None):
+    """Tripletas COO de flujos leyendo el archivo de personas del censo por bloques."""
+    acumulado = pd.Series(dtype="int64")
+    leidas = 0
+    for bloque in ingesta.leer_bloques(ruta, list(columnas.values()), tamano_bloque, separador=separador):
+        leidas += len(bloque)
+        conteos = reducir_bloque(bloque, columnas)
+        if len(conteos):
+            acumulado = conteos if acumulado.empty else acumulado.add(conteos, fill_value=0)
+        if progreso:
+            progreso(leidas)
+    return acumulado.astype("int64").rename("flujo").reset_index()
+
+
+# -----------------------------------------------------------
+# Línea de comandos
+# -----------------------------------------------------------
+def _columnas(texto):
+    # "vivia=PA_VIVIA_5ANOS,municipio_origen=PA_MPIO_5A" -> COLUMNAS_CENSO actualizado
+    columnas = dict(COLUMNAS_CENSO)
+    for parte in texto.split(","):
+        clave, columna = parte.split("=")
+        columnas[clave.strip()] = columna.strip().upper()
+    return columnas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Matriz origen–destino desde el censo de personas.")
+    parser.add_argument("ruta")
+    parser.add_argument("--bloque", type=int, default=500_000, help="filas por bloque")
+    parser.add_argument("--separador", help="separador del CSV (por defecto se detecta)")
+    parser.add_argument("--columnas", type=_columnas, default=COLUMNAS_CENSO,
+                        help="nombres de columnas: clave=COLUMNA,... (claves de COLUMNAS_CENSO)")
+    parser.add_argument("--top", type=int, default=10, help="corredores a mostrar")
+    args = parser.parse_args(argv)
+
+    def progreso(filas):
+        print(f"\r{filas:,} filas leídas", end="", file=sys.stderr)
+
+    coo = agregar_censo(args.ruta, args.columnas, args.bloque, args.separador, progreso)
+    print(file=sys.stderr)
+    matriz = MatrizOD.desde_tabla(coo)
+    matriz.guardar()
+    print(f"{RUTA_MATRIZ}: {len(matriz):,} celdas no nulas de {np.prod(matriz.forma):,}")
+    print(matriz.corredores(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Proyección de población por el método de componentes (matrices de Leslie).
+
+La población se representa como un vector de ``2 × 18`` valores (mujeres y
+hombres en grupos quinquenales 0-4, ..., 85 y más) y cada paso de cinco años
+es un producto por una matriz de proyección en bloques::
+
+    | Lm  0  |   Lm: matriz de Leslie femenina (fecundidad en la primera
+    | Bh  Sh |       fila, supervivencia en la subdiagonal)
+                 Bh: nacimientos masculinos a partir de las mujeres
+                 Sh: supervivencia masculina
+
+La migración neta entra como una tasa anual (por mil) que escala la población
+proyectada. Todas las entradas pueden llevar ejes de lote al frente
+(municipios, escenarios o ambos): las matrices se arman y se multiplican para
+todo el lote a la vez, y solo se itera sobre los pasos de tiempo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from demografia_antioquia.indicadores import (
+    EDADES_QUINQUENALES, GRUPOS_QUINQUENALES, RAIZ_TABLA_VIDA,
+)
+from demografia_antioquia.tablas_vida import tabla_vida
+
+PASO = 5
+# Posición de los grupos 15-19, ..., 45-49 entre los quinquenales
+FERTILES = slice(3, 10)
+# Fracción femenina de los nacimientos (105 niños por cada 100 niñas)
+FRACCION_FEMENINA = 100 / 205
+
+
+# -----------------------------------------------------------
+# Supervivencia quinquenal
+# -----------------------------------------------------------
+def a_quinquenal(Lx):
+    """Pasa ``nLx`` de la tabla abreviada (0, 1, 2-4, 5-9, ...) a grupos 0-4, 5-9, ...
+
+    El último valor es el del grupo abierto, que en la tabla de vida es ``T85``.
+    """
+    Lx = np.asarray(Lx, dtype=float)
+    return np.concatenate([Lx[..., :3].sum(axis=-1, keepdims=True), Lx[..., 3:]], axis=-1)
+
+
+def supervivencia(L5, raiz=RAIZ_TABLA_VIDA):
+    """Razones de supervivencia de un grupo al siguiente y de los nacimientos a 0-4.
+
+    ``S[..., i]`` lleva el grupo ``i`` al ``i + 1``; la penúltima y la última
+    posición llevan 80-84 y 85 y más al grupo abierto (``T85 / T80``).
+    """
+    L5 = np.asarray(L5, dtype=float)
+    T80 = L5[..., -2] + L5[..., -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        S = L5[..., 1:] / L5[..., :-1]
+        abierto = np.where(T80 > 0, L5[..., -1] / T80, 0.0)
+    S[..., -1] = abierto
+    S = np.concatenate([S, abierto[..., None]], axis=-1)
+    nacimientos = L5[..., 0] / (PASO * raiz)
+    return np.nan_to_num(S), nacimientos
+
+
+# -----------------------------------------------------------
+# Matriz de proyección
+# -----------------------------------------------------------
+def matriz_proyeccion(L5_mujeres, L5_hombres, tef, fraccion_femenina=FRACCION_FEMENINA,
+                      tasa_migracion=0.0, raiz=RAIZ_TABLA_VIDA):
+    """Matriz ``(..., 36, 36)`` que proyecta ``[mujeres, hombres]`` cinco años.
+
+    ``L5_*`` son los ``5Lx`` quinquenales (18 grupos), ``tef`` las tasas
+    específicas de fecundidad de 15-19 a 45-49 en nacimientos por mujer y
+    año, y ``tasa_migracion`` la migración neta anual por mil habitantes.
+    """
+    S_m, nac_m = supervivencia(L5_mujeres, raiz)
+    S_h, nac_h = supervivencia(L5_hombres, raiz)
+    tef = np.asarray(tef, dtype=float)
+    lote = np.broadcast_shapes(S_m.shape[:-1], S_h.shape[:-1], tef.shape[:-1],
+                               np.shape(fraccion_femenina), np.shape(tasa_migracion))
+    A = len(GRUPOS_QUINQUENALES)
+
+    # Fecundidad por grupo de edad de la madre al inicio del periodo
+    f = np.zeros(tef.shape[:-1] + (A,))
+    f[..., FERTILES] = tef
+    f_siguiente = np.concatenate([f[..., 1:], np.zeros_like(f[..., :1])], axis=-1)
+    nacimientos = PASO / 2 * (f + S_m * f_siguiente)
+
+    M = np.zeros(lote + (2 * A, 2 * A))
+    filas = np.arange(A - 1)
+    M[..., filas + 1, filas] = S_m[..., :-1]
+    M[..., A - 1, A - 1] = S_m[..., -1]
+    M[..., A + filas + 1, A + filas] = S_h[..., :-1]
+    M[..., 2 * A - 1, 2 * A - 1] = S_h[..., -1]
+    fraccion = np.asarray(fraccion_femenina, dtype=float)[..., None]
+    M[..., 0, :A] = nac_m[..., None] * fraccion * nacimientos
+    M[..., A, :A] = nac_h[..., None] * (1 - fraccion) * nacimientos
+
+    factor = (1 + np.asarray(tasa_migracion, dtype=float) / 1000) ** PASO
+    return M * factor[..., None, None]
+
+
+def proyectar(poblacion, matriz, pasos):
+    """Aplica ``matriz`` ``pasos`` veces; devuelve ``(..., pasos + 1, 36)`` con el punto de partida."""
+    poblacion = np.asarray(poblacion, dtype=float)
+    lote = np.broadcast_shapes(poblacion.shape[:-1], matriz.shape[:-2])
+    actual = np.broadcast_to(poblacion, lote + poblacion.shape[-1:])
+    serie = [actual]
+    for _ in range(pasos):
+        actual = (matriz @ actual[..., None])[..., 0]
+        serie.append(actual)
+    return np.stack(serie, axis=-2)
+
+
+def proyeccion_por_componentes(mujeres, hombres, mx_mujeres, mx_hombres, tef, anios,
+                               fraccion_femenina=FRACCION_FEMENINA, tasa_migracion=0.0):
+    """Proyección completa desde conteos y tasas, para cualquier lote de entradas.
+
+    ``mujeres`` y ``hombres`` son conteos quinquenales (18 grupos); ``mx_*``
+    tasas de mortalidad por persona-año en los 20 grupos de la tabla
+    abreviada; ``tef`` la fecundidad por mujer de 15-19 a 45-49. Devuelve un
+    arreglo ``(..., pasos + 1, 2, 18)`` con mujeres y hombres en cada paso.
+    """
+    vida_m = tabla_vida(mx_mujeres, sexo="Mujeres")
+    vida_h = tabla_vida(mx_hombres, sexo="Hombres")
+    matriz = matriz_proyeccion(a_quinquenal(vida_m["nLx"]), a_quinquenal(vida_h["nLx"]), tef, fraccion_femenina, tasa_migracion)
+    poblacion = np.concatenate(np.broadcast_arrays(
+        np.asarray(mujeres, dtype=float), np.asarray(hombres, dtype=float)), axis=-1)
+    serie = proyectar(poblacion, matriz, anios // PASO)
+    A = len(GRUPOS_QUINQUENALES)
+    return serie.reshape(serie.shape[:-1] + (2, A))
+
+
+def a_tabla(serie, anio_base, escenarios=None):
+    """Tabla larga (escenario, año, sexo, edad, población) de una proyección ``(E, T, 2, 18)``."""
+    serie = np.asarray(serie)
+    E, T, _, A = serie.shape
+    escenarios = list(escenarios) if escenarios is not None else list(range(E))
+    return pd.DataFrame({
+        "Escenario": np.repeat(escenarios, T * 2 * A),
+        "Año": np.tile(np.repeat(anio_base + PASO * np.arange(T), 2 * A), E),
+        "Sexo": np.tile(np.repeat(["Mujeres", "Hombres"], A), E * T),
+        "Edad": np.tile(GRUPOS_QUINQUENALES, E * T * 2),
+        "Edad_inicio": np.tile(EDADES_QUINQUENALES, E * T * 2),
+        "Poblacion": serie.reshape(-1),
+    })
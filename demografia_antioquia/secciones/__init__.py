@@ -0,0 +1,85 @@
+"""Registro de secciones del dashboard.
+
+Cada sección vive en su propio módulo y se importa solo cuando el usuario la
+elige en la barra lateral, de modo que pandas, Altair y la pila GIS
+(geopandas, pyproj, folium) no se cargan hasta que una sección los necesita.
+"""
+
+import functools
+import importlib
+
+from demografia_antioquia import trazas
+from demografia_antioquia.trazas import tramo
+
+# Título en la barra lateral -> módulo con una función render()
+SECCIONES = {
+    "📋 Población (2018)": "demografia_antioquia.secciones.poblacion",
+    "💀 Mortalidad (2023)": "demografia_antioquia.secciones.mortalidad",
+    "👶 Fecundidad (2023)": "demografia_antioquia.secciones.fecundidad",
+    "🚶‍♂️ Migración (2018)": "demografia_antioquia.secciones.migracion",
+}
+
+
+def cargar(titulo):
+    """Importa (una sola vez por proceso) el módulo de la sección ``titulo``."""
+    return importlib.import_module(SECCIONES[titulo])
+
+
+def renderizar(titulo):
+    with tramo("seccion.importar", seccion=titulo):
+        modulo = cargar(titulo)
+    with tramo("seccion.render", seccion=titulo):
+        modulo.render()
+
+
+# -----------------------------------------------------------
+# Panel de perfil (?perfil=1 en la URL)
+# -----------------------------------------------------------
+def perfil_activo():
+    import streamlit as st
+
+    return st.query_params.get("perfil") == "1"
+
+
+def mostrar_perfil(ejecucion):
+    """Duración total y tabla de tramos de ``ejecucion``."""
+    import streamlit as st
+
+    st.metric("Duración del rerun", f"{ejecucion.duracion * 1000:,.0f} ms")
+    st.dataframe(
+        trazas.tabla_tramos(ejecucion),
+        hide_index=True,
+        column_config={
+            "ms": st.column_config.NumberColumn(format="%.1f"),
+            "% del rerun": st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%"),
+        },
+    )
+
+
+def medir_fragmento(nombre):
+    """Decorador para funciones ``st.fragment``: mide cada ejecución del fragmento.
+
+    En un rerun completo el fragmento aparece como tramo en el panel de la
+    barra lateral. Si el fragmento se vuelve a ejecutar solo, su perfil se
+    muestra al final del propio fragmento, porque desde él no se puede
+    escribir en la barra lateral.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            import streamlit as st
+
+            perfil = perfil_activo()
+            with trazas.medir_fragmento(nombre, registrar=perfil) as ejecucion:
+                resultado = funcion(*args, **kwargs)
+            if perfil and ejecucion is not None:
+                with st.expander(f"⏱️ Perfil del fragmento {nombre}", expanded=True):
+                    mostrar_perfil(ejecucion)
+            return resultado
+        return envoltura
+    return decorador
+
+
+def decimal(valor, cifras=2):
+    """Número con coma decimal, como en las cifras oficiales (``51,56``)."""
+    return f"{valor:.{cifras}f}".replace(".", ",")
@@ -0,0 +1,231 @@
+"""Sección Fecundidad (2023) del dashboard."""
+
+import altair as alt
+import streamlit as st
+
+from demografia_antioquia.incertidumbre import intervalos_tasa
+from demografia_antioquia.indicadores import fecundidad_por_territorio
+from demografia_antioquia.memo import memoizar
+from demografia_antioquia.secciones import decimal
+from demografia_antioquia.tablas import cargar_tabla
+from demografia_antioquia.trazas import etapa
+
+
+# -----------------------------------------------------------
+# Gráficos (memoizados)
+# -----------------------------------------------------------
+def tablas_indicadores(anio):
+    # Tablas de entrada de indicadores(), de todos los territorios del año
+    nombres = ["mortalidad_general", "mortalidad_infantil", "nacimientos_edad_madre",
+               "poblacion_mujeres", "nacimientos_ninas"]
+    return [cargar_tabla(nombre, anio=anio) for nombre in nombres]
+
+
+@memoizar("fecundidad.indicadores")
+def indicadores(anio, general, infantil, nacimientos_madre, mujeres, ninas):
+    # Todos los territorios a la vez: una fila por territorio. Las tablas llegan
+    # como argumentos (ver tablas_indicadores) para que formen parte de la clave
+    poblacion = general[general["Indicador"] == f"Población {anio}"].set_index("territorio")["Total"]
+    nacimientos = infantil[(infantil["Tabla"] == "infantil")
+                           & (infantil["Indicador"] == "Nacimientos")].set_index("territorio")["Cantidad"]
+    tabla = fecundidad_por_territorio(
+        nacimientos_madre, mujeres, ninas,
+        nacimientos_totales=nacimientos,
+        poblacion_total=poblacion,
+    )
+    tabla["nacimientos"] = nacimientos.reindex(tabla.index)
+    tabla["poblacion"] = poblacion.reindex(tabla.index)
+    return tabla
+
+
+@memoizar("fecundidad.intervalos")
+def intervalos(eventos, expuestos):
+    # Réplicas Poisson de los nacimientos; semilla fija para resultados estables
+    return intervalos_tasa(eventos, expuestos, por=1000, replicas=100_000, semilla=2023)
+
+
+# Gráfico de barras de nacimientos
+@memoizar("fecundidad.nacimientos")
+def grafico_nacimientos(df_nacimientos):
+    df_nac_chart = df_nacimientos[df_nacimientos["Grupos de edad"] != "15-49"]
+
+    chart_nac = alt.Chart(df_nac_chart).mark_bar(color="#eb0eff").encode(
+        x=alt.X("Grupos de edad:N", title="Edad de la Madre", sort=None),
+        y=alt.Y("Total:Q", title="Número de Nacimientos"),
+        tooltip=["Grupos de edad", "Total"]
+    ).properties(
+        title="Distribución de Nacimientos por Edad de la Madre",
+        width=500,
+        height=300
+    )
+    return chart_nac
+
+
+# Gráfico TEF
+@memoizar("fecundidad.tef")
+def grafico_tef(df_tef):
+    chart_tef = alt.Chart(df_tef).mark_line(point=True, color="#009e73", size=3).encode(
+        x=alt.X("Grupos de edad:N", title="Grupo de Edad", sort=None),
+        y=alt.Y("TEF:Q", title="TEF (por 1000 mujeres)", scale=alt.Scale(domain=[0, 70])),
+        tooltip=["Grupos de edad", alt.Tooltip("TEF:Q", format=".2f")]
+    ).properties(
+        title="Tasa Específica de Fecundidad (TEF) por Edad",
+        width=500,
+        height=400
+    )
+    return chart_tef
+
+
+# Gráfico TNR
+@memoizar("fecundidad.tnr")
+def grafico_tnr(df_tnr):
+    df_tnr_chart = df_tnr[df_tnr["Grupos de edad"] != "15-49 TNR"]
+
+    chart_tnr = alt.Chart(df_tnr_chart).mark_bar(color="#1f2eb4").encode(
+        x=alt.X("Grupos de edad:N", title="Edad de la Madre", sort=None),
+        y=alt.Y("TNR:Q", title="Tasa Neta de Reproducción"),
+        tooltip=["Grupos de edad", alt.Tooltip("TNR:Q", format=".2f")]
+    ).properties(
+        title="Tasa Neta de Reproducción por Edad",
+        width=500,
+        height=350
+    )
+    return chart_tnr
+
+
+# -----------------------------------------------------------
+# Renderizado
+# -----------------------------------------------------------
+def render():
+    st.header("👶 Análisis de Fecundidad - Antioquia 2023")
+
+    # ---------------------------
+    # 1️⃣ Indicadores Generales
+    # ---------------------------
+    etapa("1️⃣ Indicadores Generales")
+    st.subheader("📊 Indicadores Generales de Fecundidad")
+
+    ind = indicadores(2023, *tablas_indicadores(2023)).loc["05"]
+    simular = st.toggle("🎲 Intervalos de confianza (Monte Carlo)",
+                        help="100,000 réplicas Poisson de los nacimientos")
+    if simular:
+        mujeres = cargar_tabla("poblacion_mujeres", anio=2023, territorio="05")
+        nac = cargar_tabla("nacimientos_edad_madre", anio=2023, territorio="05")
+        fertiles = mujeres["Grupos de edad"] != "15-49"
+        _, inf, sup = intervalos(
+            [ind["nacimientos"], nac.loc[nac["Grupos de edad"] != "15-49", "Total"].sum()],
+            [ind["poblacion"], mujeres.loc[fertiles, "30.06.2023"].sum()],
+        )
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Tasa Bruta de Natalidad", decimal(ind["tbn"]), help="Por 1000 habitantes")
+        if simular:
+            st.caption(f"IC 95 %: {decimal(inf[0])} – {decimal(sup[0])}")
+        st.metric("Total Nacimientos", f"{int(ind['nacimientos']):,}")
+
+    with col2:
+        st.metric("Tasa General de Fecundidad (TGF)", decimal(ind["tgf"]), help="Por 1000 mujeres en edad fértil")
+        if simular:
+            st.caption(f"IC 95 %: {decimal(inf[1])} – {decimal(sup[1])}")
+        st.metric("Población Media 2023", f"{int(ind['poblacion']):,}")
+
+    with col3:
+        st.metric("Índice Sintético de Fecundidad (ISF)", decimal(ind["isf"], 4), help="Hijos por mujer")
+        st.metric("Edad Media Materna (EMM)", decimal(ind["edad_media_materna"]))
+
+    with col4:
+        st.metric("Tasa Bruta de Reproductividad (TBR)", decimal(ind["tbr"], 4))
+        st.metric("TNR (15-49)", decimal(ind["tnr"], 4))
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 2️⃣ Nacimientos por Edad de la Madre
+    # ---------------------------
+    etapa("2️⃣ Nacimientos por Edad de la Madre")
+    st.subheader("👩‍👧 Nacimientos Ocurridos según Edad de la Madre - 2023")
+
+    col1, col2 = st.columns([1, 1.5])
+
+    with col1:
+        df_nacimientos = cargar_tabla("nacimientos_edad_madre", anio=2023, territorio="05")
+        st.dataframe(df_nacimientos, use_container_width=True)
+
+    with col2:
+        st.altair_chart(grafico_nacimientos(df_nacimientos), use_container_width=True)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 3️⃣ Tasas Específicas de Fecundidad (TEF)
+    # ---------------------------
+    etapa("3️⃣ Tasas Específicas de Fecundidad")
+    st.subheader("📈 Tasas Específicas de Fecundidad por Edad - 2023")
+
+    df_tef = cargar_tabla("tef", anio=2023, territorio="05")
+
+    col1, col2 = st.columns([1, 1.5])
+
+    with col1:
+        st.dataframe(df_tef, use_container_width=True)
+
+        st.markdown("### 🔍 Observaciones")
+        st.markdown("- **Pico de fecundidad:** 20-24 años (58,79 por 1000)")
+        st.markdown("- **Segundo pico:** 25-29 años (51,75 por 1000)")
+        st.markdown("- **Fecundidad adolescente:** 32,66 por 1000 (15-19 años)")
+        st.markdown("- **Descenso marcado:** A partir de los 30 años")
+
+    with col2:
+        st.altair_chart(grafico_tef(df_tef), use_container_width=True)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 4️⃣ Población de Mujeres y Niñas
+    # ---------------------------
+    etapa("4️⃣ Población de Mujeres y Niñas")
+    st.subheader("👩 Población Media de Mujeres en Edad Fértil - 2023")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**Población Media de Mujeres**")
+        df_pob_mujeres = cargar_tabla("poblacion_mujeres", anio=2023, territorio="05")
+        st.dataframe(df_pob_mujeres, use_container_width=True, height=300)
+
+    with col2:
+        st.markdown("**Población Nacimientos Niñas**")
+        df_nac_ninas = cargar_tabla("nacimientos_ninas", anio=2023, territorio="05")
+        st.dataframe(df_nac_ninas, use_container_width=True, height=300)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 5️⃣ Tasa Neta de Reproducción (TNR)
+    # ---------------------------
+    etapa("5️⃣ Tasa Neta de Reproducción")
+    st.subheader("🔄 Tasa Neta de Reproducción por Grupos de Edad (cifras publicadas)")
+
+    df_tnr = cargar_tabla("tnr", anio=2023, territorio="05")
+
+    col1, col2 = st.columns([1, 1.5])
+
+    with col1:
+        # Tabla tal como la publica la fuente; la TNR de los indicadores se recalcula
+        publicada = df_tnr.loc[df_tnr["Grupos de edad"] == "15-49 TNR", "TNR"]
+        st.caption("Cifras publicadas por la fuente. La TNR de los indicadores generales se "
+                   "recalcula con la tabla de vida femenina del dashboard"
+                   + (f" ({decimal(ind['tnr'], 4)} frente a {decimal(publicada.iloc[0], 4)} publicada)."
+                      if len(publicada) else "."))
+        st.dataframe(df_tnr, use_container_width=True)
+
+        st.markdown("### 📌 Interpretación TNR")
+        tendencia = "**decrecer**" if ind["tnr"] < 1 else "**crecer**"
+        st.info(f"**TNR = {decimal(ind['tnr'], 3)}** indica que cada mujer está siendo reemplazada por aproximadamente {decimal(ind['tnr'])} hijas, lo que significa que la población tiende a {tendencia} en el largo plazo.")
+
+    with col2:
+        st.altair_chart(grafico_tnr(df_tnr), use_container_width=True)
+
+    st.markdown("---")
@@ -0,0 +1,635 @@
+"""Sección Migración (2018) del dashboard."""
+
+import altair as alt
+import streamlit as st
+
+from demografia_antioquia.memo import memoizar
+from demografia_antioquia.origen_destino import matriz_od
+from demografia_antioquia.secciones import decimal, medir_fragmento
+from demografia_antioquia.tablas import cargar_tabla
+from demografia_antioquia.trazas import etapa, tramo
+
+
+# -----------------------------------------------------------
+# Gráficos (memoizados)
+# -----------------------------------------------------------
+# Gráfico de Migración Neta
+@memoizar("migracion.neta")
+def grafico_neta(df_mpio):
+    chart_neta = alt.Chart(df_mpio).mark_bar().encode(
+        x=alt.X("Migracion_Neta:Q", title="Migración Neta"),
+        y=alt.Y("Municipio:N", sort="-x", title="Municipio"),
+        color=alt.condition(
+            alt.datum.Migracion_Neta > 0,
+            alt.value("#009e73"),  # verde para positivo
+            alt.value("#d55e00")   # naranja para negativo
+        ),
+        tooltip=["Municipio", "Migracion_Neta", "Tasa_migracion"]
+    ).properties(
+        title="Migración Neta por Municipio",
+        width=400,
+        height=400
+    )
+    return chart_neta
+
+
+# Gráfico de Tasas de Migración
+@memoizar("migracion.tasas")
+def grafico_tasas_migracion(df_mpio):
+    chart_tasas = alt.Chart(df_mpio).mark_bar().encode(
+        x=alt.X("Tasa_migracion:Q", title="Tasa de Migración (‰)"),
+        y=alt.Y("Municipio:N", sort="-x", title="Municipio"),
+        color=alt.condition(
+            alt.datum.Tasa_migracion > 0,
+            alt.value("#1f2eb4"),  # azul para positivo
+            alt.value("#eb0eff")   # magenta para negativo
+        ),
+        tooltip=["Municipio", "Tasa_migracion", "Indice_Eficacia_Migratoria"]
+    ).properties(
+        title="Tasa de Migración por Municipio (‰)",
+        width=400,
+        height=400
+    )
+    return chart_tasas
+
+
+# Gráfico de barras agrupadas
+@memoizar("migracion.masculinidad_comparacion")
+def grafico_comparacion(df_masc):
+    df_comparacion = df_masc[["Municipio", "Factual", "ContraFactual", "No_migrantes"]].melt(
+        id_vars=["Municipio"],
+        var_name="Tipo_Poblacion",
+        value_name="Indice_Masculinidad"
+    )
+
+    df_comparacion["Tipo_Poblacion"] = df_comparacion["Tipo_Poblacion"].replace({
+        "Factual": "Factual (F): NM + inmigrantes",
+        "ContraFactual": "Contrafactual (CF): NM + emigrantes",
+        "No_migrantes": "No migrantes (NM)"
+    })
+
+    chart_comp = alt.Chart(df_comparacion).mark_bar().encode(
+        x=alt.X("Municipio:N", title="Municipio", sort=None),
+        y=alt.Y("Indice_Masculinidad:Q", title="Índice de Masculinidad (hombres por 100 mujeres)"),
+        color=alt.Color("Tipo_Poblacion:N", 
+                      scale=alt.Scale(
+                          domain=["Factual (F): NM + inmigrantes", "Contrafactual (CF): NM + emigrantes", "No migrantes (NM)"],
+                          range=["#1f2eb4", "#eb0eff", "#009e73"]
+                      ),
+                      legend=alt.Legend(title="Tipo de Población")),
+        xOffset="Tipo_Poblacion:N",
+        tooltip=["Municipio", "Tipo_Poblacion", alt.Tooltip("Indice_Masculinidad:Q", format=".2f")]
+    ).properties(
+        title="Índice de Masculinidad por Tipo de Población",
+        width=600,
+        height=400
+    )
+    return chart_comp
+
+
+# Efecto de Inmigración
+@memoizar("migracion.masculinidad_inmigracion")
+def grafico_inmigracion(df_masc):
+    chart_inm = alt.Chart(df_masc).mark_bar().encode(
+        x=alt.X("Diferencia_Relativa_Inmigracion:Q", title="Diferencia Relativa (por 1000)"),
+        y=alt.Y("Municipio:N", sort="-x", title="Municipio"),
+        color=alt.condition(
+            alt.datum.Diferencia_Relativa_Inmigracion > 0,
+            alt.value("#1f2eb4"),  # azul para positivo
+            alt.value("#d55e00")   # naranja para negativo
+        ),
+        tooltip=[
+            "Municipio", 
+            alt.Tooltip("Diferencia_Relativa_Inmigracion:Q", title="Dif. Relativa", format=".3f")
+        ]
+    ).properties(
+        title="Efecto Relativo de la Inmigración",
+        width=400,
+        height=400
+    )
+    return chart_inm
+
+
+# Efecto de Emigración
+@memoizar("migracion.masculinidad_emigracion")
+def grafico_emigracion(df_masc):
+    chart_em = alt.Chart(df_masc).mark_bar().encode(
+        x=alt.X("Diferencia_Relativa_Emigracion:Q", title="Diferencia Relativa (por 1000)"),
+        y=alt.Y("Municipio:N", sort="-x", title="Municipio"),
+        color=alt.condition(
+            alt.datum.Diferencia_Relativa_Emigracion > 0,
+            alt.value("#009e73"),  # verde para positivo
+            alt.value("#eb0eff")   # magenta para negativo
+        ),
+        tooltip=[
+            "Municipio",
+            alt.Tooltip("Diferencia_Relativa_Emigracion:Q", title="Dif. Relativa", format=".2f")
+        ]
+    ).properties(
+        title="Efecto Relativo de la Emigración",
+        width=400,
+        height=400
+    )
+    return chart_em
+
+
+@memoizar("migracion.masculinidad_neto")
+def grafico_neto(df_masc):
+    chart_neto = alt.Chart(df_masc).mark_bar().encode(
+        x=alt.X("Efecto_absoluto_migracion_Neta:Q", title="Efecto Absoluto Neto (F - CF)"),
+        y=alt.Y("Municipio:N", sort="-x", title="Municipio"),
+        color=alt.condition(
+            alt.datum.Efecto_absoluto_migracion_Neta > 0,
+            alt.value("#009e73"),
+            alt.value("#d55e00")
+        ),
+        tooltip=[
+            "Municipio",
+            alt.Tooltip("Efecto_absoluto_migracion_Neta:Q", title="Efecto Neto", format=".2f"),
+            alt.Tooltip("Efecto_Relativo_migracion_Neta:Q", title="Efecto Relativo (%)", format=".2f")
+        ]
+    ).properties(
+        title="Cambio Neto en Índice de Masculinidad por Migración",
+        width=500,
+        height=400
+    )
+    return chart_neto
+
+
+# -----------------------------------------------------------
+# Datos: tabla publicada o derivada de la matriz origen–destino
+# -----------------------------------------------------------
+def tabla_migracion():
+    """Tabla de migración del AMVA, la matriz origen–destino y los nombres por código.
+
+    Sin matriz devuelve la tabla publicada con ``(None, None)``. Si se generó
+    la matriz (ver :mod:`demografia_antioquia.origen_destino`), las columnas
+    se recalculan a partir de los flujos para los mismos municipios de la
+    tabla publicada.
+    """
+    tabla = cargar_tabla("migracion", anio=2018, territorio="AMVA")
+    matriz = matriz_od()
+    if matriz is None:
+        return tabla, None, None
+    from demografia_antioquia.municipios import registro_municipios
+
+    datos, _ = registro_municipios().unir(tabla, "Municipio")
+    datos = datos.dropna(subset=["mpio_cdpmp"])
+    datos = datos[datos["mpio_cdpmp"].isin(matriz.territorios)]
+    nombres = dict(zip(datos["mpio_cdpmp"], datos["Municipio"]))
+    derivada = matriz.tabla(list(nombres), nombres=nombres, anio=2018)
+    return derivada[tabla.columns], matriz, nombres
+
+
+# -----------------------------------------------------------
+# Mapas
+# -----------------------------------------------------------
+INDICADORES_MAPA = [
+    ("Tasa_migracion", "Tasa de Migración", "RdYlGn"),
+    ("Indice_Eficacia_Migratoria", "Índice Eficacia Migratoria", "RdYlGn"),
+]
+
+
+def elegir_indicador(key):
+    # Devuelve (columna, título, paleta) del indicador elegido
+    por_columna = {i[0]: i for i in INDICADORES_MAPA}
+    columna = st.selectbox("Indicador", list(por_columna), format_func=lambda c: por_columna[c][1], key=key)
+    return por_columna[columna]
+
+
+def datos_mapa(df_mpio):
+    from demografia_antioquia.municipios import registro_municipios
+
+    # Unión por código DANE
+    datos, sin_codigo = registro_municipios().unir(
+        df_mpio[["Municipio", "Tasa_migracion", "Indice_Eficacia_Migratoria"]], "Municipio"
+    )
+    if sin_codigo:
+        st.warning(f"Municipios sin correspondencia en el shapefile: {', '.join(sin_codigo)}")
+    return datos
+
+
+def datos_teselas():
+    """Datos y columnas del mapa de teselas, los mismos que usa :func:`mapa_teselas`.
+
+    ``python -m demografia_antioquia.teselas preparar`` los usa para cortar
+    las teselas al desplegar.
+    """
+    tabla, _, _ = tabla_migracion()
+    datos = datos_mapa(tabla[tabla["Municipio"] != "TOTAL"].copy())
+    return datos, [columna for columna, _, _ in INDICADORES_MAPA]
+
+
+def mapa_estatico(df_mpio):
+    # Imagen dibujada en el servidor: no envía Leaflet ni geometría al navegador
+    from demografia_antioquia.mapas_estaticos import coropleta_estatica
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        columna, titulo, paleta = elegir_indicador("migracion_mapa_indicador")
+    with col2:
+        formato = st.radio("Formato", ["svg", "png"], format_func=str.upper, horizontal=True,
+                           key="migracion_mapa_formato")
+    imagen = coropleta_estatica(datos_mapa(df_mpio), columna, titulo, paleta, formato=formato)
+    st.image(imagen.decode("utf-8") if formato == "svg" else imagen, use_container_width=True)
+
+
+# Mapa sobre teselas vectoriales cortadas de antemano
+def mapa_teselas(df_mpio):
+    import folium
+    from streamlit_folium import st_folium
+    from demografia_antioquia.mapas import CENTRO_VALLE_ABURRA, capa_teselas, clasificar, leyenda
+    from demografia_antioquia.teselas import teselas_listas, url_teselas
+
+    datos = datos_mapa(df_mpio)
+    columnas = [columna for columna, _, _ in INDICADORES_MAPA]
+    # Si cambiaron los datos o la geometría se vuelven a cortar en segundo plano
+    with tramo("teselas.listas"):
+        listas = teselas_listas(datos, columnas)
+    if not listas:
+        st.info("Las teselas se están preparando en segundo plano; mientras tanto se muestra el mapa interactivo.")
+        mapa_migracion(df_mpio)
+        return
+    url = url_teselas()
+
+    columna, titulo, paleta = elegir_indicador("migracion_mapa_teselas_indicador")
+    st.caption("El navegador descarga solo las teselas visibles.")
+    m1 = folium.Map(location=CENTRO_VALLE_ABURRA, zoom_start=10, tiles="CartoDB positron")
+    capa_teselas(url, datos, columna, titulo, paleta).add_to(m1)
+
+    with tramo("folium.st_folium"):
+        st_folium(m1, width=800, height=500, returned_objects=[])
+    bordes, colores = clasificar(datos[columna], paleta)
+    st.markdown(leyenda(titulo, bordes, colores), unsafe_allow_html=True)
+
+
+# Mapa interactivo (importa la pila de folium solo al llegar aquí)
+def mapa_migracion(df_mpio):
+    from streamlit_folium import st_folium
+    from demografia_antioquia.geometria import cargar_antioquia
+    from demografia_antioquia.mapas import capa_etiquetas, mapa_coropletico
+    from demografia_antioquia.topologia import cargar_topojson
+
+    # Capa compartida por proceso: ya reproyectada y con puntos de etiqueta
+    antioquia = cargar_antioquia()
+    # Geometría pre-serializada (TopoJSON cuantizado) con niveles de detalle por zoom
+    antioquia_topo = cargar_topojson(niveles=True)
+
+    # Preparar datos para los mapas
+    datos = datos_mapa(df_mpio)
+
+    st.caption("Usa el selector del mapa para cambiar de indicador.")
+
+    # Una sola geometría; el indicador se cambia en el navegador
+    m1 = mapa_coropletico(
+        antioquia_topo,
+        datos,
+        clave="mpio_cdpmp",
+        indicadores=INDICADORES_MAPA,
+    )
+
+    # Etiquetas interactivas: puntos representativos precalculados con la capa
+    with tramo("migracion.etiquetas"):
+        etiquetas = antioquia[["mpio_cdpmp", "etiqueta_lon", "etiqueta_lat"]].merge(
+            datos.dropna(subset=["Tasa_migracion"]), on="mpio_cdpmp"
+        )
+        etiquetas["Tasa"] = etiquetas["Tasa_migracion"].map("{:.2f} por mil".format)
+        etiquetas["Eficacia"] = etiquetas["Indice_Eficacia_Migratoria"].map("{:.2f}".format)
+        capa_etiquetas(etiquetas, ["Municipio", "Tasa", "Eficacia"]).add_to(m1)
+
+    with tramo("folium.st_folium"):
+        st_folium(m1, width=800, height=500, returned_objects=[])
+
+
+# -----------------------------------------------------------
+# Bloques con widgets propios
+# -----------------------------------------------------------
+# Cada bloque es un fragmento: al mover un widget se vuelve a ejecutar solo
+# el bloque, con los mismos argumentos de la última ejecución completa, en
+# lugar de toda la sección.
+@st.fragment
+@medir_fragmento("fragmento.bloque_corredores")
+def bloque_corredores(matriz, nombres):
+    st.subheader("🔀 Principales Corredores Migratorios")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        k = st.slider("Número de corredores", 5, 30, 10, key="migracion_corredores_k")
+    with col2:
+        neto = st.toggle("Flujo neto", value=False, key="migracion_corredores_neto")
+    corredores = matriz.corredores(k, neto=neto, territorios=list(nombres))
+    from demografia_antioquia.municipios import registro_municipios
+
+    registro = registro_municipios()
+    for columna in ("Origen", "Destino"):
+        corredores[columna] = corredores[columna].map(lambda c: registro.nombre(c) or c)
+    st.dataframe(corredores, use_container_width=True, hide_index=True)
+    st.markdown("---")
+
+
+@st.fragment
+@medir_fragmento("fragmento.bloque_mapas")
+def bloque_mapas(df_mpio):
+    # --- MAPA: TASA DE MIGRACIÓN E ÍNDICE DE EFICACIA MIGRATORIA ---
+    st.markdown("### 📍 Mapa: Tasa de Migración e Índice de Eficacia Migratoria")
+    interactivo = st.toggle(
+        "Mapa interactivo", value=False, key="migracion_mapa_interactivo",
+        help="Carga Leaflet y la geometría en el navegador. La imagen estática pesa mucho menos en conexiones móviles."
+    )
+
+    teselas = interactivo and st.checkbox(
+        "Usar teselas vectoriales", value=False, key="migracion_mapa_teselas",
+        help="El navegador pide solo las teselas visibles en lugar de toda la geometría."
+    )
+
+    try:
+        if teselas:
+            mapa_teselas(df_mpio)
+        elif interactivo:
+            mapa_migracion(df_mpio)
+        else:
+            mapa_estatico(df_mpio)
+    except Exception as e:
+        st.error(f"No se pudo cargar el mapa: {e}")
+        st.info("Verifica que el archivo shapefile esté en la carpeta correcta.")
+
+    st.markdown("---")
+
+
+@st.fragment
+@medir_fragmento("fragmento.bloque_masculinidad")
+def bloque_masculinidad(matriz, nombres):
+    st.header("📊 Análisis del Efecto de la Migración en el Índice de Masculinidad del Área Metropolitana de Antioquia al año 2018")
+
+    st.markdown("""
+    **Índice de Masculinidad:** Número de hombres por cada 100 mujeres
+    - **Factual (F):** Índice de masculinidad de la población observada (no migrantes e inmigrantes)
+    - **ContraFactual (CF):** Índice de masculinidad sin migración (no migrantes y emigrantes)
+    - **No migrantes (NM):** Índice de masculinidad de población que no migra
+    """)
+
+    st.markdown("---")
+
+    # Datos del índice de masculinidad: de la matriz origen–destino si existe
+    df_masc = cargar_tabla("masculinidad_migracion", anio=2018, territorio="AMVA")
+    if matriz is not None:
+        edades = matriz.masculinidad(list(nombres), nombres, por_edad=True)
+        grupo = st.selectbox("Grupo de edad", ["Total", *matriz.edades], key="migracion_masc_edad")
+        df_masc = edades[edades["Edad"] == grupo].reset_index(drop=True)[df_masc.columns]
+
+    # ---------------------------
+    # Tabla de Datos
+    # ---------------------------
+    etapa("6️⃣ Tabla de Datos")
+    st.subheader("📋 Índices de Masculinidad por Municipio")
+    st.dataframe(df_masc, use_container_width=True, height=380)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # Sección 1: Comparación de Índices
+    # ---------------------------
+    etapa("6️⃣ Sección 1: Comparación de Índices")
+    st.subheader("📊 Comparación: Población Factual, Contrafactual y No Migrante")
+
+    col1, col2 = st.columns([1.2, 1])
+
+    with col1:
+        st.altair_chart(grafico_comparacion(df_masc), use_container_width=True)
+
+    with col2:
+        st.markdown("### 🔍 Interpretación")
+        st.info("""
+        **¿Qué observar?**
+
+        - **Factual (F)** es la población observada: no migrantes más inmigrantes.
+          **ContraFactual (CF)** es la población que habría sin migración: no migrantes más emigrantes.
+
+        - Si **F > NM**: sumar los inmigrantes sube el índice, es decir, la inmigración trae proporcionalmente más hombres
+
+        - Si **CF > NM**: los emigrantes suben el índice, es decir, la emigración se lleva proporcionalmente más hombres
+
+        - La diferencia **F − CF** es el efecto neto de la migración en la composición por sexo
+        """)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # Sección 2: Efectos Relativos
+    # ---------------------------
+    etapa("6️⃣ Sección 2: Efectos Relativos")
+    st.subheader("📈 Efectos Relativos de la Migración (por 1000)")
+
+    st.markdown("""
+    **Diferencia Relativa de Inmigración:** $\\frac{F - NM}{NM} \\times 1000$
+
+    **Diferencia Relativa de Emigración:** $\\frac{NM - CF}{NM} \\times 1000$
+
+    **Efecto Relativo de la Migración Neta:** $\\frac{F - CF}{CF} \\times 100$
+
+    Las dos diferencias se relativizan por el índice de los no migrantes (NM), de modo que
+    su suma es el efecto neto en esa misma escala, $\\frac{F - CF}{NM} \\times 1000$: la
+    inmigración aporta hombres (o mujeres) frente a los no migrantes y la emigración los retira.
+    """)
+
+    col3, col4 = st.columns(2)
+
+    with col3:
+        st.altair_chart(grafico_inmigracion(df_masc), use_container_width=True)
+
+        st.markdown("**Interpretación:**")
+        st.markdown("- **Positivo:** Inmigración aumenta proporción de hombres")
+        st.markdown("- **Negativo:** Inmigración disminuye proporción de hombres")
+
+    with col4:
+        st.altair_chart(grafico_emigracion(df_masc), use_container_width=True)
+
+        st.markdown("**Interpretación:**")
+        st.markdown("- **Positivo:** Emigración retiene más mujeres (se van más hombres)")
+        st.markdown("- **Negativo:** Emigración retiene más hombres (se van más mujeres)")
+
+    st.markdown("---")
+
+    # ---------------------------
+    # Sección 3: Efecto Neto
+    # ---------------------------
+    etapa("6️⃣ Sección 3: Efecto Neto")
+    st.subheader("⚖️ Efecto Neto de la Migración")
+
+    col5, col6 = st.columns([1.5, 1])
+
+    with col5:
+        st.altair_chart(grafico_neto(df_masc), use_container_width=True)
+
+    with col6:
+        st.markdown("### 📊 Hallazgos Clave")
+
+        # Efecto neto más positivo
+        max_neto = df_masc.loc[df_masc["Efecto_absoluto_migracion_Neta"].idxmax()]
+        st.success(f"""
+        **Mayor aumento:**  
+        **{max_neto['Municipio']}**  
+        +{max_neto['Efecto_absoluto_migracion_Neta']:.2f} puntos
+        """)
+
+        # Efecto neto más negativo
+        min_neto = df_masc.loc[df_masc["Efecto_absoluto_migracion_Neta"].idxmin()]
+        st.error(f"""
+        **Mayor disminución:**  
+        **{min_neto['Municipio']}**  
+        {min_neto['Efecto_absoluto_migracion_Neta']:.2f} puntos
+        """)
+
+        st.info("""
+        **Efecto Neto = F - CF**
+
+        Muestra si la migración neta aumenta o disminuye el índice de masculinidad
+        """)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # Sección 4: Conclusiones
+    # ---------------------------
+    etapa("6️⃣ Sección 4: Conclusiones")
+    st.subheader("💡 Conclusiones del Análisis")
+
+    col7, col8 = st.columns(2)
+
+    with col7:
+        st.markdown("### 🔵 Inmigración")
+        positivos_inm = df_masc[df_masc["Diferencia_Relativa_Inmigracion"] > 0]
+        st.write(f"**{len(positivos_inm)} municipios** reciben inmigración masculinizada")
+
+        max_inm = df_masc.loc[df_masc["Diferencia_Relativa_Inmigracion"].idxmax()]
+        st.success(f"**Mayor efecto:** {max_inm['Municipio']} (+{max_inm['Diferencia_Relativa_Inmigracion']:.2f} por 1000)")
+
+        min_inm = df_masc.loc[df_masc["Diferencia_Relativa_Inmigracion"].idxmin()]
+        st.error(f"**Menor efecto:** {min_inm['Municipio']} ({min_inm['Diferencia_Relativa_Inmigracion']:.2f} por 1000)")
+
+    with col8:
+        st.markdown("### 🟣 Emigración")
+        positivos_em = df_masc[df_masc["Diferencia_Relativa_Emigracion"] > 0]
+        st.write(f"**{len(positivos_em)} municipios** pierden población masculina por emigración")
+
+        max_em = df_masc.loc[df_masc["Diferencia_Relativa_Emigracion"].idxmax()]
+        st.success(f"**Mayor efecto:** {max_em['Municipio']} (+{max_em['Diferencia_Relativa_Emigracion']:.2f} por 1000)")
+
+        min_em = df_masc.loc[df_masc["Diferencia_Relativa_Emigracion"].idxmin()]
+        st.error(f"**Menor efecto:** {min_em['Municipio']} ({min_em['Diferencia_Relativa_Emigracion']:.2f} por 1000)")
+
+    st.markdown("---")
+
+
+# -----------------------------------------------------------
+# Renderizado
+# -----------------------------------------------------------
+def render():
+    st.header("🚶‍♂️ Análisis de Migración - Valle de Aburrá (2015-2020)")
+
+    # ---------------------------
+    # 1️⃣ Datos de Migración
+    # ---------------------------
+    etapa("1️⃣ Datos de Migración")
+    st.subheader("📊 Indicadores de Migración por Municipio")
+
+    df_migracion, matriz, nombres = tabla_migracion()
+    if matriz is not None:
+        st.caption("Indicadores calculados a partir de la matriz origen–destino del censo.")
+
+    # Mostrar tabla completa
+    st.dataframe(df_migracion, use_container_width=True, height=400)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 2️⃣ Indicadores Destacados
+    # ---------------------------
+    etapa("2️⃣ Indicadores Destacados")
+    st.subheader("🔢 Indicadores Generales del Valle de Aburrá")
+
+    total = df_migracion[df_migracion["Municipio"] == "TOTAL"].iloc[0]
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Población 2020", f"{total['Poblacion_2020']:,}")
+        st.metric("Población 2015", f"{total['Poblacion_2015']:,}")
+
+    with col2:
+        st.metric("Total Inmigrantes", f"{total['Inmigrantes']:,}")
+        st.metric("Total Emigrantes", f"{total['Emigrantes']:,}")
+
+    with col3:
+        st.metric("Migración Neta Total", f"{total['Migracion_Neta']:,}")
+        st.metric("Migración Bruta", f"{total['Migracion_Bruta']:,}")
+
+    with col4:
+        st.metric("Tasa Inmigración", f"{decimal(total['Tasa_Inmigracion'])}‰")
+        st.metric("Tasa Emigración", f"{decimal(total['Tasa_Emigracion'])}‰")
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 3️⃣ Análisis por Municipio
+    # ---------------------------
+    etapa("3️⃣ Análisis por Municipio")
+    st.subheader("📈 Análisis Comparativo de Migración")
+
+    # Filtrar solo municipios (sin TOTAL)
+    df_mpio = df_migracion[df_migracion["Municipio"] != "TOTAL"].copy()
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.altair_chart(grafico_neta(df_mpio), use_container_width=True)
+
+    with col2:
+        st.altair_chart(grafico_tasas_migracion(df_mpio), use_container_width=True)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 4️⃣ Municipios con Mayor y Menor Migración
+    # ---------------------------
+    etapa("4️⃣ Municipios con Mayor y Menor Migración")
+    st.subheader("🏆 Ranking de Migración")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### ⬆️ Mayor Atracción Migratoria")
+        top_atraccion = df_mpio.nlargest(5, "Tasa_migracion")[["Municipio", "Tasa_migracion", "Migracion_Neta"]]
+        st.dataframe(top_atraccion.reset_index(drop=True), use_container_width=True)
+
+    with col2:
+        st.markdown("### ⬇️ Mayor Expulsión Migratoria")
+        top_expulsion = df_mpio.nsmallest(5, "Tasa_migracion")[["Municipio", "Tasa_migracion", "Migracion_Neta"]]
+        st.dataframe(top_expulsion.reset_index(drop=True), use_container_width=True)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # Corredores (solo con la matriz origen–destino)
+    # ---------------------------
+    etapa("Corredores")
+    if matriz is not None:
+        bloque_corredores(matriz, nombres)
+
+    # ---------------------------
+    # 5️⃣ Mapas Interactivos (Opcional - requiere instalación adicional)
+    # ---------------------------
+    etapa("5️⃣ Mapas Interactivos")
+    st.subheader("🗺️ Visualización Geográfica de la Migración")
+
+    st.info("""
+    El mapa permite alternar entre:
+    - **Tasa de migración** (verde = atracción, rojo = expulsión)
+    - **Índice de Eficacia Migratoria** (%)
+    """)
+
+    bloque_mapas(df_mpio)
+
+    # ---------------------------
+    # 6️⃣ Análisis del Efecto de la Migración en el Índice de Masculinidad
+    # ---------------------------
+    etapa("6️⃣ Análisis del Efecto de la Migración en el Índice de Masculinidad")
+    bloque_masculinidad(matriz, nombres)
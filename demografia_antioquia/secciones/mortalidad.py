@@ -0,0 +1,349 @@
+"""Sección Mortalidad (2023) del dashboard."""
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from demografia_antioquia.causas import GRUPOS_667, RESTO, cubo_causas
+from demografia_antioquia.incertidumbre import intervalos_tasa
+from demografia_antioquia.memo import memoizar
+from demografia_antioquia.secciones import decimal
+from demografia_antioquia.tablas import cargar_tabla
+from demografia_antioquia.tablas_vida import SEXOS, tablas_vida_por_territorio
+from demografia_antioquia.trazas import etapa
+
+
+# -----------------------------------------------------------
+# Gráficos (memoizados)
+# -----------------------------------------------------------
+# Gráfico de barras TBM
+@memoizar("mortalidad.tbm")
+def grafico_tbm(df_tbm):
+    df_tbm_chart = df_tbm[df_tbm["Indicador"] == "TBM 2023"].melt(
+        id_vars=["Indicador"], 
+        var_name="Sexo", 
+        value_name="TBM"
+    )
+
+    chart_tbm = alt.Chart(df_tbm_chart).mark_bar().encode(
+        x=alt.X("Sexo:N", title="Sexo"),
+        y=alt.Y("TBM:Q", title="Tasa Bruta de Mortalidad"),
+        color=alt.Color("Sexo:N", scale=alt.Scale(
+            domain=["Hombres", "Mujeres", "Total"],
+            range=["#1f2eb4", "#eb0eff", "#009e73"]
+        )),
+        tooltip=["Sexo", "TBM"]
+    ).properties(
+        title="Tasa Bruta de Mortalidad por Sexo 2023",
+        width=400,
+        height=300
+    )
+    return chart_tbm
+
+
+# Gráfico de líneas
+@memoizar("mortalidad.tasas")
+def grafico_tasas(df_tasas):
+    df_tasas_long = df_tasas.melt(id_vars=["x"], var_name="Sexo", value_name="Tasa")
+
+    # Dividir las tasas entre 1000 para mejor visualización
+    df_tasas_long["Tasa_ajustada"] = df_tasas_long["Tasa"] / 1000
+
+    chart_tasas = alt.Chart(df_tasas_long).mark_line(point=True, size=3).encode(
+        x=alt.X("x:N", title="Grupos de Edad", sort=None),
+        y=alt.Y("Tasa_ajustada:Q", 
+               title="mx",
+               scale=alt.Scale(type="log", domain=[0.0001, 0.2])),
+        color=alt.Color("Sexo:N", 
+                      scale=alt.Scale(
+                          domain=["Hombres", "Mujeres", "Total"],
+                          range=["#1f2eb4", "#eb0eff", "#009e73"]
+                      ),
+                      legend=alt.Legend(
+                          title=None,
+                          labelExpr="datum.label == 'Hombres' ? 'mxH' : datum.label == 'Mujeres' ? 'mxM' : 'mxT'"
+                      )),
+        tooltip=[
+            alt.Tooltip("x:N", title="Grupo de Edad"), 
+            "Sexo", 
+            alt.Tooltip("Tasa_ajustada:Q", title="Tasa (mx)", format=".6f")
+        ]
+    ).properties(
+        title="Tasas específicas de mortalidad de la población del departamento de Antioquia durante el año 2023",
+        width=700,
+        height=450
+    ).configure_axis(
+        gridOpacity=0.3
+    )
+    return chart_tasas
+
+
+@memoizar("mortalidad.tablas_vida")
+def tablas_vida(tasas):
+    # Todas las tablas (territorio × sexo) se resuelven en una sola pasada
+    return tablas_vida_por_territorio(tasas)
+
+
+@memoizar("mortalidad.esperanza")
+def grafico_esperanza(df_vida):
+    return alt.Chart(df_vida).mark_line(point=True, size=3).encode(
+        x=alt.X("x:N", title="Grupos de Edad", sort=None),
+        y=alt.Y("ex:Q", title="Esperanza de vida (años)"),
+        color=alt.Color("Sexo:N", scale=alt.Scale(
+            domain=["Hombres", "Mujeres", "Total"],
+            range=["#1f2eb4", "#eb0eff", "#009e73"]
+        )),
+        tooltip=["x", "Sexo", alt.Tooltip("ex:Q", format=".2f")]
+    ).properties(
+        title="Esperanza de vida por edad y sexo - Antioquia 2023",
+        width=700,
+        height=400
+    )
+
+
+@memoizar("mortalidad.treemap")
+def grafico_treemap(df_causas, titulo="Distribución de las 17 Principales Causas de Mortalidad"):
+    treemap = alt.Chart(df_causas).mark_rect().encode(
+        x=alt.X('sum(Total):Q', stack='zero', axis=None),
+        y=alt.Y('Causa_corta:N', axis=None),
+        color=alt.Color('Total:Q', 
+                       scale=alt.Scale(scheme='reds'),
+                       legend=alt.Legend(title="Defunciones")),
+        tooltip=[
+            alt.Tooltip('Causa:N', title='Causa'),
+            alt.Tooltip('Total:Q', title='Defunciones', format=','),
+            alt.Tooltip('%:Q', title='Porcentaje', format='.2f')
+        ]
+    ).properties(
+        width=800,
+        height=500,
+        title=titulo
+    )
+
+    # Agregar texto con las etiquetas
+    text = alt.Chart(df_causas).mark_text(
+        align='center',
+        baseline='middle',
+        fontSize=10,
+        fontWeight='bold',
+        color='white'
+    ).encode(
+        x=alt.X('sum(Total):Q', stack='zero'),
+        y=alt.Y('Causa_corta:N'),
+        text=alt.Text('Causa_corta:N'),
+        detail='Causa_corta:N'
+    )
+    return treemap + text
+
+
+# -----------------------------------------------------------
+# Intervalos Monte Carlo (memoizados; semilla fija para que no cambien entre ejecuciones)
+# -----------------------------------------------------------
+REPLICAS = 100_000
+SEMILLA = 2023
+
+
+@memoizar("mortalidad.intervalos")
+def intervalos(eventos, expuestos, por, distribucion):
+    return intervalos_tasa(eventos, expuestos, por=por, replicas=REPLICAS,
+                           distribucion=distribucion, semilla=SEMILLA)
+
+
+def texto_intervalo(inferior, superior):
+    return f"IC 95 %: {decimal(inferior)} – {decimal(superior)}"
+
+
+# -----------------------------------------------------------
+# Renderizado
+# -----------------------------------------------------------
+def render():
+    st.header("💀 Análisis de Mortalidad - Antioquia 2023")
+
+    simular = st.toggle(
+        "🎲 Intervalos de confianza (Monte Carlo)",
+        help=f"{REPLICAS:,} réplicas Poisson de las defunciones (binomiales sobre los "
+             "nacidos vivos en la mortalidad infantil y de la niñez)"
+    )
+
+    # ---------------------------
+    # 1️⃣ Tasas Brutas de Mortalidad
+    # ---------------------------
+    etapa("1️⃣ Tasas Brutas de Mortalidad")
+    st.subheader("📊 Tasas Bruta de Mortalidad por sexo - Antioquia 2023")
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        # Datos TBM
+        df_tbm = cargar_tabla("mortalidad_general", anio=2023, territorio="05")
+        st.dataframe(df_tbm, use_container_width=True)
+
+        # Métricas destacadas
+        st.markdown("### 🔢 Indicadores Generales")
+        sexos = ["Hombres", "Mujeres", "Total"]
+        filas = df_tbm.set_index("Indicador")
+        tbm = filas.loc["TBM 2023", sexos]
+        for col, sexo in zip(st.columns(3), sexos):
+            col.metric(f"TBM {sexo}", decimal(tbm[sexo]))
+        if simular:
+            _, inf, sup = intervalos(filas.loc["Defunciones 2023", sexos].to_numpy(),
+                                     filas.loc["Población 2023", sexos].to_numpy(), 1000, "poisson")
+            for col, a, b in zip(st.columns(3), inf, sup):
+                col.caption(texto_intervalo(a, b))
+
+    with col2:
+        st.altair_chart(grafico_tbm(df_tbm), use_container_width=True)
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 2️⃣ Tasas Específicas por Edad y Sexo
+    # ---------------------------
+    etapa("2️⃣ Tasas Específicas por Edad y Sexo")
+    st.subheader("📈 Tasas Específicas de Mortalidad por Edad y Sexo - 2023")
+
+    df_tasas = cargar_tabla("tasas_mortalidad", anio=2023, territorio="05")
+
+    col1, col2 = st.columns([1.25, 1.25])
+
+    with col1:
+        st.dataframe(df_tasas, use_container_width=True)
+
+    with col2:
+        st.altair_chart(grafico_tasas(df_tasas), use_container_width=True)
+    st.markdown("---")
+
+    # ---------------------------
+    # 3️⃣ Tablas de Vida
+    # ---------------------------
+    etapa("3️⃣ Tablas de Vida")
+    st.subheader("⏳ Tablas de Vida Abreviadas por Sexo - 2023")
+
+    df_vida = tablas_vida(cargar_tabla("tasas_mortalidad", anio=2023))
+    df_vida = df_vida[df_vida["territorio"] == "05"].drop(columns="territorio")
+
+    e0 = df_vida[df_vida["x"] == "0"].set_index("Sexo")["ex"]
+    col_a, col_b, col_c = st.columns(3)
+    col_a.metric("e0 Hombres", decimal(e0["Hombres"]), help="Esperanza de vida al nacer (años)")
+    col_b.metric("e0 Mujeres", decimal(e0["Mujeres"]), help="Esperanza de vida al nacer (años)")
+    col_c.metric("e0 Total", decimal(e0["Total"]), help="Esperanza de vida al nacer (años)")
+
+    col1, col2 = st.columns([1.25, 1.25])
+
+    with col1:
+        for sexo, tab in zip(SEXOS, st.tabs(SEXOS)):
+            with tab:
+                tabla = df_vida[df_vida["Sexo"] == sexo].drop(columns="Sexo")
+                st.dataframe(tabla.set_index("x").round(4), use_container_width=True)
+
+    with col2:
+        st.altair_chart(grafico_esperanza(df_vida), use_container_width=True)
+    st.markdown("---")
+
+    # ---------------------------
+    # 4️⃣ Mortalidad Infantil y de la Niñez
+    # ---------------------------
+    etapa("4️⃣ Mortalidad Infantil y de la Niñez")
+    st.subheader("👶 Mortalidad Infantil y de la Niñez - Antioquia 2023")
+
+    df_infantil = cargar_tabla("mortalidad_infantil", anio=2023, territorio="05")
+    conteos = df_infantil.set_index(["Tabla", "Indicador"])["Cantidad"]
+    # (defunciones, expuestos, distribución) de cada tasa por 1000
+    tasas_infantiles = {
+        "infantil": (conteos["infantil", "Menores 1 año"], conteos["infantil", "Nacimientos"], "binomial"),
+        "ninez": (conteos["ninez", "Menores 5 años"], conteos["ninez", "Nacimientos"], "binomial"),
+        "ninez_0_4": (conteos["ninez_0_4", "Menores 5 años"], conteos["ninez_0_4", "Pob 0 a 4 años"], "poisson"),
+    }
+    est_inf = {}
+    for tabla, (eventos, expuestos, distribucion) in tasas_infantiles.items():
+        if simular:
+            est, inf, sup = intervalos([eventos], [expuestos], 1000, distribucion)
+            est_inf[tabla] = (est[0], texto_intervalo(inf[0], sup[0]))
+        else:
+            est_inf[tabla] = (1000 * eventos / expuestos, None)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("**Mortalidad Infantil 2023**")
+        df_mi = df_infantil[df_infantil["Tabla"] == "infantil"].drop(columns="Tabla").reset_index(drop=True)
+        st.dataframe(df_mi, use_container_width=True)
+        st.metric("TMI 2023", decimal(est_inf["infantil"][0]), help="Tasa de Mortalidad Infantil")
+        if est_inf["infantil"][1]:
+            st.caption(est_inf["infantil"][1])
+
+    with col2:
+        st.markdown("**Mortalidad de la Niñez 2023**")
+        df_mn = df_infantil[df_infantil["Tabla"] == "ninez"].drop(columns="Tabla").reset_index(drop=True)
+        st.dataframe(df_mn, use_container_width=True)
+        st.metric("TN 2023", decimal(est_inf["ninez"][0]), help="Tasa de Mortalidad de la Niñez")
+        if est_inf["ninez"][1]:
+            st.caption(est_inf["ninez"][1])
+
+    with col3:
+        st.markdown("**Mortalidad Niñez (0-4 años) 2023**")
+        df_mn04 = df_infantil[df_infantil["Tabla"] == "ninez_0_4"].drop(columns="Tabla").reset_index(drop=True)
+        st.dataframe(df_mn04, use_container_width=True)
+        st.metric("TN 2023", decimal(est_inf["ninez_0_4"][0]), help="Tasa de Mortalidad de la Niñez")
+        if est_inf["ninez_0_4"][1]:
+            st.caption(est_inf["ninez_0_4"][1])
+
+    st.markdown("---")
+
+    # ---------------------------
+    # 5️⃣ Principales Causas de Mortalidad (vista sobre el cubo de causas)
+    # ---------------------------
+    etapa("5️⃣ Principales Causas de Mortalidad")
+    st.subheader("🏥 Principales Causas de Mortalidad - Antioquia")
+
+    cubo = cubo_causas()
+
+    def opciones(dimension):
+        return [None, *cubo.valores[dimension]]
+
+    def etiqueta(valor):
+        return "Todos" if valor is None else {"05": "Antioquia (05)"}.get(valor, valor)
+
+    col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+    anio = col_f1.selectbox("Año", opciones("anio"), index=len(opciones("anio")) - 1, format_func=etiqueta)
+    territorio = col_f2.selectbox("Territorio", opciones("territorio"), format_func=etiqueta)
+    sexo = col_f3.selectbox("Sexo", opciones("sexo"), format_func=etiqueta)
+    edad = col_f4.selectbox("Grupo de edad", opciones("edad"), format_func=etiqueta)
+
+    col_n1, col_n2, col_n3 = st.columns([1, 1, 1])
+    nivel = col_n1.radio("Nivel", ["causa", "grupo"], horizontal=True,
+                         format_func={"causa": "Causas (lista 6/67)", "grupo": "Grandes grupos"}.get)
+    grupos = [g for g in GRUPOS_667 if g != RESTO[0]]
+    grupo = col_n2.selectbox("Gran grupo", [None, *grupos], disabled=nivel == "grupo",
+                             format_func=lambda g: "Todos" if g is None else f"{g}00 {GRUPOS_667[g]}")
+    top = col_n3.slider("Causas a mostrar", min_value=5, max_value=30, value=17)
+
+    filtros = {"anio": anio, "territorio": territorio, "sexo": sexo, "edad": edad}
+    df_causas = cubo.consultar(**filtros, nivel=nivel, grupo=grupo, top=top)
+
+    columnas = ["Codigo", "Causa", "Total", "%", "TMxCE"]
+    poblacion = cubo.poblacion(**filtros)
+    if simular and pd.notna(poblacion):
+        _, inf, sup = intervalos(df_causas["Total"].to_numpy(), poblacion, 1000, "poisson")
+        df_causas = df_causas.assign(TMxCE_inf=inf, TMxCE_sup=sup)
+        columnas += ["TMxCE_inf", "TMxCE_sup"]
+    st.dataframe(df_causas[columnas], use_container_width=True, height=400)
+
+    st.markdown("### 📊 Resumen")
+    col_a, col_b, col_c = st.columns(3)
+    col_a.metric("Total Defunciones", f"{cubo.total(**filtros):,}")
+    col_b.metric("Total Población", f"{int(poblacion):,}" if pd.notna(poblacion) else "—")
+    if len(df_causas):
+        principal = df_causas.iloc[0]
+        col_c.metric("Causa Principal", decimal(principal["%"]), help=principal["Causa"])
+
+    st.markdown("---")
+
+    # Treemap de causas de mortalidad
+    st.subheader("🗺️ Treemap - Distribución de Causas de Mortalidad")
+
+    titulo = f"Distribución de las {len(df_causas)} Principales " + (
+        "Causas de Mortalidad" if nivel == "causa" else "Grandes Grupos de Causas")
+    st.altair_chart(grafico_treemap(df_causas, titulo), use_container_width=True)
+
+    st.markdown("---")
@@ -0,0 +1,242 @@
+"""Sección Población (2018) del dashboard."""
+
+import altair as alt
+import numpy as np
+import streamlit as st
+
+from demografia_antioquia.indicadores import estructura_por_territorio
+from demografia_antioquia.memo import memoizar
+from demografia_antioquia.proyeccion import a_tabla, proyeccion_por_componentes
+from demografia_antioquia.secciones import decimal
+from demografia_antioquia.tablas import cargar_tabla
+from demografia_antioquia.trazas import etapa
+
+SUPERFICIE_KM2 = 63612
+
+# Escenarios de proyección: (nombre, factor sobre la fecundidad, migración neta ‰)
+ESCENARIOS = [
+    ("Base", 1.0, 0.0),
+    ("Fecundidad baja (-20 %)", 0.8, 0.0),
+    ("Fecundidad alta (+20 %)", 1.2, 0.0),
+    ("Migración neta +5 ‰", 1.0, 5.0),
+    ("Migración neta -5 ‰", 1.0, -5.0),
+]
+
+
+# -----------------------------------------------------------
+# Tablas derivadas y gráficos (memoizados)
+# -----------------------------------------------------------
+@memoizar("poblacion.porcentajes")
+def porcentajes(df_input):
+    total = df_input.loc[df_input["Edad"] == "Total", "Total"].values[0]
+    dfp = df_input.copy()
+    dfp["% Total"] = (dfp["Total"] / total) * 100
+    dfp["% Hombres"] = (dfp["Hombres"] / total) * 100
+    dfp["% Mujeres"] = (dfp["Mujeres"] / total) * 100
+    return dfp.round(2)
+
+
+@memoizar("poblacion.indicadores")
+def indicadores(datos):
+    # Grandes grupos 0-14 / 15-64 / 65+ y, como en las cifras del DANE, índices
+    # de dependencia y envejecimiento con 15-59 / 60+
+    grupos = estructura_por_territorio(datos)
+    indices = estructura_por_territorio(datos, limite_mayor=60)
+    return grupos, indices
+
+
+@memoizar("poblacion.proyeccion")
+def proyeccion(df_tot, tasas, df_tef, anios):
+    # Censo 2018 + mortalidad y fecundidad 2023; todos los escenarios en un solo lote.
+    # Las tablas llegan como argumentos para que formen parte de la clave de la caché
+    base = df_tot[df_tot["Edad"] != "Total"]
+    tef = df_tef["TEF"].to_numpy() / 1000
+    factores = np.array([f for _, f, _ in ESCENARIOS])
+    migracion = np.array([m for _, _, m in ESCENARIOS])
+    serie = proyeccion_por_componentes(
+        base["Mujeres"].to_numpy(), base["Hombres"].to_numpy(),
+        tasas["Mujeres"].to_numpy() / 1000, tasas["Hombres"].to_numpy() / 1000,
+        factores[:, None] * tef, anios, tasa_migracion=migracion,
+    )
+    return a_tabla(serie, 2018, [nombre for nombre, _, _ in ESCENARIOS])
+
+
+@memoizar("poblacion.grafico_proyeccion")
+def plot_proyeccion(df_proy):
+    totales = df_proy.groupby(["Escenario", "Año"], as_index=False, sort=False)["Poblacion"].sum()
+    return (
+        alt.Chart(totales)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("Año:O", title="Año"),
+            y=alt.Y("Poblacion:Q", title="Población total", scale=alt.Scale(zero=False)),
+            color=alt.Color("Escenario:N", sort=None),
+            tooltip=["Escenario", "Año", alt.Tooltip("Poblacion:Q", format=",.0f")]
+        )
+        .properties(title="Proyección de la población de Antioquia por escenario", width=700, height=400)
+    )
+
+
+# Funciones gráficas
+@memoizar("poblacion.piramide")
+def plot_piramide(df_input, title="Pirámide Poblacional - Antioquia (2018)"):
+    # Filtrar fila "Total"
+    dfp = df_input[df_input["Edad"] != "Total"].copy()
+
+    # Hombres en negativo para que queden a la izquierda
+    dfp["% Hombres (neg)"] = -dfp["% Hombres"]
+
+    # Escalas compartidas
+    x_scale = alt.Scale(domain=[-dfp["% Hombres"].max()*1.1, dfp["% Mujeres"].max()*1.1])
+
+    # Hombres (izquierda)
+    left = alt.Chart(dfp).mark_bar(color="#1f2eb4").encode(
+        x=alt.X("% Hombres (neg):Q", scale=x_scale, title="% Hombres"),
+        y=alt.Y("Edad:O", sort=alt.SortField("Edad", order="descending")),
+        tooltip=["Edad", "% Hombres"]
+    )
+
+    # Mujeres (derecha)
+    right = alt.Chart(dfp).mark_bar(color="#eb0eff").encode(
+        x=alt.X("% Mujeres:Q", scale=x_scale, title="% Mujeres"),
+        y=alt.Y("Edad:O", sort=alt.SortField("Edad", order="descending")),
+        tooltip=["Edad", "% Mujeres"]
+    )
+
+    # Combinar
+    chart = (left + right).properties(
+        title=title,
+        width=500,
+        height=500
+    ).configure_title(
+        fontSize=16,
+        anchor="middle"
+    ).configure_axis(
+        labelFontSize=12,
+        titleFontSize=14
+    )
+
+    return chart
+
+
+@memoizar("poblacion.distribucion")
+def plot_distribucion(df_input, title="Distribución porcentual por edad (2018)"):
+    dfp = df_input[df_input["Edad"] != "Total"].copy()
+    chart = (
+        alt.Chart(dfp)
+        .mark_line(point=True, color="#009e73")
+        .encode(
+            x=alt.X("Edad:O", sort=None, title="Grupo de edad"),
+            y=alt.Y("% Total:Q", title="% del total poblacional"),
+            tooltip=["Edad", "% Total"]
+        )
+        .properties(title=title, width=520, height=300)
+    )
+    return chart
+
+
+@memoizar("poblacion.asentamiento")
+def plot_asentamiento(df_input):
+    return (
+        alt.Chart(df_input)
+        .mark_arc()
+        .encode(
+            theta=alt.Theta(field="Total", type="quantitative"),
+            color=alt.Color(field="Asentamiento", type="nominal"),
+            tooltip=["Asentamiento", "Total", "%"]
+        )
+        .properties(width=300, height=300, title="Distribución por Asentamiento (2018)")
+    )
+
+
+# -----------------------------------------------------------
+# Renderizado
+# -----------------------------------------------------------
+def render():
+    st.header("📊 Datos Demográficos - Censo 2018 (Antioquia) - Indicadores Departamentales")
+
+    # ---------------------------
+    # 1️⃣ Datos base
+    # ---------------------------
+    etapa("1️⃣ Datos base")
+    df_todos = cargar_tabla("poblacion_edad", anio=2018)
+    df_tot = df_todos[df_todos["territorio"] == "05"].drop(columns="territorio").reset_index(drop=True)
+    grupos, indices = indicadores(df_todos)
+    grupos, indices = grupos.loc["05"], indices.loc["05"]
+
+    # ---------------------------
+    # 2️⃣ Porcentajes sobre total
+    # ---------------------------
+    etapa("2️⃣ Porcentajes sobre total")
+    df_tot = porcentajes(df_tot)
+    total_pop = df_tot.loc[df_tot["Edad"] == "Total", "Total"].values[0]
+
+    # --- 3) Layout similar al estilo que tenías: dos columnas ---
+    col1, col2 = st.columns([1.6, 1])
+
+    # --------- COLUMNA IZQUIERDA: tabla + gráficos -------------
+    with col1:
+        st.subheader("📋 Cuadro de población por grupos quinquenales (2018)")
+        st.dataframe(df_tot, use_container_width=True)
+        st.markdown("---")
+
+        st.subheader("🧭 Visualizaciones")
+        st.altair_chart(plot_piramide(df_tot), use_container_width=True)
+        st.markdown("")
+        st.altair_chart(plot_distribucion(df_tot), use_container_width=True)
+
+    # --------- COLUMNA DERECHA: índices y distribución -------------
+    with col2:
+        st.subheader("📘 Resumen Poblacional (Censo 2018)")
+
+        st.metric("Población total (Censo 2018)", f"{int(total_pop):,}")
+        st.markdown(f"- Población 0–14 años: **{int(grupos['poblacion_joven']):,}**")
+        st.markdown(f"- Población 15–64 años: **{int(grupos['poblacion_activa']):,}**")
+        st.markdown(f"- Población 65 años y más: **{int(grupos['poblacion_mayor']):,}**")
+        st.markdown("---")
+
+        st.subheader("🧮 Indicadores Demográficos Oficiales (Censo 2018)")
+        st.markdown("**Superficie y densidad poblacional**")
+        st.markdown(f"- Superficie del Departamento (km²): **{SUPERFICIE_KM2:,}**".replace(",", "."))
+        st.markdown(f"- Densidad poblacional en el departamento de Antioquia años 2018: **{decimal(total_pop / SUPERFICIE_KM2, 1)} hab/km²**")
+        st.markdown("---")
+        st.markdown("**Índices de Dependencia (ET - 2018)**")
+        st.markdown(f"- Índice de dependencia total: **{decimal(indices['dependencia_total'])}**")
+        st.markdown(f"- Índice de dependencia juvenil: **{decimal(indices['dependencia_juvenil'])}**")
+        st.markdown(f"- Índice de dependencia senil: **{decimal(indices['dependencia_senil'])}**")
+        st.markdown(f"- Índice de envejecimiento: **{decimal(indices['envejecimiento'])}**")
+        st.markdown(f"- Índice de masculinidad: **{decimal(indices['masculinidad'])}**")
+        st.markdown("---")
+
+        st.subheader("🏙️ Distribución por tipo de asentamiento (2018)")
+        areas = cargar_tabla("asentamiento", anio=2018, territorio="05")
+        areas["%"] = (areas["Total"] / total_pop) * 100
+
+        st.dataframe(areas.set_index("Asentamiento").round(2))
+
+        st.altair_chart(plot_asentamiento(areas), use_container_width=True)
+
+    # Separador final fuera del bloque
+    st.markdown("---")
+
+    # ---------------------------
+    # 3️⃣ Proyección por componentes
+    # ---------------------------
+    etapa("3️⃣ Proyección por componentes")
+    st.subheader("🔮 Proyección de población por componentes (desde 2018)")
+    st.caption("Población del Censo 2018 con la mortalidad y la fecundidad de 2023. "
+               "La migración neta se aplica como una tasa anual uniforme por edad.")
+
+    anios = st.slider("Horizonte de proyección (años)", min_value=5, max_value=50, value=30, step=5)
+    df_proy = proyeccion(df_tot, cargar_tabla("tasas_mortalidad", anio=2023, territorio="05"),
+                         cargar_tabla("tef", anio=2023, territorio="05"), anios)
+
+    col1, col2 = st.columns([1.6, 1])
+    with col1:
+        st.altair_chart(plot_proyeccion(df_proy), use_container_width=True)
+    with col2:
+        final = df_proy[df_proy["Año"] == df_proy["Año"].max()]
+        resumen = final.groupby("Escenario", sort=False)["Poblacion"].sum().round().astype(int)
+        st.dataframe(resumen.rename(f"Población {2018 + anios}").to_frame(), use_container_width=True)
+
+    st.markdown("---")
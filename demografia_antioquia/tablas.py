@@ -0,0 +1,146 @@
+"""Capa de datos: tablas de indicadores en Parquet con tipos declarados.
+
+Cada tabla vive en ``datos/<nombre>.parquet`` con dos columnas de clave,
+``anio`` y ``territorio`` (código DANE del departamento o municipio, o
+``AMVA`` para el Área Metropolitana del Valle de Aburrá), seguidas de las
+columnas que muestra el dashboard. Agregar municipios o un nuevo año es
+agregar filas a estos archivos; el código de las secciones no cambia.
+
+Las tablas se leen una sola vez por proceso y se vuelven a leer solo si el
+archivo cambia en disco.
+"""
+
+import os
+import threading
+
+import pandas as pd
+
+from demografia_antioquia.geometria import RAIZ
+from demografia_antioquia.trazas import tramo
+
+DIRECTORIO_DATOS = RAIZ / "datos"
+CLAVES = {"anio": "int16", "territorio": "str"}
+
+# Columnas y tipos de cada tabla (además de CLAVES)
+ESQUEMAS = {
+    "poblacion_edad": {
+        "Edad": "str", "Total": "int64", "Hombres": "int64", "Mujeres": "int64",
+    },
+    "asentamiento": {
+        "Asentamiento": "str", "Total": "int64",
+    },
+    "mortalidad_general": {
+        "Indicador": "str", "Hombres": "float64", "Mujeres": "float64", "Total": "float64",
+    },
+    "tasas_mortalidad": {
+        "x": "str", "Hombres": "float64", "Mujeres": "float64", "Total": "float64",
+    },
+    "mortalidad_infantil": {
+        "Tabla": "str", "Indicador": "str", "Cantidad": "int64",
+    },
+    "causas_mortalidad": {
+        "Causa": "str", "Causa_corta": "str", "Total": "int64", "%": "float64", "TMxCE": "float64",
+    },
+    "nacimientos_edad_madre": {
+        "Grupos de edad": "str", "Total": "int64",
+    },
+    "tef": {
+        "Grupos de edad": "str", "TEF": "float64",
+    },
+    "poblacion_mujeres": {
+        "Grupos de edad": "str", "30.06.2023": "int64", "Marca de Clase": "float64", "nLx": "float64",
+    },
+    "nacimientos_ninas": {
+        "Grupos de edad": "str", "Población/Nacimientos": "int64", "TEFm": "float64",
+    },
+    "tnr": {
+        "Grupos de edad": "str", "TNR": "float64",
+    },
+    "migracion": {
+        "Municipio": "str", "Poblacion_2020": "int64", "Poblacion_2015": "int64",
+        "No_migrantes": "int64", "Inmigrantes": "int64", "Emigrantes": "int64",
+        "Migracion_Neta": "int64", "Migracion_Bruta": "int64", "Poblacion_Media": "float64",
+        "Tasa_Inmigracion": "float64", "Tasa_Emigracion": "float64",
+        "Tasa_migracion": "float64", "Indice_Eficacia_Migratoria": "float64",
+    },
+    "masculinidad_migracion": {
+        "Municipio": "str", "Total_AM": "float64", "Factual": "float64",
+        "ContraFactual": "float64", "No_migrantes": "float64",
+        "Efecto_absoluto_migracion_Neta": "float64", "Efecto_Relativo_migracion_Neta": "float64",
+        "Diferencia_Relativa_Inmigracion": "float64", "Diferencia_Relativa_Emigracion": "float64",
+    },
+}
+
+
+def ruta_tabla(nombre):
+    if nombre not in ESQUEMAS:
+        raise KeyError(f"Tabla desconocida: {nombre!r}")
+    return DIRECTORIO_DATOS / f"{nombre}.parquet"
+
+
+def aplicar_esquema(nombre, datos):
+    """Ordena y convierte las columnas de ``datos`` según el esquema de la tabla."""
+    esquema = {**CLAVES, **ESQUEMAS[nombre]}
+    faltantes = [c for c in esquema if c not in datos.columns]
+    if faltantes:
+        raise ValueError(f"A la tabla {nombre!r} le faltan columnas: {faltantes}")
+    return datos[list(esquema)].astype(esquema)
+
+
+def guardar_tabla(nombre, datos):
+    """Escribe ``datos`` en ``datos/<nombre>.parquet`` con los tipos del esquema."""
+    DIRECTORIO_DATOS.mkdir(exist_ok=True)
+    aplicar_esquema(nombre, datos).to_parquet(ruta_tabla(nombre), index=False)
+
+
+def reemplazar_filas(nombre, datos, claves=None):
+    """Reemplaza en la tabla las filas de los pares (año, territorio) que trae ``datos``.
+
+    ``claves`` (DataFrame con ``anio`` y ``territorio``) amplía los pares a
+    borrar, para quitar territorios que ya no tienen datos. Las demás filas se
+    conservan; si la tabla no existe se crea.
+    """
+    datos = aplicar_esquema(nombre, datos)
+    if claves is None:
+        claves = datos[list(CLAVES)]
+    ruta = ruta_tabla(nombre)
+    if ruta.exists():
+        actual = aplicar_esquema(nombre, pd.read_parquet(ruta))
+        claves = pd.MultiIndex.from_frame(claves[list(CLAVES)].astype(CLAVES).drop_duplicates())
+        conservar = ~pd.MultiIndex.from_frame(actual[list(CLAVES)]).isin(claves)
+        datos = pd.concat([actual[conservar], datos], ignore_index=True)
+    guardar_tabla(nombre, datos)
+
+
+# -----------------------------------------------------------
+# Carga con caché por proceso
+# -----------------------------------------------------------
+_cache = {}
+_lock = threading.Lock()
+
+
+def _leer(nombre):
+    ruta = ruta_tabla(nombre)
+    firma = os.stat(ruta).st_mtime_ns
+    with _lock:
+        if nombre in _cache and _cache[nombre][0] == firma:
+            return _cache[nombre][1]
+        with tramo("tablas.leer", tabla=nombre):
+            datos = aplicar_esquema(nombre, pd.read_parquet(ruta))
+        _cache[nombre] = (firma, datos)
+        return datos
+
+
+def cargar_tabla(nombre, anio=None, territorio=None):
+    """Tabla ``nombre`` filtrada por año y territorio.
+
+    Las columnas de clave por las que se filtra se eliminan, de modo que el
+    resultado tiene exactamente las columnas que muestra la sección.
+    """
+    datos = _leer(nombre)
+    filtros = {"anio": anio, "territorio": territorio}
+    for columna, valor in filtros.items():
+        if valor is not None:
+            datos = datos[datos[columna] == valor]
+    descartar = [c for c, v in filtros.items() if v is not None]
+    return datos.drop(columns=descartar).reset_index(drop=True)
@@ -0,0 +1,141 @@
+"""Tablas de vida por lotes a partir de tasas específicas de mortalidad.
+
+Las funciones trabajan sobre arreglos cuyo último eje es la edad y cuyos ejes
+anteriores son cualquier combinación de territorios, sexos o años (por ejemplo
+un cubo ``territorio × sexo × edad``). Todas las tablas del lote se calculan a
+la vez con operaciones vectorizadas de NumPy: mx → qx → lx → dx → Lx → Tx → ex.
+
+Sirve igual para tablas abreviadas (grupos 0, 1, 2-4, 5-9, ...) que para
+tablas por edad simple; solo cambia el vector de edades de inicio.
+"""
+
+import numpy as np
+import pandas as pd
+
+from demografia_antioquia.indicadores import RAIZ_TABLA_VIDA, matriz_por_grupo
+
+# Grupos de la tabla ``tasas_mortalidad`` y edad de inicio de cada uno
+GRUPOS_ABREVIADOS = [
+    "0", "1", "2-4", "5-9", "10-14", "15-19", "20-24", "25-29", "30-34",
+    "35-39", "40-44", "45-49", "50-54", "55-59", "60-64", "65-69", "70-74",
+    "75-79", "80-84", "85 y más",
+]
+EDADES_ABREVIADAS = np.array([0, 1, 2, *range(5, 90, 5)])
+
+SEXOS = ["Hombres", "Mujeres", "Total"]
+COLUMNAS = ["nmx", "nax", "nqx", "lx", "ndx", "nLx", "Tx", "ex"]
+
+# Coale y Demeny: a0 = a + b·m0 si m0 < 0.107, si no a0 = c
+_COEF_A0 = {
+    "Hombres": (0.045, 2.684, 0.330),
+    "Mujeres": (0.053, 2.800, 0.350),
+    "Total": (0.049, 2.742, 0.340),
+}
+
+
+# -----------------------------------------------------------
+# Separación de las defunciones
+# -----------------------------------------------------------
+def a0_coale_demeny(m0, sexo="Total"):
+    """Años vividos en promedio por quienes mueren antes del primer cumpleaños.
+
+    ``sexo`` puede ser un texto o un arreglo de textos que se difunde contra
+    ``m0`` (``"Hombres"``, ``"Mujeres"`` o ``"Total"``).
+    """
+    m0 = np.asarray(m0, dtype=float)
+    sexo = np.asarray(sexo)
+    nombres = list(_COEF_A0)
+    coef = np.array([_COEF_A0[s] for s in nombres])
+    fila = np.select([sexo == s for s in nombres], range(len(nombres)),
+                     default=nombres.index("Total"))
+    a, b, c = coef[fila, 0], coef[fila, 1], coef[fila, 2]
+    return np.where(m0 < 0.107, a + b * m0, c)
+
+
+def amplitudes(edades):
+    """Amplitud de cada grupo; el último (abierto) queda en ``inf``."""
+    edades = np.asarray(edades, dtype=float)
+    return np.append(np.diff(edades), np.inf)
+
+
+# -----------------------------------------------------------
+# Tabla de vida
+# -----------------------------------------------------------
+def tabla_vida(mx, edades=EDADES_ABREVIADAS, ax=None, sexo="Total", raiz=RAIZ_TABLA_VIDA):
+    """Funciones de la tabla de vida para un lote de tasas ``mx`` (por persona-año).
+
+    ``mx`` tiene forma ``(..., edades)``. ``ax`` por defecto es la mitad del
+    intervalo, salvo en el primer año de vida (Coale-Demeny según ``sexo``,
+    que se difunde contra ``mx[..., 0]``). El último grupo es abierto:
+    ``qx = 1`` y ``Lx = lx / mx``.
+
+    Devuelve un diccionario con ``nmx, nax, nqx, lx, ndx, nLx, Tx, ex``, cada
+    uno con la misma forma que ``mx``.
+    """
+    mx = np.asarray(mx, dtype=float)
+    n = amplitudes(edades)
+    if ax is None:
+        ax = np.broadcast_to(np.where(np.isfinite(n), n / 2, 0.0), mx.shape).copy()
+        if n[0] == 1:
+            ax[..., 0] = a0_coale_demeny(mx[..., 0], sexo)
+    ax = np.broadcast_to(np.asarray(ax, dtype=float), mx.shape)
+
+    cerrados = n[:-1]
+    qx = np.empty_like(mx)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        qx[..., :-1] = cerrados * mx[..., :-1] / (1 + (cerrados - ax[..., :-1]) * mx[..., :-1])
+    qx[..., :-1] = np.clip(qx[..., :-1], 0.0, 1.0)
+    qx[..., -1] = 1.0
+
+    supervivencia = np.cumprod(1 - qx, axis=-1)
+    lx = raiz * np.concatenate([np.ones_like(qx[..., :1]), supervivencia[..., :-1]], axis=-1)
+    dx = lx * qx
+
+    Lx = np.empty_like(mx)
+    Lx[..., :-1] = cerrados * lx[..., 1:] + ax[..., :-1] * dx[..., :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Lx[..., -1] = np.where(mx[..., -1] > 0, lx[..., -1] / mx[..., -1], 0.0)
+    # En el grupo abierto ax es la esperanza de vida restante
+    ax = ax.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ax[..., -1] = np.where(lx[..., -1] > 0, Lx[..., -1] / lx[..., -1], np.nan)
+
+    Tx = np.flip(np.cumsum(np.flip(Lx, axis=-1), axis=-1), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ex = np.where(lx > 0, Tx / lx, np.nan)
+
+    return {"nmx": mx, "nax": ax, "nqx": qx, "lx": lx, "ndx": dx, "nLx": Lx, "Tx": Tx, "ex": ex}
+
+
+def tabla_vida_edad_simple(mx, sexo="Total", raiz=RAIZ_TABLA_VIDA):
+    """Tabla de vida completa: ``mx[..., x]`` es la tasa a la edad ``x`` (0, 1, 2, ...)."""
+    mx = np.asarray(mx, dtype=float)
+    return tabla_vida(mx, edades=np.arange(mx.shape[-1]), sexo=sexo, raiz=raiz)
+
+
+# -----------------------------------------------------------
+# Desde las tablas del dashboard
+# -----------------------------------------------------------
+def tablas_vida_por_territorio(datos, sexos=SEXOS, grupos=GRUPOS_ABREVIADOS,
+                               edades=EDADES_ABREVIADAS, por=1000,
+                               grupo="x", territorio="territorio"):
+    """Tablas de vida de todos los territorios y sexos de ``tasas_mortalidad``.
+
+    Arma el cubo ``territorio × sexo × edad`` (las tasas vienen por ``por``
+    habitantes), lo resuelve de una sola vez y devuelve una tabla larga con
+    columnas ``territorio``, ``Sexo``, ``x`` y las funciones de :data:`COLUMNAS`.
+    """
+    matrices = [matriz_por_grupo(datos, s, grupos, grupo, territorio) for s in sexos]
+    indice = matrices[0][0]
+    cubo = np.stack([m for _, m in matrices], axis=1) / por
+    tabla = tabla_vida(cubo, edades=edades, sexo=np.asarray(sexos))
+
+    forma = cubo.shape
+    largo = pd.DataFrame({
+        territorio: np.repeat(np.asarray(indice), forma[1] * forma[2]),
+        "Sexo": np.tile(np.repeat(sexos, forma[2]), forma[0]),
+        grupo: np.tile(grupos, forma[0] * forma[1]),
+    })
+    for columna in COLUMNAS:
+        largo[columna] = tabla[columna].reshape(-1)
+    return largo
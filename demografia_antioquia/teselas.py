@@ -0,0 +1,552 @@
+"""Teselas vectoriales (Mapbox Vector Tiles) de la capa municipal en un MBTiles.
+
+Con una sola capa GeoJSON/TopoJSON en la página, el navegador recibe toda la
+geometría aunque solo mire un municipio. Si más adelante se dibujan veredas o
+sectores urbanos, ese tamaño crece sin control. Aquí la capa de municipios,
+con las columnas de indicadores que se le unan, se corta en teselas MVT
+(protocolo v2) en proyección Web Mercator y se guarda en un archivo MBTiles
+(SQLite). El navegador pide solo las teselas visibles, con el detalle que
+corresponde a su zoom.
+
+La geometría de cada zoom sale del nivel de detalle de
+:mod:`demografia_antioquia.topologia`. Como ese nivel se simplifica sobre
+arcos compartidos, las fronteras de municipios vecinos coinciden en cada
+tesela.
+
+El navegador pide las teselas a una URL que debe poder alcanzar desde fuera
+del servidor (ver :func:`url_teselas`). Por defecto se copian del MBTiles a
+``static/teselas/{z}/{x}/{y}.pbf`` y Streamlit las sirve en
+``/app/static/teselas/`` (``server.enableStaticServing`` en
+``.streamlit/config.toml``), detrás del mismo proxy que el dashboard. Si
+``DEMOGRAFIA_URL_TESELAS`` define una URL base pública, se usa esa, por
+ejemplo la de ``teselas servir`` publicado detrás de un proxy o una CDN.
+
+Las teselas se cortan antes de que alguien las pida: con ``teselas preparar``
+al desplegar o, si faltan o están desactualizadas, en un hilo en segundo plano
+(:func:`teselas_listas`); mientras tanto la sección muestra el mapa GeoJSON.
+
+Uso::
+
+    python -m demografia_antioquia.teselas preparar
+    python -m demografia_antioquia.teselas exportar --tabla migracion --columnas Tasa_migracion
+    python -m demografia_antioquia.teselas servir datos/teselas/municipios.mbtiles --host 0.0.0.0 --puerto 8765
+"""
+
+import argparse
+import gzip
+import json
+import math
+import os
+import shutil
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from demografia_antioquia.geometria import RAIZ
+from demografia_antioquia.tablas import DIRECTORIO_DATOS
+
+DIRECTORIO_TESELAS = DIRECTORIO_DATOS / "teselas"
+RUTA_MBTILES = DIRECTORIO_TESELAS / "municipios.mbtiles"
+# Streamlit sirve static/ (junto a demografia.py) en /app/static/
+DIRECTORIO_ESTATICO = RAIZ / "static" / "teselas"
+RUTA_ESTATICA = "app/static/teselas"
+CAPA = "municipios"
+EXTENSION = 4096
+# Margen alrededor de cada tesela (en unidades de la tesela) para que los
+# bordes de los polígonos no se vean cortados al dibujarlos
+MARGEN = 64
+ZOOM_MIN = 6
+ZOOM_MAX = 12
+RADIO_TIERRA = 6378137.0
+LIMITE_MERCATOR = math.pi * RADIO_TIERRA
+
+
+# -----------------------------------------------------------
+# Codificación protobuf (vector_tile.proto, versión 2)
+# -----------------------------------------------------------
+def _varint(valor):
+    salida = bytearray()
+    while True:
+        byte = valor & 0x7F
+        valor >>= 7
+        if valor:
+            salida.append(byte | 0x80)
+        else:
+            salida.append(byte)
+            return bytes(salida)
+
+
+def _clave(campo, tipo):
+    return _varint((campo << 3) | tipo)
+
+
+def _bytes(campo, contenido):
+    return _clave(campo, 2) + _varint(len(contenido)) + contenido
+
+
+def _empacados(campo, enteros):
+    return _bytes(campo, b"".join(_varint(int(v)) for v in enteros))
+
+
+def _valor(valor):
+    # Mensaje Value: cadenas, enteros con signo o dobles
+    if isinstance(valor, str):
+        return _bytes(1, valor.encode("utf-8"))
+    if isinstance(valor, (bool, np.bool_)):
+        return _clave(7, 0) + _varint(int(valor))
+    if isinstance(valor, (int, np.integer)):
+        return _clave(6, 0) + _varint(_zigzag(int(valor)))
+    return _clave(3, 1) + np.float64(valor).tobytes()
+
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def _comandos_anillo(puntos, cursor):
+    # MoveTo(1) al primer punto, LineTo(n-1) al resto y ClosePath
+    deltas = np.diff(np.vstack([cursor, puntos]), axis=0)
+    zigzag = (deltas << 1) ^ (deltas >> 63)
+    comandos = [(1 << 3) | 1, *zigzag[0].tolist(), ((len(puntos) - 1) << 3) | 2]
+    comandos.extend(zigzag[1:].ravel().tolist())
+    comandos.append((1 << 3) | 7)
+    return comandos, puntos[-1]
+
+
+def _anillo_tesela(coords, exterior):
+    # Enteros sin repetidos ni cierre; exterior en sentido horario (con y hacia abajo)
+    p = np.round(np.asarray(coords)[:-1, :2]).astype(np.int64)
+    conservar = np.ones(len(p), dtype=bool)
+    conservar[1:] = np.any(p[1:] != p[:-1], axis=1)
+    p = p[conservar]
+    if len(p) > 1 and (p[0] == p[-1]).all():
+        p = p[:-1]
+    if len(p) < 3:
+        return None
+    x, y = p[:, 0], p[:, 1]
+    area = np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+    if area == 0:
+        return None
+    if (area > 0) != exterior:
+        p = p[::-1]
+    return p
+
+
+def geometria_mvt(geometria):
+    """Comandos MVT de un polígono o multipolígono ya en coordenadas de tesela."""
+    comandos = []
+    cursor = np.zeros(2, dtype=np.int64)
+    partes = [geometria] if geometria.geom_type == "Polygon" else list(getattr(geometria, "geoms", []))
+    for poligono in partes:
+        if poligono.geom_type != "Polygon" or poligono.is_empty:
+            continue
+        exterior = _anillo_tesela(poligono.exterior.coords, True)
+        if exterior is None:
+            continue
+        anillos = [exterior] + [a for a in (_anillo_tesela(h.coords, False) for h in poligono.interiors)
+                                if a is not None]
+        for anillo in anillos:
+            nuevos, cursor = _comandos_anillo(anillo, cursor)
+            comandos.extend(nuevos)
+    return comandos
+
+
+def codificar_tesela(elementos, capa=CAPA, extension=EXTENSION):
+    """Bytes de una tesela con una capa; ``elementos`` son pares (geometría, propiedades)."""
+    claves, valores = {}, {}
+    features = []
+    for identificador, (geometria, propiedades) in enumerate(elementos, start=1):
+        comandos = geometria_mvt(geometria)
+        if not comandos:
+            continue
+        etiquetas = []
+        for k, v in propiedades.items():
+            if v is None or (isinstance(v, float) and math.isnan(v)):
+                continue
+            etiquetas.append(claves.setdefault(k, len(claves)))
+            etiquetas.append(valores.setdefault((type(v).__name__, v), len(valores)))
+        features.append(
+            _clave(1, 0) + _varint(identificador)
+            + _empacados(2, etiquetas)
+            + _clave(3, 0) + _varint(3)  # POLYGON
+            + _empacados(4, comandos)
+        )
+    if not features:
+        return b""
+    contenido = (
+        _clave(15, 0) + _varint(2)
+        + _bytes(1, capa.encode("utf-8"))
+        + b"".join(_bytes(2, f) for f in features)
+        + b"".join(_bytes(3, k.encode("utf-8")) for k in claves)
+        + b"".join(_bytes(4, _valor(v)) for _, v in valores)
+        + _clave(5, 0) + _varint(extension)
+    )
+    return _bytes(3, contenido)
+
+
+# -----------------------------------------------------------
+# Corte en teselas
+# -----------------------------------------------------------
+def a_mercator(lon, lat):
+    lon = np.asarray(lon, dtype=float)
+    lat = np.clip(np.asarray(lat, dtype=float), -85.0511, 85.0511)
+    x = np.radians(lon) * RADIO_TIERRA
+    y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * RADIO_TIERRA
+    return x, y
+
+
+def rango_teselas(bbox, zoom):
+    """Columnas y filas (x, y en esquema XYZ) de las teselas que cubren ``bbox`` (lon/lat)."""
+    n = 2 ** zoom
+    x0, y0 = a_mercator(bbox[0], bbox[3])
+    x1, y1 = a_mercator(bbox[2], bbox[1])
+    lado = 2 * LIMITE_MERCATOR / n
+    columnas = range(int((x0 + LIMITE_MERCATOR) // lado), int((x1 + LIMITE_MERCATOR) // lado) + 1)
+    filas = range(int((LIMITE_MERCATOR - y0) // lado), int((LIMITE_MERCATOR - y1) // lado) + 1)
+    return columnas, filas
+
+
+def _geometrias_mercator(topo, zoom):
+    import shapely
+
+    from demografia_antioquia.topologia import a_geometrias, nivel_zoom, simplificar
+
+    if "niveles" in topo:
+        topo = simplificar(topo, nivel_zoom(zoom, topo["niveles"]["zooms"]))
+    geometrias, propiedades = a_geometrias(topo)
+    geometrias = shapely.transform(np.asarray(geometrias, dtype=object),
+                                   lambda c: np.column_stack(a_mercator(c[:, 0], c[:, 1])))
+    return geometrias, propiedades
+
+
+def generar_teselas(topo, atributos, zooms=range(ZOOM_MIN, ZOOM_MAX + 1)):
+    """Genera ``(z, x, y, bytes)`` para cada tesela no vacía.
+
+    ``atributos`` es una lista de diccionarios de propiedades, en el orden de
+    las geometrías de ``topo``.
+    """
+    import shapely
+
+    for zoom in zooms:
+        geometrias, _ = _geometrias_mercator(topo, zoom)
+        arbol = shapely.STRtree(geometrias)
+        lado = 2 * LIMITE_MERCATOR / 2 ** zoom
+        margen = lado * MARGEN / EXTENSION
+        columnas, filas = rango_teselas(topo["bbox"], zoom)
+        for x in columnas:
+            for y in filas:
+                izq = -LIMITE_MERCATOR + x * lado
+                arriba = LIMITE_MERCATOR - y * lado
+                caja = (izq - margen, arriba - lado - margen, izq + lado + margen, arriba + margen)
+                indices = arbol.query(shapely.box(*caja), predicate="intersects")
+                if not len(indices):
+                    continue
+                escala = EXTENSION / lado
+                recortes = shapely.clip_by_rect(geometrias[np.sort(indices)], *caja)
+                recortes = shapely.transform(
+                    recortes, lambda c: np.column_stack([(c[:, 0] - izq) * escala, (arriba - c[:, 1]) * escala]))
+                datos = codificar_tesela([(g, atributos[i]) for g, i in zip(recortes, np.sort(indices))])
+                if datos:
+                    yield zoom, x, y, datos
+
+
+def atributos_capa(topo, datos=None, clave="mpio_cdpmp", clave_datos=None, columnas=()):
+    """Propiedades de cada municipio: las del TopoJSON más ``columnas`` de ``datos``."""
+    clave_datos = clave_datos or clave
+    propiedades = [dict(g.get("properties", {})) for g in topo["objects"]["municipios"]["geometries"]]
+    if datos is not None and len(columnas):
+        registros = datos.set_index(datos[clave_datos].astype(str))[list(columnas)]
+        registros = registros[~registros.index.duplicated()].to_dict(orient="index")
+        for p in propiedades:
+            for k, v in registros.get(str(p.get(clave)), {}).items():
+                p[k] = v.item() if hasattr(v, "item") else v
+    return propiedades
+
+
+# -----------------------------------------------------------
+# MBTiles
+# -----------------------------------------------------------
+def exportar_mbtiles(ruta=RUTA_MBTILES, datos=None, columnas=(), clave_datos="mpio_cdpmp",
+                     zooms=range(ZOOM_MIN, ZOOM_MAX + 1), huella=None):
+    """Escribe el MBTiles de la capa municipal con ``columnas`` de ``datos`` unidas.
+
+    El archivo se escribe aparte y se renombra al terminar, de modo que un
+    servidor que lo esté leyendo nunca ve un archivo a medias. Devuelve el
+    número de teselas escritas.
+    """
+    from demografia_antioquia.topologia import cargar_topojson
+
+    topo = cargar_topojson(niveles=True)
+    atributos = atributos_capa(topo, datos, clave_datos=clave_datos, columnas=columnas)
+    zooms = list(zooms)
+    ruta = os.fspath(ruta)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = ruta + ".tmp"
+    if os.path.exists(temporal):
+        os.remove(temporal)
+    conexion = sqlite3.connect(temporal)
+    try:
+        conexion.executescript("""
+            CREATE TABLE metadata (name TEXT, value TEXT);
+            CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB);
+            CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row);
+        """)
+        n = 0
+        for z, x, y, contenido in generar_teselas(topo, atributos, zooms):
+            # MBTiles usa filas TMS (origen abajo)
+            conexion.execute("INSERT INTO tiles VALUES (?, ?, ?, ?)",
+                             (z, x, 2 ** z - 1 - y, gzip.compress(contenido)))
+            n += 1
+        x0, y0, x1, y1 = topo["bbox"]
+        campos = {k: "Number" if isinstance(v, (int, float)) else "String"
+                  for a in atributos for k, v in a.items()}
+        metadatos = {
+            "name": CAPA,
+            "format": "pbf",
+            "bounds": f"{x0},{y0},{x1},{y1}",
+            "center": f"{(x0 + x1) / 2},{(y0 + y1) / 2},{zooms[0]}",
+            "minzoom": str(zooms[0]),
+            "maxzoom": str(zooms[-1]),
+            "json": json.dumps({"vector_layers": [{
+                "id": CAPA, "fields": campos, "minzoom": zooms[0], "maxzoom": zooms[-1],
+            }]}, ensure_ascii=False),
+            "huella": huella or "",
+        }
+        conexion.executemany("INSERT INTO metadata VALUES (?, ?)", metadatos.items())
+        conexion.commit()
+    finally:
+        conexion.close()
+    os.replace(temporal, ruta)
+    return n
+
+
+def metadatos_mbtiles(ruta=RUTA_MBTILES):
+    """Tabla ``metadata`` del MBTiles como diccionario (vacío si no existe)."""
+    if not os.path.exists(ruta):
+        return {}
+    with sqlite3.connect(f"file:{os.fspath(ruta)}?mode=ro", uri=True) as conexion:
+        return dict(conexion.execute("SELECT name, value FROM metadata"))
+
+
+def firma_teselas(datos, columnas, clave_datos="mpio_cdpmp"):
+    """Huella de los datos, la geometría y los zooms con que se cortan las teselas."""
+    from demografia_antioquia.memo import huella
+    from demografia_antioquia.topologia import huella_fuente
+
+    return huella(datos[[clave_datos, *columnas]], huella_fuente(), ZOOM_MIN, ZOOM_MAX)
+
+
+def asegurar_mbtiles(datos, columnas, ruta=RUTA_MBTILES, clave_datos="mpio_cdpmp"):
+    """Exporta el MBTiles solo si no existe o si cambiaron los datos o la geometría."""
+    firma = firma_teselas(datos, columnas, clave_datos)
+    with _lock:
+        if metadatos_mbtiles(ruta).get("huella") != firma:
+            exportar_mbtiles(ruta, datos, columnas, clave_datos, huella=firma)
+    return ruta
+
+
+# -----------------------------------------------------------
+# Teselas estáticas para el navegador
+# -----------------------------------------------------------
+def metadatos_directorio(directorio=DIRECTORIO_ESTATICO):
+    """``metadata.json`` de un directorio de teselas (vacío si no existe)."""
+    ruta = os.path.join(directorio, "metadata.json")
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def exportar_directorio(ruta=RUTA_MBTILES, directorio=DIRECTORIO_ESTATICO):
+    """Copia las teselas del MBTiles a ``directorio/{z}/{x}/{y}.pbf``, sin comprimir.
+
+    Los servidores de archivos estáticos no envían ``Content-Encoding: gzip``,
+    así que cada tesela se guarda descomprimida. Los metadatos del MBTiles
+    (incluida su huella) quedan en ``metadata.json``. Como en
+    :func:`exportar_mbtiles`, se escribe en un directorio aparte que reemplaza
+    al anterior al terminar. Devuelve el número de teselas copiadas.
+    """
+    directorio = os.fspath(directorio)
+    temporal, anterior = directorio + ".tmp", directorio + ".old"
+    for resto in (temporal, anterior):
+        shutil.rmtree(resto, ignore_errors=True)
+    n = 0
+    with sqlite3.connect(f"file:{os.fspath(ruta)}?mode=ro", uri=True) as conexion:
+        for z, x, fila, contenido in conexion.execute(
+                "SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles"):
+            carpeta = os.path.join(temporal, str(z), str(x))
+            os.makedirs(carpeta, exist_ok=True)
+            with open(os.path.join(carpeta, f"{2 ** z - 1 - fila}.pbf"), "wb") as archivo:
+                archivo.write(gzip.decompress(contenido))
+            n += 1
+    os.makedirs(temporal, exist_ok=True)
+    with open(os.path.join(temporal, "metadata.json"), "w", encoding="utf-8") as archivo:
+        json.dump(metadatos_mbtiles(ruta), archivo, ensure_ascii=False)
+    if os.path.exists(directorio):
+        os.replace(directorio, anterior)
+    os.replace(temporal, directorio)
+    shutil.rmtree(anterior, ignore_errors=True)
+    return n
+
+
+def preparar_teselas(datos, columnas, clave_datos="mpio_cdpmp", ruta=RUTA_MBTILES,
+                     directorio=DIRECTORIO_ESTATICO):
+    """Deja al día el MBTiles y su copia estática; solo corta lo que haya cambiado."""
+    asegurar_mbtiles(datos, columnas, ruta, clave_datos)
+    if metadatos_directorio(directorio).get("huella") != metadatos_mbtiles(ruta).get("huella"):
+        exportar_directorio(ruta, directorio)
+
+
+_preparacion = None
+_lock_preparacion = threading.Lock()
+
+
+def teselas_listas(datos, columnas, clave_datos="mpio_cdpmp", directorio=DIRECTORIO_ESTATICO):
+    """``True`` si las teselas publicadas corresponden a ``datos``.
+
+    Si faltan o están desactualizadas, lanza :func:`preparar_teselas` en un
+    hilo en segundo plano (uno a la vez) y devuelve ``False``: las teselas
+    nunca se cortan dentro de la petición de un usuario.
+    """
+    global _preparacion
+    if metadatos_directorio(directorio).get("huella") == firma_teselas(datos, columnas, clave_datos):
+        return True
+    with _lock_preparacion:
+        if _preparacion is None or not _preparacion.is_alive():
+            _preparacion = threading.Thread(
+                target=preparar_teselas, args=(datos, columnas, clave_datos),
+                kwargs={"directorio": directorio}, name="teselas-preparar", daemon=True)
+            _preparacion.start()
+    return False
+
+
+def url_teselas():
+    """Plantilla ``.../{z}/{x}/{y}.pbf`` con que el navegador pide las teselas.
+
+    ``DEMOGRAFIA_URL_TESELAS`` es la URL base pública de las teselas (por
+    ejemplo ``https://mapas.ejemplo.org/teselas``). Sin ella se usa la ruta
+    de archivos estáticos de Streamlit, relativa a la raíz del dashboard, de
+    modo que funciona desde cualquier navegador que alcance el dashboard.
+    """
+    base = os.environ.get("DEMOGRAFIA_URL_TESELAS")
+    if not base:
+        import streamlit as st
+
+        prefijo = (st.get_option("server.baseUrlPath") or "").strip("/")
+        base = "/" + "/".join(p for p in (prefijo, RUTA_ESTATICA) if p)
+    return base.rstrip("/") + "/{z}/{x}/{y}.pbf"
+
+
+# -----------------------------------------------------------
+# Servidor local
+# -----------------------------------------------------------
+class _Manejador(BaseHTTPRequestHandler):
+    ruta = None
+
+    def do_GET(self):
+        partes = self.path.split("?")[0].strip("/").split("/")
+        try:
+            z, x, y = int(partes[0]), int(partes[1]), int(partes[2].split(".")[0])
+        except (IndexError, ValueError):
+            self.send_error(404)
+            return
+        # Una conexión de solo lectura por petición: SQLite no comparte conexiones entre hilos
+        with sqlite3.connect(f"file:{self.ruta}?mode=ro", uri=True) as conexion:
+            fila = conexion.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, 2 ** z - 1 - y),
+            ).fetchone()
+        if fila is None:
+            self.send_response(204)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-protobuf")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(fila[0])))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(fila[0])
+
+    def log_message(self, formato, *args):
+        pass
+
+
+_servidores = {}
+_lock = threading.Lock()
+
+
+def servir_teselas(ruta=RUTA_MBTILES, host="127.0.0.1", puerto=0):
+    """Sirve ``ruta`` en ``http://host:puerto/{z}/{x}/{y}.pbf`` desde un hilo del proceso.
+
+    Hay un solo servidor por archivo y proceso; ``puerto=0`` elige uno libre.
+    Devuelve la plantilla de URL local del servidor. Para que el navegador la
+    alcance desde otro equipo, publíquela detrás de un proxy y defina
+    ``DEMOGRAFIA_URL_TESELAS`` (ver :func:`url_teselas`).
+    """
+    ruta = os.path.abspath(ruta)
+    with _lock:
+        if ruta not in _servidores:
+            manejador = type("Manejador", (_Manejador,), {"ruta": ruta})
+            servidor = ThreadingHTTPServer((host, puerto), manejador)
+            servidor.daemon_threads = True
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+            _servidores[ruta] = servidor
+        host, puerto = _servidores[ruta].server_address[:2]
+    return f"http://{host}:{puerto}/{{z}}/{{x}}/{{y}}.pbf"
+
+
+# -----------------------------------------------------------
+# Línea de comandos
+# -----------------------------------------------------------
+def main(argv=None):
+    import time
+
+    parser = argparse.ArgumentParser(description="Teselas vectoriales de los municipios de Antioquia.")
+    ordenes = parser.add_subparsers(dest="orden", required=True)
+    ordenes.add_parser("preparar", help="corta las teselas del mapa de migración y su copia estática")
+    exportar = ordenes.add_parser("exportar", help="corta la capa en un MBTiles")
+    exportar.add_argument("--tabla", help="tabla de indicadores con columna Municipio")
+    exportar.add_argument("--columnas", nargs="*", default=[])
+    exportar.add_argument("--zoom-min", type=int, default=ZOOM_MIN)
+    exportar.add_argument("--zoom-max", type=int, default=ZOOM_MAX)
+    exportar.add_argument("-o", "--salida", default=str(RUTA_MBTILES))
+    servir = ordenes.add_parser("servir", help="sirve un MBTiles por HTTP")
+    servir.add_argument("ruta", nargs="?", default=str(RUTA_MBTILES))
+    servir.add_argument("--host", default="127.0.0.1")
+    servir.add_argument("--puerto", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    if args.orden == "preparar":
+        from demografia_antioquia.secciones.migracion import datos_teselas
+
+        inicio = time.perf_counter()
+        preparar_teselas(*datos_teselas())
+        print(f"{RUTA_MBTILES} y {DIRECTORIO_ESTATICO} al día en {time.perf_counter() - inicio:.2f} s")
+    elif args.orden == "exportar":
+        datos = None
+        if args.tabla:
+            from demografia_antioquia.municipios import registro_municipios
+            from demografia_antioquia.tablas import cargar_tabla
+
+            datos, _ = registro_municipios().unir(cargar_tabla(args.tabla), "Municipio")
+        inicio = time.perf_counter()
+        n = exportar_mbtiles(args.salida, datos, args.columnas,
+                             zooms=range(args.zoom_min, args.zoom_max + 1))
+        print(f"{args.salida}: {n} teselas, {os.path.getsize(args.salida):,} bytes "
+              f"en {time.perf_counter() - inicio:.2f} s")
+    else:
+        url = servir_teselas(args.ruta, args.host, args.puerto)
+        print(f"Sirviendo {args.ruta} en {url} (Ctrl+C para salir)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
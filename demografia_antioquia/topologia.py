@@ -0,0 +1,351 @@
+"""Artefacto TopoJSON cuantizado de los municipios de Antioquia.
+
+Los polígonos de municipios vecinos comparten sus fronteras. En lugar de
+serializar cada polígono con coordenadas de precisión completa, este módulo
+cuantiza las coordenadas a una rejilla entera, parte los anillos en arcos en
+los puntos de unión y guarda cada arco compartido una sola vez, codificado por
+diferencias (formato TopoJSON). El artefacto se construye una vez con::
+
+    python -m demografia_antioquia.topologia --cuantizacion 100000
+
+y el código de los mapas lo carga directamente.
+
+Para dibujar con nivel de detalle según el zoom, cada vértice de cada arco
+recibe además el primer nivel de simplificación que lo conserva (ver
+:func:`niveles_detalle`). Como la simplificación se hace sobre los arcos
+compartidos, dos municipios vecinos siempre ven la misma frontera en
+cualquier nivel, sin huecos ni traslapes.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from demografia_antioquia.geometria import RAIZ, RUTA_SHP, cargar_antioquia
+from demografia_antioquia.trazas import trazar
+
+RUTA_TOPOJSON = RAIZ / "antioquia_simplificado.topojson"
+OBJETO = "municipios"
+PROPIEDADES = ["mpio_cdpmp", "mpio_cnmbr", "mpio_norm"]
+CUANTIZACION = 100000
+# Zoom de Leaflet para el que se calcula cada nivel de detalle (tolerancia de
+# medio píxel); desde el último nivel se dibujan todos los vértices
+ZOOMS_DETALLE = (7, 8, 9, 10)
+
+
+# -----------------------------------------------------------
+# Codificación
+# -----------------------------------------------------------
+def _anillos(geometria):
+    # Lista de polígonos, cada uno como lista de anillos (exterior + huecos)
+    if geometria.geom_type == "Polygon":
+        poligonos = [geometria]
+    elif geometria.geom_type == "MultiPolygon":
+        poligonos = list(geometria.geoms)
+    else:
+        raise ValueError(f"Geometría no soportada: {geometria.geom_type}")
+    return [
+        [np.asarray(p.exterior.coords)[:, :2]] + [np.asarray(h.coords)[:, :2] for h in p.interiors]
+        for p in poligonos
+    ]
+
+
+def _cuantizar(coords, origen, escala):
+    q = np.round((coords - origen) / escala).astype(np.int64)
+    # Quitar vértices repetidos que aparecen al cuantizar
+    conservar = np.ones(len(q), dtype=bool)
+    conservar[1:] = np.any(q[1:] != q[:-1], axis=1)
+    q = q[conservar]
+    if len(q) < 4:
+        return None
+    if tuple(q[0]) != tuple(q[-1]):
+        q = np.vstack([q, q[:1]])
+    return [tuple(p) for p in q.tolist()]
+
+
+def _uniones(anillos):
+    # Un vértice es unión si aparece con vecinos distintos en algún anillo
+    vecinos = {}
+    uniones = set()
+    for anillo in anillos:
+        n = len(anillo) - 1
+        for i in range(n):
+            punto = anillo[i]
+            par = frozenset((anillo[i - 1], anillo[i + 1]))
+            previo = vecinos.setdefault(punto, par)
+            if previo != par:
+                uniones.add(punto)
+    return uniones
+
+
+def _cortar(anillo, uniones):
+    # Rotar el anillo para empezar en una unión (o en su punto mínimo) y cortar
+    abierto = anillo[:-1]
+    indices = [i for i, p in enumerate(abierto) if p in uniones]
+    inicio = indices[0] if indices else abierto.index(min(abierto))
+    rotado = abierto[inicio:] + abierto[:inicio] + [abierto[inicio]]
+    if not indices:
+        return [rotado]
+    cortes = [i for i, p in enumerate(rotado) if p in uniones]
+    return [rotado[a:b + 1] for a, b in zip(cortes[:-1], cortes[1:])]
+
+
+def huella_fuente(ruta_shp=RUTA_SHP):
+    """Hash SHA-1 del .shp y el .dbf, para saber si el artefacto está vigente."""
+    h = hashlib.sha1()
+    for sufijo in (".shp", ".dbf"):
+        with open(ruta_shp.with_suffix(sufijo), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def construir_topojson(capa, cuantizacion=CUANTIZACION, propiedades=PROPIEDADES, objeto=OBJETO):
+    """Construye un diccionario TopoJSON con arcos compartidos y cuantizados.
+
+    ``cuantizacion`` es el número de posiciones de la rejilla por eje: 1e4 da
+    unos 30 m de resolución en Antioquia y 1e5 unos 3 m.
+    """
+    cuantizacion = int(cuantizacion)
+    if cuantizacion < 2:
+        raise ValueError("La cuantización debe ser al menos 2")
+    x0, y0, x1, y1 = capa.total_bounds
+    escala = np.array([
+        (x1 - x0) / (cuantizacion - 1) or 1.0,
+        (y1 - y0) / (cuantizacion - 1) or 1.0,
+    ])
+    origen = np.array([x0, y0])
+
+    # 1) Anillos cuantizados por municipio
+    estructura = []
+    todos = []
+    for geometria in capa.geometry:
+        poligonos = []
+        for anillos in _anillos(geometria):
+            q = [_cuantizar(a, origen, escala) for a in anillos]
+            if q[0] is None:
+                continue
+            q = [a for a in q if a is not None]
+            poligonos.append(q)
+            todos.extend(q)
+        estructura.append(poligonos)
+
+    # 2) Arcos compartidos
+    uniones = _uniones(todos)
+    indice_arcos = {}
+    arcos = []
+
+    def indice_de(arco):
+        clave = tuple(arco)
+        if clave in indice_arcos:
+            return indice_arcos[clave]
+        inverso = clave[::-1]
+        if inverso in indice_arcos:
+            return ~indice_arcos[inverso]
+        indice_arcos[clave] = len(arcos)
+        arcos.append(arco)
+        return indice_arcos[clave]
+
+    geometrias = []
+    registros = capa[propiedades].to_dict(orient="records")
+    for poligonos, props in zip(estructura, registros):
+        arcos_poligonos = [
+            [[indice_de(arco) for arco in _cortar(anillo, uniones)] for anillo in anillos]
+            for anillos in poligonos
+        ]
+        if len(arcos_poligonos) == 1:
+            geometria = {"type": "Polygon", "arcs": arcos_poligonos[0]}
+        else:
+            geometria = {"type": "MultiPolygon", "arcs": arcos_poligonos}
+        geometria["properties"] = props
+        geometrias.append(geometria)
+
+    # 3) Codificación por diferencias
+    arcos_delta = []
+    for arco in arcos:
+        a = np.asarray(arco, dtype=np.int64)
+        a[1:] = np.diff(a, axis=0)
+        arcos_delta.append(a.tolist())
+
+    return {
+        "type": "Topology",
+        "bbox": [float(x0), float(y0), float(x1), float(y1)],
+        "transform": {"scale": escala.tolist(), "translate": origen.tolist()},
+        "objects": {objeto: {"type": "GeometryCollection", "geometries": geometrias}},
+        "arcs": arcos_delta,
+    }
+
+
+def escribir_topojson(ruta=RUTA_TOPOJSON, cuantizacion=CUANTIZACION):
+    """Construye el artefacto desde el shapefile y lo escribe en ``ruta``."""
+    topo = construir_topojson(cargar_antioquia(), cuantizacion=cuantizacion)
+    topo["fuente"] = huella_fuente()
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(topo, f, ensure_ascii=False, separators=(",", ":"))
+    return topo
+
+
+# -----------------------------------------------------------
+# Niveles de detalle
+# -----------------------------------------------------------
+def _arcos_absolutos(topo):
+    return [np.cumsum(np.asarray(a, dtype=np.int64), axis=0) for a in topo["arcs"]]
+
+
+def tolerancia_zoom(zoom, topo):
+    """Medio píxel de Leaflet en ``zoom``, en unidades de la rejilla del TopoJSON."""
+    grados = 360 / (256 * 2 ** zoom)
+    return grados / 2 / min(topo["transform"]["scale"])
+
+
+def niveles_detalle(topo, zooms=ZOOMS_DETALLE):
+    """Nivel mínimo de cada vértice de cada arco, como una cadena de dígitos por arco.
+
+    El nivel ``i`` es la simplificación Douglas-Peucker con la tolerancia de
+    ``zooms[i]``. Los niveles se calculan del más fino al más grueso, cada uno
+    sobre el resultado del anterior, así que son anidados: un vértice con
+    nivel ``i`` aparece en todos los niveles ``>= i``. Los extremos de cada
+    arco (las uniones entre fronteras) se conservan siempre.
+    """
+    import shapely
+
+    if not 0 < len(zooms) <= 10:
+        raise ValueError("Se admiten entre 1 y 10 niveles de detalle")
+    absolutos = _arcos_absolutos(topo)
+    n = len(zooms)
+    codigos = [np.full(len(a), n - 1, dtype=np.int64) for a in absolutos]
+    # Posición de cada vértice conservado dentro del arco original
+    posiciones = [np.arange(len(a)) for a in absolutos]
+    for nivel in range(n - 2, -1, -1):
+        tolerancia = tolerancia_zoom(zooms[nivel], topo)
+        tramos = [a[p] for a, p in zip(absolutos, posiciones)]
+        lineas = shapely.linestrings(np.concatenate(tramos),
+                                     indices=np.repeat(np.arange(len(tramos)), [len(t) for t in tramos]))
+        simples = shapely.simplify(lineas, tolerancia, preserve_topology=True)
+        for i, (tramo, simple) in enumerate(zip(tramos, simples)):
+            coords = shapely.get_coordinates(simple).astype(np.int64)
+            # Un anillo sin uniones no puede quedar con menos de cuatro vértices
+            if (tramo[0] == tramo[-1]).all() and len(coords) < 4:
+                continue
+            conservadas = _subsecuencia(tramo, coords)
+            posiciones[i] = posiciones[i][conservadas]
+            codigos[i][posiciones[i]] = nivel
+    return ["".join(map(str, c)) for c in codigos]
+
+
+def _subsecuencia(puntos, conservados):
+    # Índices de ``conservados`` dentro de ``puntos`` (ambos en el mismo orden)
+    indices = []
+    j = 0
+    for punto in conservados:
+        while j < len(puntos) and (puntos[j] != punto).any():
+            j += 1
+        indices.append(j)
+        j += 1
+    return np.asarray(indices, dtype=np.int64)
+
+
+def simplificar(topo, nivel, niveles=None):
+    """Copia de ``topo`` con solo los vértices de ``nivel`` o de niveles más gruesos."""
+    niveles = niveles if niveles is not None else topo["niveles"]["vertices"]
+    arcos = []
+    for a, codigos in zip(_arcos_absolutos(topo), niveles):
+        a = a[np.frombuffer(codigos.encode(), dtype=np.uint8) - ord("0") <= nivel]
+        a[1:] = np.diff(a, axis=0)
+        arcos.append(a.tolist())
+    copia = dict(topo, arcs=arcos)
+    copia.pop("niveles", None)
+    return copia
+
+
+def nivel_zoom(zoom, zooms=ZOOMS_DETALLE):
+    """Nivel de detalle que corresponde a un zoom (el mismo criterio que el mapa)."""
+    nivel = 0
+    for i, z in enumerate(zooms):
+        if zoom >= z:
+            nivel = i
+    return nivel
+
+
+def a_geometrias(topo, objeto=OBJETO):
+    """Polígonos shapely (lon/lat) y propiedades de cada geometría de ``topo``."""
+    from shapely.geometry import MultiPolygon, Polygon
+
+    escala = np.asarray(topo["transform"]["scale"])
+    origen = np.asarray(topo["transform"]["translate"])
+    arcos = [a * escala + origen for a in _arcos_absolutos(topo)]
+
+    def anillo(indices):
+        puntos = [arcos[i] if i >= 0 else arcos[~i][::-1] for i in indices]
+        return np.concatenate([puntos[0]] + [p[1:] for p in puntos[1:]])
+
+    geometrias, propiedades = [], []
+    for g in topo["objects"][objeto]["geometries"]:
+        poligonos = [g["arcs"]] if g["type"] == "Polygon" else g["arcs"]
+        partes = [Polygon(anillo(p[0]), [anillo(h) for h in p[1:]]) for p in poligonos]
+        geometrias.append(partes[0] if len(partes) == 1 else MultiPolygon(partes))
+        propiedades.append(g.get("properties", {}))
+    return geometrias, propiedades
+
+
+# -----------------------------------------------------------
+# Carga del artefacto
+# -----------------------------------------------------------
+_cache = {}
+_lock = threading.Lock()
+
+
+@trazar("topologia.cargar")
+def cargar_topojson(ruta=RUTA_TOPOJSON, niveles=False):
+    """TopoJSON compartido por el proceso.
+
+    Si el artefacto no existe o no corresponde al shapefile actual (según
+    :func:`huella_fuente`) se construye en memoria a partir de la capa, sin
+    escribir en disco. Con ``niveles=True`` el TopoJSON trae además la clave
+    ``niveles`` (``zooms`` y ``vertices``, ver :func:`niveles_detalle`),
+    calculada una vez por proceso.
+    """
+    topo = _cargar(ruta)
+    if not niveles:
+        return topo
+    with _lock:
+        clave = (os.fspath(ruta), "niveles")
+        if clave not in _cache or _cache[clave][0] is not topo:
+            vertices = niveles_detalle(topo)
+            _cache[clave] = (topo, dict(topo, niveles={"zooms": list(ZOOMS_DETALLE), "vertices": vertices}))
+        return _cache[clave][1]
+
+
+def _cargar(ruta):
+    ruta = os.fspath(ruta)
+    firma = (
+        os.stat(ruta).st_mtime_ns if os.path.exists(ruta) else None,
+        os.stat(RUTA_SHP).st_mtime_ns,
+        os.stat(RUTA_SHP.with_suffix(".dbf")).st_mtime_ns,
+    )
+    with _lock:
+        if ruta in _cache and _cache[ruta][0] == firma:
+            return _cache[ruta][1]
+        topo = None
+        if firma[0] is not None:
+            with open(ruta, encoding="utf-8") as f:
+                topo = json.load(f)
+            if topo.get("fuente") != huella_fuente():
+                topo = None
+        if topo is None:
+            topo = construir_topojson(cargar_antioquia())
+        _cache[ruta] = (firma, topo)
+        return topo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el TopoJSON cuantizado de Antioquia")
+    parser.add_argument("--cuantizacion", type=float, default=CUANTIZACION,
+                        help="posiciones de la rejilla por eje (por defecto 1e5)")
+    parser.add_argument("--salida", default=str(RUTA_TOPOJSON))
+    args = parser.parse_args()
+    topo = escribir_topojson(args.salida, cuantizacion=args.cuantizacion)
+    print(f"{args.salida}: {len(topo['arcs'])} arcos, {os.path.getsize(args.salida):,} bytes")
@@ -0,0 +1,360 @@
+"""Tramos de tiempo (spans) de cada ejecución del dashboard.
+
+Cada rerun de Streamlit es una :class:`Ejecucion` con un tramo raíz. Dentro de
+él, :func:`tramo` (bloque ``with``) y :func:`trazar` (decorador) miden las
+etapas costosas: lectura de tablas, carga y reproyección del shapefile,
+cruces, memoización, construcción y serialización de mapas. En las secciones,
+:func:`etapa` marca el inicio de cada bloque numerado y cierra el anterior, de
+modo que no hace falta reindentar el código del render.
+
+Un ``st.fragment`` que se vuelve a ejecutar solo no pasa por el script
+principal; :func:`medir_fragmento` le abre entonces su propia ejecución.
+
+Las trazas solo se recogen si hay una ejecución activa en el hilo, es decir,
+si ``DEMOGRAFIA_TRAZAS`` configura un exportador o si la sesión abrió el panel
+de perfil (``?perfil=1`` en la URL). En otro caso :func:`tramo` devuelve un
+objeto vacío compartido y el costo es una consulta a ``threading.local``.
+
+``DEMOGRAFIA_TRAZAS`` es una lista separada por comas:
+
+- ``log``: una línea JSON por tramo en el logger ``demografia_antioquia.trazas``.
+- una URL ``http(s)://``: envío en formato OTLP/HTTP JSON a un colector
+  OpenTelemetry local (por ejemplo ``http://localhost:4318/v1/traces``), por
+  lotes desde un hilo en segundo plano.
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+import warnings
+
+logger = logging.getLogger(__name__)
+
+SERVICIO = "demografia-antioquia"
+# Tramos por envío al colector y segundos máximos de espera entre envíos
+TAMANO_LOTE = 512
+INTERVALO_ENVIO = 2.0
+
+
+class _Hilo(threading.local):
+    # Valor por defecto en la clase: la consulta no pasa por AttributeError
+    ejecucion = None
+
+
+_local = _Hilo()
+
+
+# -----------------------------------------------------------
+# Tramos
+# -----------------------------------------------------------
+class Tramo:
+    """Intervalo con nombre, atributos y padre dentro de una :class:`Ejecucion`."""
+
+    __slots__ = ("ejecucion", "nombre", "atributos", "id", "padre", "profundidad",
+                 "inicio_ns", "fin_ns", "_reloj", "duracion", "error", "es_etapa")
+
+    def __init__(self, ejecucion, nombre, atributos, padre=None, es_etapa=False):
+        self.ejecucion = ejecucion
+        self.nombre = nombre
+        self.atributos = atributos
+        self.id = os.urandom(8).hex()
+        self.padre = padre
+        self.profundidad = 0 if padre is None else padre.profundidad + 1
+        self.es_etapa = es_etapa
+        self.error = None
+        self.fin_ns = None
+        self.duracion = None
+        self.inicio_ns = time.time_ns()
+        self._reloj = time.perf_counter_ns()
+
+    def anotar(self, **atributos):
+        self.atributos.update(atributos)
+
+    def cerrar(self, error=None):
+        self.duracion = (time.perf_counter_ns() - self._reloj) / 1e9
+        self.fin_ns = self.inicio_ns + int(self.duracion * 1e9)
+        if error is not None:
+            self.error = repr(error)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.ejecucion._salir(self, valor)
+        return False
+
+    def como_dict(self):
+        return {
+            "traza": self.ejecucion.id, "tramo": self.id,
+            "padre": self.padre.id if self.padre else None,
+            "nombre": self.nombre, "inicio_ns": self.inicio_ns,
+            "duracion_ms": round(self.duracion * 1000, 3) if self.duracion is not None else None,
+            "atributos": self.atributos, "error": self.error,
+        }
+
+
+class _TramoNulo:
+    # Lo que devuelve tramo() sin ejecución activa: no mide nada
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+    def anotar(self, **atributos):
+        pass
+
+
+_NULO = _TramoNulo()
+
+
+class Ejecucion:
+    """Tramos de un rerun: el tramo raíz y todos los que se abren en su hilo."""
+
+    def __init__(self, nombre, **atributos):
+        self.id = os.urandom(16).hex()
+        self.tramos = []
+        self.raiz = Tramo(self, nombre, atributos)
+        self._pila = [self.raiz]
+
+    def abrir(self, nombre, atributos, es_etapa=False):
+        tramo = Tramo(self, nombre, atributos, padre=self._pila[-1], es_etapa=es_etapa)
+        self._pila.append(tramo)
+        return tramo
+
+    def _salir(self, tramo, error=None):
+        # Cierra también las etapas que quedaron abiertas dentro del tramo
+        while self._pila and self._pila[-1] is not tramo:
+            self._cerrar(self._pila.pop())
+        if self._pila:
+            self._pila.pop()
+        self._cerrar(tramo, error)
+
+    def _cerrar(self, tramo, error=None):
+        tramo.cerrar(error)
+        self.tramos.append(tramo)
+
+    def etapa(self, nombre, atributos):
+        if self._pila[-1].es_etapa:
+            self._salir(self._pila[-1])
+        return self.abrir(nombre, atributos, es_etapa=True)
+
+    def terminar(self, error=None):
+        self._salir(self.raiz, error)
+        # Orden de inicio, como se leen en el panel
+        self.tramos.sort(key=lambda t: (t.inicio_ns, t.profundidad))
+
+    @property
+    def duracion(self):
+        return self.raiz.duracion
+
+
+def tramo(nombre, **atributos):
+    """Bloque ``with`` que mide ``nombre`` dentro de la ejecución activa del hilo."""
+    ejecucion = _local.ejecucion
+    if ejecucion is None:
+        return _NULO
+    return ejecucion.abrir(nombre, atributos)
+
+
+def etapa(nombre, **atributos):
+    """Cierra la etapa anterior del mismo nivel y abre ``nombre``.
+
+    La última etapa se cierra al terminar el tramo que la contiene (por
+    ejemplo, el render de la sección).
+    """
+    ejecucion = _local.ejecucion
+    if ejecucion is not None:
+        ejecucion.etapa(nombre, atributos)
+
+
+def trazar(nombre):
+    """Decorador: cada llamada a la función es un tramo ``nombre``."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if _local.ejecucion is None:
+                return funcion(*args, **kwargs)
+            with tramo(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+@contextlib.contextmanager
+def medir_ejecucion(nombre, registrar=False, **atributos):
+    """Bloque ``with`` que abre la ejecución del hilo y la exporta al salir.
+
+    Solo se recogen tramos si hay exportadores configurados o si
+    ``registrar=True``; en otro caso el bloque entrega ``None``.
+    """
+    if not (registrar or exportadores):
+        yield None
+        return
+    actual = Ejecucion(nombre, **atributos)
+    _local.ejecucion = actual
+    error = None
+    try:
+        yield actual
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _local.ejecucion = None
+        actual.terminar(error)
+        for exportador in exportadores:
+            exportador.exportar(actual)
+
+
+@contextlib.contextmanager
+def medir_fragmento(nombre, registrar=False, **atributos):
+    """Bloque ``with`` para el cuerpo de un ``st.fragment``.
+
+    Dentro de un rerun completo el fragmento es un tramo más de la ejecución
+    activa y el bloque entrega ``None``. Cuando el fragmento se vuelve a
+    ejecutar solo, el script no pasa por :func:`medir_ejecucion`, así que el
+    fragmento abre su propia ejecución (con las mismas condiciones) y la entrega.
+    """
+    if _local.ejecucion is not None:
+        with tramo(nombre, **atributos):
+            yield None
+        return
+    with medir_ejecucion(nombre, registrar=registrar, fragmento=True, **atributos) as ejecucion:
+        yield ejecucion
+
+
+# -----------------------------------------------------------
+# Resumen para el panel
+# -----------------------------------------------------------
+def tabla_tramos(ejecucion):
+    """DataFrame con un tramo por fila, sangrado por profundidad, en orden de inicio."""
+    import pandas as pd
+
+    total = ejecucion.duracion or 1.0
+    return pd.DataFrame({
+        "Tramo": [" " * t.profundidad + t.nombre for t in ejecucion.tramos],
+        "ms": [t.duracion * 1000 for t in ejecucion.tramos],
+        "% del rerun": [100 * t.duracion / total for t in ejecucion.tramos],
+        "Detalle": [", ".join(f"{k}={v}" for k, v in t.atributos.items()) + (f" ⚠ {t.error}" if t.error else "")
+                    for t in ejecucion.tramos],
+    })
+
+
+# -----------------------------------------------------------
+# Exportadores
+# -----------------------------------------------------------
+class ExportadorLog:
+    """Una línea JSON por tramo en :data:`logger` (a stderr si no tiene manejadores)."""
+
+    def __init__(self):
+        if not logger.handlers:
+            logger.addHandler(logging.StreamHandler())
+            logger.setLevel(logging.INFO)
+
+    def exportar(self, ejecucion):
+        for t in ejecucion.tramos:
+            logger.info(json.dumps(t.como_dict(), ensure_ascii=False, default=str))
+
+
+def _valor_otlp(valor):
+    if isinstance(valor, bool):
+        return {"boolValue": valor}
+    if isinstance(valor, int):
+        return {"intValue": str(valor)}
+    if isinstance(valor, float):
+        return {"doubleValue": valor}
+    return {"stringValue": str(valor)}
+
+
+def tramo_otlp(t):
+    """Tramo en el formato JSON de OTLP (``opentelemetry.proto.trace.v1.Span``)."""
+    return {
+        "traceId": t.ejecucion.id,
+        "spanId": t.id,
+        "parentSpanId": t.padre.id if t.padre else "",
+        "name": t.nombre,
+        "kind": 1,
+        "startTimeUnixNano": str(t.inicio_ns),
+        "endTimeUnixNano": str(t.fin_ns),
+        "attributes": [{"key": k, "value": _valor_otlp(v)} for k, v in t.atributos.items()],
+        "status": {"code": 2, "message": t.error} if t.error else {"code": 0},
+    }
+
+
+class ExportadorOTLP:
+    """Envío por lotes a un colector OTLP/HTTP (JSON) desde un hilo en segundo plano.
+
+    Si el colector no responde se descarta el lote y se avisa una sola vez;
+    el dashboard nunca espera al colector.
+    """
+
+    def __init__(self, url, servicio=SERVICIO, tamano_lote=TAMANO_LOTE, intervalo=INTERVALO_ENVIO):
+        self.url = url
+        self.servicio = servicio
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self._cola = queue.Queue(maxsize=100 * tamano_lote)
+        self._avisado = False
+        self._hilo = threading.Thread(target=self._enviar_siempre, name="trazas-otlp", daemon=True)
+        self._hilo.start()
+
+    def exportar(self, ejecucion):
+        for t in ejecucion.tramos:
+            try:
+                self._cola.put_nowait(tramo_otlp(t))
+            except queue.Full:
+                return
+
+    def cuerpo(self, tramos):
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.servicio}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": tramos}],
+        }]}
+
+    def _enviar(self, tramos):
+        solicitud = urllib.request.Request(
+            self.url, data=json.dumps(self.cuerpo(tramos)).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            with urllib.request.urlopen(solicitud, timeout=5):
+                pass
+        except OSError as error:
+            if not self._avisado:
+                self._avisado = True
+                warnings.warn(f"Colector de trazas no disponible en {self.url} ({error!r})")
+
+    def _enviar_siempre(self):
+        while True:
+            lote = [self._cola.get()]
+            limite = time.monotonic() + self.intervalo
+            while len(lote) < self.tamano_lote:
+                try:
+                    lote.append(self._cola.get(timeout=max(0.0, limite - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._enviar(lote)
+
+
+def crear_exportadores(configuracion):
+    """Exportadores según ``DEMOGRAFIA_TRAZAS`` (``log`` y/o URLs de colectores)."""
+    resultado = []
+    for parte in (configuracion or "").split(","):
+        parte = parte.strip()
+        if parte == "log":
+            resultado.append(ExportadorLog())
+        elif parte.startswith(("http://", "https://")):
+            resultado.append(ExportadorOTLP(parte))
+        elif parte:
+            raise ValueError(f"Exportador de trazas desconocido: {parte!r}")
+    return resultado
+
+
+exportadores = crear_exportadores(os.environ.get("DEMOGRAFIA_TRAZAS"))